@@ -6,7 +6,27 @@ metrics including accuracy, CER (Character Error Rate), and WER (Word Error Rate
 """
 
 from .evaluator import ResultsEvaluator
+from .streaming import StreamingEvaluator
+from .sources import Source, SourceRegistry, default_registry
+from .multi_system import MultiSystemEvaluator
+from .agreement import AgreementAnalyzer
 from .summary import print_summary
+from .stats import bootstrap_ci, paired_test
+from .runs import RunRegistry
+from .results import ResultBuilder
 
 __version__ = "1.0.0"
-__all__ = ["ResultsEvaluator", "print_summary"]
+__all__ = [
+    "ResultsEvaluator",
+    "StreamingEvaluator",
+    "MultiSystemEvaluator",
+    "AgreementAnalyzer",
+    "Source",
+    "SourceRegistry",
+    "default_registry",
+    "print_summary",
+    "bootstrap_ci",
+    "paired_test",
+    "RunRegistry",
+    "ResultBuilder",
+]
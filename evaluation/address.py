@@ -0,0 +1,205 @@
+"""
+Structure-aware comparison of Bangladeshi NID addresses
+
+NID addresses follow a fixed layout:
+
+    বাসা/হোল্ডিং: ১২৩১, গ্রাম/রাস্তা: সেনপাড়া, ডাকঘর: মিরপুর - ১২১৬, কাফরুল, ঢাকা উত্তর সিটি কর্পোরেশন, ঢাকা
+
+parse_address splits one into labelled components:
+
+    holding, village_road      labelled segments (unlabelled segments continue the previous one)
+    post_office, post_code     the ডাকঘর segment, split at ' - <code>'
+    upazila, city, district    the segments after the post office: first, middle, last
+
+Labels are found with a regex compiled from a trie of the known labels, so
+shared prefixes (বাসা / বাসা/হোল্ডিং) are tested once. OCR-damaged labels are
+resolved to the closest known label within MAX_LABEL_DISTANCE edits, and the
+post office segment is also recognized by its 4-digit post code alone.
+
+compare_components scores each component with a bounded edit distance, so a
+long address costs a few short comparisons instead of one full alignment,
+and shows which part of the address the OCR got wrong.
+"""
+
+import re
+from typing import Dict, Iterable, Optional, Tuple
+
+try:
+    from . import edit_distance, normalizer
+except ImportError:
+    import edit_distance
+    import normalizer
+
+COMPONENTS = ['holding', 'village_road', 'post_office', 'post_code', 'upazila', 'city', 'district']
+
+# Printed labels and common variants -> component
+LABELS = {
+    'বাসা/হোল্ডিং': 'holding',
+    'বাসা': 'holding',
+    'হোল্ডিং': 'holding',
+    'গ্রাম/রাস্তা': 'village_road',
+    'গ্রাম': 'village_road',
+    'রাস্তা': 'village_road',
+    'মহল্লা': 'village_road',
+    'ডাকঘর': 'post_office',
+    'উপজেলা': 'upazila',
+    'থানা': 'upazila',
+    'জেলা': 'district',
+}
+
+# Label of the whole address, dropped before parsing
+ADDRESS_LABELS = ['ঠিকানা']
+
+# A label ends with a colon (or a visarga, which OCR often reads instead)
+LABEL_END = r'\s*[:ঃ]\s*'
+
+# Longest text before a colon that is still considered a (damaged) label
+MAX_LABEL_LENGTH = 16
+MAX_LABEL_DISTANCE = 2
+
+POST_CODE_RE = re.compile(r'^(.*?)\s*-\s*([০-৯0-9]{4})\s*$')
+
+
+def trie_pattern(words: Iterable[str]) -> str:
+    """
+    Regex alternation of words, factored through a character trie
+
+    ['বাসা', 'বাসা/হোল্ডিং'] becomes 'বাসা(?:/হোল্ডিং)?', so a common prefix
+    is matched once instead of once per word.
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        is_word = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if len(branches) == 1 and not is_word:
+            return branches[0]
+        group = '(?:' + '|'.join(branches) + ')'
+        return group + '?' if is_word else group
+
+    return build(trie)
+
+
+_LABEL_RE = re.compile(f'({trie_pattern(LABELS)}){LABEL_END}')
+_ADDRESS_LABEL_RE = re.compile(f'^\\s*(?:{trie_pattern(ADDRESS_LABELS)}){LABEL_END}')
+_DAMAGED_LABEL_RE = re.compile(f'^([^,:ঃ]{{1,{MAX_LABEL_LENGTH}}}?){LABEL_END}')
+
+
+def _closest_label(text: str) -> Optional[str]:
+    """Component of the known label closest to text, if within MAX_LABEL_DISTANCE edits"""
+    best, best_distance = None, MAX_LABEL_DISTANCE + 1
+    for label, component in LABELS.items():
+        distance = edit_distance.levenshtein(text, label, max_distance=MAX_LABEL_DISTANCE)
+        if distance < best_distance:
+            best, best_distance = component, distance
+    return best
+
+
+def _split_label(segment: str) -> Tuple[Optional[str], str]:
+    """(component, value) of a segment; component is None for an unlabelled segment"""
+    match = _LABEL_RE.match(segment)
+    if match:
+        return LABELS[match.group(1)], segment[match.end():]
+    match = _DAMAGED_LABEL_RE.match(segment)
+    if match:
+        component = _closest_label(match.group(1).strip())
+        if component:
+            return component, segment[match.end():]
+    return None, segment
+
+
+def parse_address(text: str) -> Dict[str, str]:
+    """
+    Split an address into components
+
+    Args:
+        text: Address as compared (normalized, lowercased)
+
+    Returns:
+        Dict with every component in COMPONENTS ('' when absent)
+    """
+    components = dict.fromkeys(COMPONENTS, '')
+    text = _ADDRESS_LABEL_RE.sub('', text.strip())
+    if not text:
+        return components
+
+    segments = [segment.strip() for segment in text.split(',')]
+    current = None
+    for position, segment in enumerate(segments):
+        component, value = _split_label(segment)
+        post = POST_CODE_RE.match(value)
+        if component is None and post:
+            # Post office found by its code; drop a label too damaged to resolve
+            value = _DAMAGED_LABEL_RE.sub('', value, count=1)
+            post = POST_CODE_RE.match(value)
+        if component == 'post_office' or (component is None and post):
+            if post:
+                components['post_office'], components['post_code'] = post.group(1), post.group(2)
+            else:
+                components['post_office'] = value
+            tail = [s for s in segments[position + 1:] if s]
+            if tail:
+                components['upazila'] = tail[0]
+            if len(tail) >= 2:
+                components['district'] = tail[-1]
+                components['city'] = ', '.join(tail[1:-1])
+            return components
+
+        if component is not None:
+            current = component
+        elif current is None:
+            current = 'holding'
+        components[current] = f"{components[current]}, {value}" if components[current] else value
+    return components
+
+
+def component_error_rate(reference: str, hypothesis: str) -> float:
+    """
+    Levenshtein CER of one component, capped at 100%
+
+    The distance is computed with a band of len(reference), so very different
+    values stop early instead of filling the whole table.
+    """
+    if reference == hypothesis:
+        return 0.0
+    if not reference:
+        return 100.0
+    distance = edit_distance.levenshtein(reference, hypothesis, max_distance=len(reference))
+    return round(min(distance, len(reference)) / len(reference) * 100, 2)
+
+
+def compare_components(actual, predicted) -> Dict[str, float]:
+    """
+    Score every address component
+
+    Returns:
+        {component: lev_cer} for components present in either address (NaN
+        when absent from both), plus 'components_accuracy': the percentage of
+        present components that match exactly. Everything is NaN when the
+        actual address is missing or blank (no data to score against).
+    """
+    actual_text = normalizer.normalize_value(actual).lower()
+    if not actual_text:
+        return dict.fromkeys(COMPONENTS + ['components_accuracy'], float('nan'))
+    actual_parts = parse_address(actual_text)
+    predicted_parts = parse_address(normalizer.normalize_value(predicted).lower())
+
+    scores = {}
+    present = matched = 0
+    for component in COMPONENTS:
+        reference, hypothesis = actual_parts[component], predicted_parts[component]
+        if not reference and not hypothesis:
+            scores[component] = float('nan')
+            continue
+        present += 1
+        matched += reference == hypothesis
+        scores[component] = component_error_rate(reference, hypothesis)
+    scores['components_accuracy'] = round(matched / present * 100, 2) if present else float('nan')
+    return scores
@@ -0,0 +1,154 @@
+"""
+Aggregates of an evaluation CSV, computed in one pass and cached
+
+summary.py, generate_summary.py and the review app all report the same
+numbers: per-column mean/min/max/std (with a bootstrap CI for the headline
+accuracy, CER and WER columns), the overall
+accuracy histogram and the quality tier counts. They are computed here once,
+as column reductions over the metric matrix, and stored in a JSON sidecar
+next to the CSV (evaluation_results.aggregates.json). The sidecar is keyed by
+a hash of the CSV's bytes, so it is reused until the CSV changes.
+"""
+
+import hashlib
+import json
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .evaluator import METRIC_FIELDS
+    from .stats import bootstrap_ci, DEFAULT_RESAMPLES, DEFAULT_CONFIDENCE
+except ImportError:
+    from evaluator import METRIC_FIELDS
+    from stats import bootstrap_ci, DEFAULT_RESAMPLES, DEFAULT_CONFIDENCE
+
+AGGREGATES_VERSION = 2
+
+METRIC_SUFFIXES = ('_accuracy', '_cer', '_wer')
+
+# Columns that get a bootstrap CI: accuracy, CER and WER overall and per field
+# (the numbers the reports print). Other metric columns get NaN bounds.
+CI_COLUMNS = [f'{field}{suffix}' for field in ['overall'] + METRIC_FIELDS for suffix in METRIC_SUFFIXES]
+
+# Overall accuracy histogram (the last bucket includes 100%)
+HISTOGRAM_EDGES = [0, 50, 60, 70, 80, 90, 100]
+
+# Quality tiers by overall accuracy: <60, 60-80, 80-95, >=95
+TIER_EDGES = [60, 80, 95]
+TIERS = ['poor', 'fair', 'good', 'excellent']
+
+
+def csv_hash(path):
+    """Hash of a file's bytes"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def sidecar_path(evaluation_csv):
+    """Path of the aggregates sidecar for an evaluation CSV"""
+    return os.path.splitext(evaluation_csv)[0] + '.aggregates.json'
+
+
+def metric_columns(df):
+    """Numeric metric columns of an evaluation DataFrame"""
+    return [
+        column for column in df.columns
+        if column.endswith(METRIC_SUFFIXES) and pd.api.types.is_numeric_dtype(df[column])
+    ]
+
+
+def compute_aggregates(df, ci_columns=None):
+    """
+    Aggregate an evaluation DataFrame
+
+    Args:
+        df: Evaluation DataFrame
+        ci_columns: Metric columns that get a bootstrap CI (default: CI_COLUMNS)
+
+    Returns:
+        Dict with records, columns ({column: mean, min, max, std, ci_low,
+        ci_high}), histogram (edges, counts) and tiers ({tier: count})
+    """
+    columns = metric_columns(df)
+    values = df[columns].to_numpy(dtype=float)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # empty or all-NaN columns
+        reductions = {
+            'mean': np.nanmean(values, axis=0),
+            'min': np.nanmin(values, axis=0) if len(values) else np.full(len(columns), np.nan),
+            'max': np.nanmax(values, axis=0) if len(values) else np.full(len(columns), np.nan),
+            'std': np.nanstd(values, axis=0, ddof=1),
+        }
+    wanted = set(CI_COLUMNS if ci_columns is None else ci_columns)
+    cis = bootstrap_ci(df[[column for column in columns if column in wanted]])
+    reductions['ci_low'] = cis['ci_low'].reindex(columns).to_numpy()
+    reductions['ci_high'] = cis['ci_high'].reindex(columns).to_numpy()
+
+    column_stats = {
+        column: {name: float(reduced[i]) for name, reduced in reductions.items()}
+        for i, column in enumerate(columns)
+    }
+
+    if 'overall_accuracy' in df.columns:
+        overall = df['overall_accuracy'].to_numpy(dtype=float)
+        overall = overall[~np.isnan(overall)]
+    else:
+        overall = np.empty(0)
+    histogram, _ = np.histogram(overall, bins=HISTOGRAM_EDGES)
+    tiers = np.bincount(np.digitize(overall, TIER_EDGES), minlength=len(TIERS))
+
+    return {
+        'version': AGGREGATES_VERSION,
+        'resamples': DEFAULT_RESAMPLES,
+        'confidence': DEFAULT_CONFIDENCE,
+        'records': len(df),
+        'columns': column_stats,
+        'histogram': {'edges': HISTOGRAM_EDGES, 'counts': histogram.tolist()},
+        'tiers': dict(zip(TIERS, tiers.tolist())),
+    }
+
+
+def load_aggregates(evaluation_csv, df=None):
+    """
+    Aggregates of an evaluation CSV, from the sidecar when it matches the CSV
+
+    Args:
+        evaluation_csv: Path to the evaluation CSV
+        df: The CSV already loaded (read only if the sidecar is stale)
+
+    Returns:
+        Dict from compute_aggregates, plus csv_hash
+    """
+    digest = csv_hash(evaluation_csv)
+    path = sidecar_path(evaluation_csv)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if (cached.get('version') == AGGREGATES_VERSION and cached.get('csv_hash') == digest
+                and cached.get('resamples') == DEFAULT_RESAMPLES):
+            return cached
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, AttributeError) as e:
+        print(f"Ignoring unreadable aggregates {path}: {e}")
+
+    if df is None:
+        df = pd.read_csv(evaluation_csv)
+    aggregates = compute_aggregates(df)
+    aggregates['csv_hash'] = digest
+
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(aggregates, f, indent=2)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Could not write aggregates {path}: {e}")
+    return aggregates
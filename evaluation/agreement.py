@@ -0,0 +1,261 @@
+"""
+Inter-annotator agreement and consensus truth
+
+Usage:
+    python agreement.py                                  # person1, person2, shared
+    python agreement.py --sources person1 person2_redo --adjudicator alice
+
+Steps (all grouped/vectorized over the annotation table, so the cost grows
+with the number of annotations, not annotator pairs times records):
+
+1. Load every annotator's entries into one table (image_id, annotator, fields)
+2. Pair annotations of the same image_id and measure per-field agreement
+   (exact match after normalization, plus Levenshtein CER)
+3. Vote a consensus value per record and field (majority, ties broken by
+   annotator order; an optional adjudicator's value wins when present)
+4. Write the consensus truth and a queue of non-unanimous fields for review
+"""
+
+import argparse
+import os
+
+import pandas as pd
+
+try:
+    from .evaluator import METRIC_FIELDS
+    from .sources import default_registry, ENTRY_RESULT_COLUMNS
+    from . import edit_distance, id_normalizer, normalizer
+except ImportError:
+    from evaluator import METRIC_FIELDS
+    from sources import default_registry, ENTRY_RESULT_COLUMNS
+    import edit_distance
+    import id_normalizer
+    import normalizer
+
+
+class AgreementAnalyzer:
+    """Measure agreement between annotators and build a consensus truth table"""
+
+    def __init__(self, registry, sources, adjudicator=None):
+        """
+        Initialize the analyzer (sources are loaded by load_annotations)
+
+        Args:
+            registry: SourceRegistry with the annotator sources
+            sources: Annotator source names, in tie-break priority order
+            adjudicator: Optional annotator whose value overrides the vote
+        """
+        self.registry = registry
+        self.sources = list(sources)
+        self.adjudicator = adjudicator
+
+    def _comparable(self, field_key, values):
+        """Values as compared between annotators (normalized, lowercased)"""
+        if field_key == 'dob':
+            return id_normalizer.normalize_dob_column(values)
+        if field_key == 'nid_no':
+            return [id_normalizer.normalize_nid(value) for value in values]
+        return [normalizer.normalize_value(value).lower() for value in values]
+
+    def load_annotations(self):
+        """
+        Load all annotations into one table
+
+        An annotator's repeated entries for the same image keep the last one.
+
+        Returns:
+            DataFrame with image_id, annotator, priority, the raw field values
+            and a norm_{field} column per field
+        """
+        frames = []
+        for priority, name in enumerate(self.sources):
+            frame = self.registry.get(name).load()
+            frame['priority'] = priority
+            frames.append(frame)
+        annotations = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        if len(annotations) == 0:
+            return annotations
+
+        annotations = annotations[annotations['image_id'] != '']
+        annotations = annotations.drop_duplicates(['image_id', 'annotator'], keep='last')
+        annotations = annotations.reset_index(drop=True)
+        for field_key in METRIC_FIELDS:
+            annotations[f'norm_{field_key}'] = self._comparable(field_key, annotations[field_key])
+        return annotations
+
+    @staticmethod
+    def overlaps(annotations):
+        """Annotations of image_ids labeled by two or more annotators"""
+        counts = annotations.groupby('image_id')['annotator'].transform('nunique')
+        return annotations[counts >= 2]
+
+    def pairs(self, annotations):
+        """
+        Every pair of annotators that labeled the same record, per field
+
+        Returns:
+            Long DataFrame: image_id, annotator_a, annotator_b, field,
+            value_a, value_b, agree, lev_cer
+        """
+        shared = self.overlaps(annotations)
+        columns = ['image_id', 'annotator'] + [f'norm_{f}' for f in METRIC_FIELDS]
+        joined = shared[columns].merge(shared[columns], on='image_id', suffixes=('_a', '_b'))
+        joined = joined[joined['annotator_a'] < joined['annotator_b']]
+
+        frames = []
+        for field_key in METRIC_FIELDS:
+            value_a = joined[f'norm_{field_key}_a'].to_numpy(dtype=object)
+            value_b = joined[f'norm_{field_key}_b'].to_numpy(dtype=object)
+            frames.append(pd.DataFrame({
+                'image_id': joined['image_id'].to_numpy(),
+                'annotator_a': joined['annotator_a'].to_numpy(),
+                'annotator_b': joined['annotator_b'].to_numpy(),
+                'field': field_key,
+                'value_a': value_a,
+                'value_b': value_b,
+                'agree': value_a == value_b,
+                'lev_cer': edit_distance.cer_batch(list(value_a), list(value_b)),
+            }))
+        if not frames or len(joined) == 0:
+            return pd.DataFrame(columns=['image_id', 'annotator_a', 'annotator_b', 'field',
+                                         'value_a', 'value_b', 'agree', 'lev_cer'])
+        return pd.concat(frames, ignore_index=True)
+
+    @staticmethod
+    def field_agreement(pairs):
+        """Per-field agreement rate (%) and mean Levenshtein CER over annotator pairs"""
+        if len(pairs) == 0:
+            return pd.DataFrame(columns=['pairs', 'agreement', 'mean_lev_cer'])
+        table = pairs.groupby('field', sort=False).agg(
+            pairs=('agree', 'size'),
+            agreement=('agree', 'mean'),
+            mean_lev_cer=('lev_cer', 'mean'),
+        )
+        table['agreement'] *= 100
+        return table.reindex([f for f in METRIC_FIELDS if f in table.index]).round(2)
+
+    def consensus(self, annotations):
+        """
+        Vote a value per record and field
+
+        Blank values don't vote. The normalized value with the most votes wins;
+        ties go to the earliest source in self.sources. If an adjudicator is
+        set and gave a value, it wins. The winning value is reported as typed
+        by its highest-priority supporter. A field every annotator left blank
+        has no votes and is unanimous (value '').
+
+        Returns:
+            Long DataFrame: image_id, field, value, votes, voters, unanimous
+        """
+        id_columns = ['image_id', 'annotator', 'priority']
+        values = annotations.melt(id_vars=id_columns, value_vars=METRIC_FIELDS,
+                                  var_name='field', value_name='value')
+        norms = annotations.melt(id_vars=id_columns, value_vars=[f'norm_{f}' for f in METRIC_FIELDS],
+                                 var_name='field', value_name='norm')
+        values['norm'] = norms['norm'].to_numpy()
+
+        voters = values.groupby(['image_id', 'field'])['annotator'].nunique().rename('voters')
+
+        votes = values[values['norm'] != ''].copy()
+        votes['weight'] = 1
+        if self.adjudicator is not None:
+            votes.loc[votes['annotator'] == self.adjudicator, 'weight'] = len(votes) + 1
+        votes = votes.sort_values('priority', kind='stable')
+        tally = votes.groupby(['image_id', 'field', 'norm'], sort=False).agg(
+            weight=('weight', 'sum'),
+            votes=('annotator', 'size'),
+            priority=('priority', 'min'),
+            value=('value', 'first'),
+        ).reset_index()
+        tally = tally.sort_values(['image_id', 'field', 'weight', 'priority'],
+                                  ascending=[True, True, False, True], kind='stable')
+        winners = tally.drop_duplicates(['image_id', 'field']).set_index(['image_id', 'field'])
+
+        result = voters.to_frame().join(winners[['value', 'votes']], how='left').reset_index()
+        result['value'] = result['value'].where(result['votes'].notna(), '')
+        result['votes'] = result['votes'].fillna(0).astype(int)
+        result['unanimous'] = (result['votes'] == result['voters']) | (result['votes'] == 0)
+        return result[['image_id', 'field', 'value', 'votes', 'voters', 'unanimous']]
+
+    @staticmethod
+    def consensus_table(consensus):
+        """Consensus values in the entry results layout (one row per image_id)"""
+        table = consensus.pivot(index='image_id', columns='field', values='value')
+        table = table.rename(columns={f: ENTRY_RESULT_COLUMNS[f][0] for f in METRIC_FIELDS})
+        columns = [ENTRY_RESULT_COLUMNS[f][0] for f in METRIC_FIELDS]
+        return table.reindex(columns=columns).reset_index()
+
+    @staticmethod
+    def disagreement_queue(annotations, consensus):
+        """
+        Fields where annotators of the same record disagree, for review
+
+        Returns:
+            DataFrame: image_id, field, consensus, votes, voters, plus one column
+            with each annotator's value
+        """
+        queue = consensus[(consensus['voters'] >= 2) & ~consensus['unanimous']]
+        if len(queue) == 0:
+            return queue.rename(columns={'value': 'consensus'})
+        values = annotations.melt(id_vars=['image_id', 'annotator'], value_vars=METRIC_FIELDS,
+                                  var_name='field', value_name='value')
+        by_annotator = values.pivot_table(index=['image_id', 'field'], columns='annotator',
+                                          values='value', aggfunc='first')
+        queue = queue.rename(columns={'value': 'consensus'}).drop(columns='unanimous')
+        return queue.join(by_annotator, on=['image_id', 'field']).reset_index(drop=True)
+
+    def generate_report(self, consensus_csv, queue_csv):
+        """Compute agreement, write consensus truth and disagreement queue, print a summary"""
+        annotations = self.load_annotations()
+
+        print("\n" + "="*80)
+        print("INTER-ANNOTATOR AGREEMENT")
+        print("="*80)
+        if len(annotations) == 0:
+            print("No annotations found.")
+            return None
+
+        shared = self.overlaps(annotations)
+        pairs = self.pairs(annotations)
+        consensus = self.consensus(annotations)
+        queue = self.disagreement_queue(annotations, consensus)
+
+        self.consensus_table(consensus).to_csv(consensus_csv, index=False)
+        queue.to_csv(queue_csv, index=False)
+
+        print(f"Annotators: {annotations['annotator'].nunique()}  "
+              f"Records: {annotations['image_id'].nunique()}  "
+              f"Annotations: {len(annotations)}")
+        print(f"Records labeled more than once: {shared['image_id'].nunique()}")
+        if len(pairs):
+            print(f"\nPer-field agreement ({len(pairs) // len(METRIC_FIELDS)} annotator pairs):")
+            print(self.field_agreement(pairs).to_string())
+        print(f"\nDisagreements queued for review: {len(queue)} fields in "
+              f"{queue['image_id'].nunique() if len(queue) else 0} records")
+        print(f"\nConsensus truth saved to: {consensus_csv}")
+        print(f"Disagreement queue saved to: {queue_csv}")
+        print("="*80 + "\n")
+        return consensus
+
+
+def main():
+    """Run agreement analysis from the command line"""
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    data_dir = os.path.join(project_root, 'data')
+
+    parser = argparse.ArgumentParser(description="Inter-annotator agreement and consensus truth")
+    parser.add_argument('--sources', nargs='+', default=['person1', 'person2', 'shared'],
+                        help="Annotator sources, in tie-break priority order")
+    parser.add_argument('--adjudicator', help="Annotator whose value overrides the majority")
+    parser.add_argument('--consensus', default=os.path.join(data_dir, 'consensus_truth.csv'),
+                        help="Consensus truth output CSV")
+    parser.add_argument('--queue', default=os.path.join(data_dir, 'disagreement_queue.csv'),
+                        help="Disagreement queue output CSV")
+    args = parser.parse_args()
+
+    analyzer = AgreementAnalyzer(default_registry(project_root), args.sources, args.adjudicator)
+    analyzer.generate_report(args.consensus, args.queue)
+
+
+if __name__ == "__main__":
+    main()
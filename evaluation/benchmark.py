@@ -0,0 +1,425 @@
+"""
+Micro-benchmarks for the evaluation and normalization hot paths
+
+Usage:
+    python benchmark.py                                   # 10k synthetic records
+    python benchmark.py --records 1000000 --only normalize_dob normalize_nid
+    python benchmark.py --save ../data/benchmark_baseline.json
+    python benchmark.py --baseline ../data/benchmark_baseline.json --threshold 0.2
+    python benchmark.py --only evaluate --scaling         # evaluate() on 1, 2, 4, ... workers
+
+Runs offline on a synthetic corpus: Bangla/English names, addresses in the
+NID layout, DOBs and NIDs in the formats the entry apps and the Polygon
+export produce, with typos, Devanagari look-alikes, dropped address segments
+and missing values mixed in. The corpus is written once as entry CSVs and a
+ground truth TSV, and each benchmark runs in a fresh process that reads them,
+so peak RSS is measured per benchmark.
+
+For each benchmark the report shows ns/op (best of --repeat passes),
+throughput and the peak RSS growth while it ran. With --baseline, any
+benchmark slower (or using more memory) than the baseline by more than
+--threshold fails the run with exit status 1. Baselines are only comparable
+on the same machine and corpus size.
+
+evaluate() can also be timed with several worker counts (--workers, or
+--scaling for 1, 2, 4, ... up to the CPU count); each count is its own
+benchmark ('evaluate[4 workers]') and the report adds the speedup over one
+worker. The evaluator only starts a pool for 2 * MIN_CHUNK_SIZE records or
+more, and peak RSS doesn't include the worker processes.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # peak RSS is not reported on Windows
+    resource = None
+
+try:
+    from .evaluator import MIN_CHUNK_SIZE, ResultsEvaluator
+    from . import normalizer
+except ImportError:
+    from evaluator import MIN_CHUNK_SIZE, ResultsEvaluator
+    import normalizer
+
+BENCHMARKS = [
+    'normalize_text', 'normalize_dob', 'normalize_nid', 'normalize_dob_column',
+    'field_accuracy', 'character_error_rate', 'word_error_rate',
+    'compare_field', 'evaluate',
+]
+
+DEFAULT_RECORDS = 10000
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.2
+DEFAULT_SEED = 0
+
+ENGLISH_NAMES = ['MOHAMMAD', 'ABDUL', 'KARIM', 'RAHMAN', 'NASRIN', 'AKTER', 'HOSSAIN', 'BEGUM',
+                 'MEHNAZ', 'SARKAR', 'ISLAM', 'UDDIN', 'FATEMA', 'KHATUN', 'AHMED', 'SULTANA']
+BANGLA_NAMES = ['মোহাম্মদ', 'আবদুল', 'করিম', 'রহমান', 'নাসরিন', 'আক্তার', 'হোসেন', 'বেগম',
+                'মেহনাজ', 'সরকার', 'ইসলাম', 'উদ্দিন', 'ফাতেমা', 'খাতুন', 'আহমেদ', 'সুলতানা', 'মোঃ']
+PLACES = ['সেনপাড়া', 'মিরপুর', 'কাফরুল', 'নবাবগঞ্জ', 'নারায়ণগঞ্জ', 'উত্তরা', 'খালপাড়',
+          'পশ্চিম গোবিন্দপুর', 'বঙ্গবন্ধু রোড', 'হাজারীবাগ', 'মোহাম্মদপুর', 'সদর']
+DISTRICTS = ['ঢাকা', 'নারায়ণগঞ্জ', 'গাজীপুর', 'চট্টগ্রাম', 'খুলনা', 'রাজশাহী']
+BENGALI_DIGITS = str.maketrans('0123456789', '০১২৩৪৫৬৭৮৯')
+
+# Bengali characters typed as their Devanagari look-alikes
+LOOKALIKES = {'ক': 'क', 'ম': 'म', 'র': 'र', 'ল': 'ल', 'ন': 'न', 'া': 'ा', 'ি': 'ि'}
+
+# Corpus noise rates: fraction of entered values that differ from the truth
+TYPO_RATE = 0.15
+LOOKALIKE_RATE = 0.03
+DROP_SEGMENT_RATE = 0.05
+MISSING_RATE = 0.02
+
+
+def _typo(text, op, u, v):
+    """Substitute, delete or duplicate one character (positions from uniform draws u, v)"""
+    if not text:
+        return text
+    i = int(u * len(text))
+    if op == 0:
+        return text[:i] + text[int(v * len(text))] + text[i + 1:]
+    if op == 1:
+        return text[:i] + text[i + 1:]
+    return text[:i] + text[i] + text[i:]
+
+
+def _bengali_number(value):
+    """Integer in Bengali digits"""
+    return str(value).translate(BENGALI_DIGITS)
+
+
+def synthetic_corpus(records=DEFAULT_RECORDS, seed=DEFAULT_SEED):
+    """
+    Entered records and their ground truth rows
+
+    Random draws are made up front as arrays (about 2s per 100k records).
+
+    Returns:
+        (entries, truth): entries has the entry CSV columns, truth the
+        ground truth export columns, one truth row per entry
+    """
+    rng = np.random.default_rng(seed)
+    n = records
+    image_ids = (1_760_000_000_000_000 + rng.choice(10 ** 12, n, replace=False)).astype(str).tolist()
+    name_words = rng.integers(2, 4, n).tolist()
+    english_idx = rng.integers(len(ENGLISH_NAMES), size=(n, 3)).tolist()
+    bangla_idx = rng.integers(len(BANGLA_NAMES), size=(n, 7)).tolist()
+    short_nids = rng.integers(10 ** 9, 10 ** 10, n)
+    long_nids = rng.integers(10 ** 16, 10 ** 17, n)
+    nids = np.where(rng.random(n) < 0.7, short_nids, long_nids).astype(str).tolist()
+    years = rng.integers(1950, 2006, n).tolist()
+    months = rng.integers(1, 13, n).tolist()
+    days = rng.integers(1, 29, n).tolist()
+    doc_months = rng.integers(1, 13, n).tolist()
+    doc_days = rng.integers(1, 29, n).tolist()
+    holdings = rng.integers(1, 500, n).tolist()
+    post_codes = rng.integers(1000, 10000, n).tolist()
+    place_idx = rng.integers(len(PLACES), size=(n, 3)).tolist()
+    district_idx = rng.integers(len(DISTRICTS), size=(n, 2)).tolist()
+    city = (rng.random(n) < 0.3).tolist()
+
+    # Noise for the five text fields and the NID
+    typo = (rng.random((n, 6)) < TYPO_RATE).tolist()
+    typo_op = rng.integers(3, size=(n, 6)).tolist()
+    typo_u = rng.random((n, 6)).tolist()
+    typo_v = rng.random((n, 6)).tolist()
+    lookalike = (rng.random((n, 5)) < LOOKALIKE_RATE).tolist()
+    drop_segment = (rng.random(n) < DROP_SEGMENT_RATE).tolist()
+    missing = (rng.random((n, 5)) < MISSING_RATE).tolist()
+    dob_formats = rng.integers(4, size=n).tolist()
+    float_nid = (rng.random(n) < 0.2).tolist()
+
+    truth_rows, entry_rows = [], []
+    for r in range(n):
+        words, b = name_words[r], bangla_idx[r]
+        english = ' '.join(ENGLISH_NAMES[i] for i in english_idx[r][:words])
+        bangla = ' '.join(BANGLA_NAMES[i] for i in b[:words])
+        father = f"{BANGLA_NAMES[b[3]]} {BANGLA_NAMES[b[4]]}"
+        mother = f"{BANGLA_NAMES[b[5]]} {BANGLA_NAMES[b[6]]}"
+        places, districts = place_idx[r], district_idx[r]
+        segments = [f"বাসা/হোল্ডিং: {_bengali_number(holdings[r])}",
+                    f"গ্রাম/রাস্তা: {PLACES[places[0]]}",
+                    f"ডাকঘর: {PLACES[places[1]]} - {_bengali_number(post_codes[r])}",
+                    PLACES[places[2]]]
+        if city[r]:
+            segments.append(f"{DISTRICTS[districts[0]]} সিটি কর্পোরেশন")
+        segments.append(DISTRICTS[districts[1]])
+        address = ', '.join(segments)
+        nid, year, month, day = nids[r], years[r], months[r], days[r]
+        truth_rows.append((english, bangla, father, mother, np.nan, nid, f"{year:04d}/{month:02d}/{day:02d}",
+                           address, f"nid_front_image/{image_ids[r]}.jpg", f"nid_back_image/{image_ids[r]}.jpg",
+                           f"2025/{doc_months[r]:02d}/{doc_days[r]:02d}"))
+
+        entered = [english, bangla, father, mother, address]
+        for k in range(5):
+            value = entered[k]
+            if typo[r][k]:
+                value = _typo(value, typo_op[r][k], typo_u[r][k], typo_v[r][k])
+            if k and lookalike[r][k]:
+                value = ''.join(LOOKALIKES.get(char, char) for char in value)
+            if k == 4 and drop_segment[r]:
+                value = ', '.join(value.split(', ')[:-1])
+            entered[k] = '' if missing[r][k] else value
+        dob = [f"{year:04d}-{month:02d}-{day:02d}", f"{day:02d}/{month:02d}/{year:04d}",
+               f"{year:04d}{month:02d}{day:02d}", f"{year:04d}/{month:02d}/{day:02d}"][dob_formats[r]]
+        entered_nid = f"{nid}.0" if float_nid[r] else nid
+        if typo[r][5]:
+            entered_nid = _typo(entered_nid, typo_op[r][5], typo_u[r][5], typo_v[r][5])
+        entry_rows.append((image_ids[r], *entered[:4], dob, entered_nid, entered[4]))
+
+    entries = pd.DataFrame(entry_rows, columns=['image_id', 'english_name', 'bangla_name', 'father_spouse_name',
+                                                'mother_name', 'dob', 'nid_no', 'plain_address'])
+    truth = pd.DataFrame(truth_rows, columns=['name_english', 'name_bangla', 'father_name', 'mother_name',
+                                              'spouse_name', 'nid_no', 'dob', 'address', 'front_image',
+                                              'back_image', 'doc_date'])
+    return entries, truth
+
+
+def write_corpus(directory, records=DEFAULT_RECORDS, seed=DEFAULT_SEED):
+    """
+    Write a synthetic corpus as evaluator inputs (entries split between two annotators)
+
+    Returns:
+        (person 1 CSV path, person 2 CSV path, ground truth TSV path)
+    """
+    entries, truth = synthetic_corpus(records, seed)
+    paths = [os.path.join(directory, name) for name in ('person1.csv', 'person2.csv', 'truth.tsv')]
+    half = (len(entries) + 1) // 2
+    entries.iloc[:half].to_csv(paths[0], index=False)
+    entries.iloc[half:].to_csv(paths[1], index=False)
+    truth.to_csv(paths[2], sep='\t', index=False, na_rep='\\N')
+    return tuple(paths)
+
+
+def _peak_rss():
+    """Peak resident set size of this process in bytes (None if unavailable)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _workload(name, evaluator):
+    """(callable running one pass, operations per pass) for a benchmark"""
+    entries = evaluator.merge_results()
+    truth = evaluator.ground_truth
+    if name == 'evaluate':
+        return evaluator.evaluate, len(entries)
+    if name == 'normalize_text':
+        texts = [value for column in ['english_name', 'bangla_name', 'father_spouse_name', 'plain_address']
+                 for value in entries[column]]
+
+        def run():
+            normalizer.normalize.cache_clear()  # measure cold normalization, not the memo
+            for value in texts:
+                evaluator.normalize_text(value)
+        return run, len(texts)
+    if name.startswith(('normalize_dob', 'normalize_nid')):
+        column = 'dob' if name.startswith('normalize_dob') else 'nid_no'
+        values = entries[column].tolist() + truth[column].tolist()
+        function = getattr(evaluator, name)
+        if name.endswith('_column'):
+            return (lambda: function(values)), len(values)
+        return (lambda: [function(value) for value in values]), len(values)
+
+    pairs = [pair for entry_column, truth_column in [('bangla_name', 'name_bangla'),
+                                                     ('english_name', 'name_english'),
+                                                     ('plain_address', 'address')]
+             for pair in zip(truth[truth_column], entries[entry_column])]
+    function = getattr(evaluator, name)
+
+    def run():
+        normalizer.normalize.cache_clear()
+        for actual, predicted in pairs:
+            function(actual, predicted)
+    return run, len(pairs)
+
+
+def scaling_workers(cpus=None):
+    """Worker counts 1, 2, 4, ... up to the CPU count (included even if not a power of 2)"""
+    cpus = cpus or os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+    return counts if counts[-1] == cpus else counts + [cpus]
+
+
+def benchmark_label(name, workers=1):
+    """Report key of a benchmark run with a worker count"""
+    return name if workers == 1 else f"{name}[{workers} workers]"
+
+
+def run_benchmark(name, corpus, repeat=DEFAULT_REPEAT, workers=1):
+    """
+    Time one benchmark in this process
+
+    Args:
+        name: Benchmark in BENCHMARKS
+        corpus: Paths from write_corpus
+        repeat: Timed passes
+        workers: Scoring processes of the evaluator (only evaluate() uses them)
+
+    Returns:
+        Dict with ops, ns_per_op (best pass), median_ns_per_op, ops_per_sec
+        and peak_rss_delta (bytes of peak RSS growth while it ran)
+    """
+    evaluator = ResultsEvaluator(*corpus, workers=workers)
+    run, ops = _workload(name, evaluator)
+    rss_before = _peak_rss()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        run()
+        timings.append(time.perf_counter_ns() - start)
+    rss_after = _peak_rss()
+
+    best = min(timings) / max(ops, 1)
+    return {
+        'ops': ops,
+        'ns_per_op': round(best, 1),
+        'median_ns_per_op': round(float(np.median(timings)) / max(ops, 1), 1),
+        'ops_per_sec': round(1e9 / best, 1) if best else None,
+        'peak_rss_delta': rss_after - rss_before if rss_before is not None else None,
+    }
+
+
+def run_suite(names, records=DEFAULT_RECORDS, seed=DEFAULT_SEED, repeat=DEFAULT_REPEAT, workers=(1,)):
+    """
+    Run benchmarks on a fresh synthetic corpus, each in its own process
+
+    Args:
+        workers: Worker counts evaluate() is timed with
+
+    Returns:
+        Report dict: machine and corpus info, and results per benchmark
+        (with several worker counts, evaluate results also get the speedup
+        over the fewest workers)
+    """
+    results = {}
+    runs = [(name, count) for name in names for count in (workers if name == 'evaluate' else [1])]
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        corpus = write_corpus(directory, records, seed)
+        print(f"Corpus: {records} records ({time.perf_counter() - start:.1f}s)")
+        if max(workers) > 1 and records < 2 * MIN_CHUNK_SIZE:
+            print(f"  Note: under {2 * MIN_CHUNK_SIZE} records evaluate() scores in-process, whatever the workers")
+        context = multiprocessing.get_context('spawn')
+        for name, count in runs:
+            label = benchmark_label(name, count)
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                results[label] = executor.submit(run_benchmark, name, corpus, repeat, count).result()
+            print(f"  {label:22} {results[label]['ns_per_op']:>14,.0f} ns/op")
+
+    single = results.get(benchmark_label('evaluate', min(workers)))
+    if single and len(workers) > 1:
+        for count in workers:
+            result = results[benchmark_label('evaluate', count)]
+            result['speedup'] = round(single['ns_per_op'] / result['ns_per_op'], 2)
+    return {
+        'records': records,
+        'seed': seed,
+        'repeat': repeat,
+        'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': f"{platform.system()} {platform.machine()} ({os.cpu_count()} CPUs)",
+        'normalizer_version': normalizer.NORMALIZER_VERSION,
+        'results': results,
+    }
+
+
+def compare_to_baseline(report, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Benchmarks that regressed past the threshold
+
+    Returns:
+        List of (benchmark, measure, baseline value, current value)
+    """
+    regressions = []
+    for name, result in report['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if not previous:
+            continue
+        for measure in ('ns_per_op', 'peak_rss_delta'):
+            old, new = previous.get(measure), result.get(measure)
+            # RSS growth below 1 MB is allocator noise
+            if old is None or new is None or (measure == 'peak_rss_delta' and new < (1 << 20)):
+                continue
+            if new > old * (1 + threshold):
+                regressions.append((name, measure, old, new))
+    return regressions
+
+
+def format_report(report):
+    """Results as a table"""
+    table = pd.DataFrame.from_dict(report['results'], orient='index')
+    table['peak_rss_mb'] = table['peak_rss_delta'] / (1 << 20)
+    table = table.drop(columns='peak_rss_delta')
+    if 'speedup' in table:
+        table['speedup'] = table['speedup'].map(lambda value: '' if pd.isna(value) else f"{value:.2f}x")
+    return table.to_string(float_format=lambda value: f"{value:,.1f}")
+
+
+def main():
+    """Run the benchmark suite from the command line"""
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for normalization, metrics and evaluate()")
+    parser.add_argument('--records', type=int, default=DEFAULT_RECORDS,
+                        help=f"Synthetic corpus size (default: {DEFAULT_RECORDS})")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="Corpus seed")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="Timed passes per benchmark")
+    parser.add_argument('--only', nargs='+', choices=BENCHMARKS, default=BENCHMARKS, help="Benchmarks to run")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1],
+                        help="Worker counts evaluate() is timed with (default: 1)")
+    parser.add_argument('--scaling', action='store_true',
+                        help="Time evaluate() with 1, 2, 4, ... workers up to the CPU count")
+    parser.add_argument('--save', help="Save the results as a JSON baseline")
+    parser.add_argument('--baseline', help="Fail if results regress against this JSON baseline")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Allowed slowdown/memory growth vs the baseline (default: {DEFAULT_THRESHOLD})")
+    args = parser.parse_args()
+    if min(args.workers) < 1:
+        parser.error("--workers must be at least 1")
+    workers = scaling_workers() if args.scaling else sorted(set(args.workers))
+
+    report = run_suite(args.only, args.records, args.seed, args.repeat, workers)
+
+    print("\n" + "="*80)
+    print(f"BENCHMARKS ({report['records']} records, best of {report['repeat']}, {report['machine']})")
+    print("="*80)
+    print(format_report(report))
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline saved to: {args.save}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('records') != report['records']:
+            print(f"\nWarning: baseline was run on {baseline.get('records')} records, this run on {report['records']}")
+        regressions = compare_to_baseline(report, baseline, args.threshold)
+        if regressions:
+            print(f"\nRegressions (more than {args.threshold:.0%} over {args.baseline}):")
+            for name, measure, old, new in regressions:
+                print(f"  {name:22} {measure:16} {old:>14,.1f} -> {new:>14,.1f} ({new / old - 1:+.1%})")
+            print("="*80 + "\n")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline}")
+    print("="*80 + "\n")
+
+
+if __name__ == "__main__":
+    main()
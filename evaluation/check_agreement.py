@@ -0,0 +1,98 @@
+"""
+Check for agreement.py consensus voting and the disagreement queue
+
+Writes two small annotator CSVs covering the voting cases (agreement,
+disagreement, one annotator left a field blank, every annotator left it
+blank, a record labeled once) and checks which fields end up in the
+disagreement queue. Then runs the same checks on the consensus of the
+real annotator sources, if any.
+
+Usage:
+    python check_agreement.py
+
+Exits with status 1 if a check fails.
+"""
+
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+from agreement import AgreementAnalyzer
+from evaluator import METRIC_FIELDS
+from sources import Source, SourceRegistry, default_registry
+
+BLANK = dict.fromkeys(['english_name', 'bangla_name', 'father_spouse_name', 'mother_name',
+                       'dob', 'nid_no', 'plain_address'], '')
+
+ANNOTATOR_A = [
+    {**BLANK, 'image_id': 'same', 'english_name': 'Karim Uddin', 'dob': '1990-01-15'},
+    {**BLANK, 'image_id': 'differ', 'english_name': 'Karim Uddin', 'nid_no': '6032068741'},
+    {**BLANK, 'image_id': 'single', 'english_name': 'Rahim'},
+]
+ANNOTATOR_B = [
+    {**BLANK, 'image_id': 'same', 'english_name': ' karim  uddin', 'dob': '15/01/1990'},
+    {**BLANK, 'image_id': 'differ', 'english_name': 'Karim Udin'},
+]
+
+# (image_id, field) pairs that must be queued; every other field must not be
+EXPECTED_QUEUE = {('differ', 'english_name'), ('differ', 'nid_no')}
+
+
+def check_consensus(analyzer, annotations):
+    """Invariants of any consensus: list of failure messages"""
+    failures = []
+    consensus = analyzer.consensus(annotations)
+    queue = analyzer.disagreement_queue(annotations, consensus)
+
+    all_blank = consensus[consensus['votes'] == 0]
+    if not all_blank['unanimous'].all():
+        failures.append(f"{(~all_blank['unanimous']).sum()} all-blank fields not unanimous")
+    if (all_blank['value'] != '').any():
+        failures.append("all-blank fields with a consensus value")
+    queued = set(zip(queue['image_id'], queue['field']))
+    blank_queued = queued & set(zip(all_blank['image_id'], all_blank['field']))
+    if blank_queued:
+        failures.append(f"all-blank fields queued: {sorted(blank_queued)[:5]}")
+    if len(queue) and (queue['voters'] < 2).any():
+        failures.append("fields labeled by one annotator queued")
+    return failures, consensus, queued
+
+
+def main():
+    """Run the synthetic and real-data consensus checks"""
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = SourceRegistry()
+        for name, rows in (('a', ANNOTATOR_A), ('b', ANNOTATOR_B)):
+            path = os.path.join(tmp, f'{name}.csv')
+            pd.DataFrame(rows).to_csv(path, index=False)
+            registry.register(Source(name=name, paths=[path]))
+
+        analyzer = AgreementAnalyzer(registry, ['a', 'b'])
+        annotations = analyzer.load_annotations()
+        found, consensus, queued = check_consensus(analyzer, annotations)
+        failures += found
+        if queued != EXPECTED_QUEUE:
+            failures.append(f"queued {sorted(queued)}, expected {sorted(EXPECTED_QUEUE)}")
+        if len(consensus) != 3 * len(METRIC_FIELDS):
+            failures.append(f"{len(consensus)} consensus fields, expected {3 * len(METRIC_FIELDS)}")
+    print(f"Synthetic annotators: {len(failures)} failures")
+
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    analyzer = AgreementAnalyzer(default_registry(project_root), ['person1', 'person2', 'shared'])
+    annotations = analyzer.load_annotations()
+    if len(annotations):
+        found, consensus, queued = check_consensus(analyzer, annotations)
+        print(f"Data annotators: {len(consensus)} consensus fields, {len(queued)} queued, "
+              f"{len(found)} failures")
+        failures += found
+
+    for failure in failures:
+        print(f"  {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
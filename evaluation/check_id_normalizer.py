@@ -0,0 +1,143 @@
+"""
+Differential check for id_normalizer.py
+
+Runs every cell of the data CSVs, a few hand-picked edge cases and random
+date-like strings through normalize_dob_column and through the per-value
+normalize_dob, and reports any difference and the speedup. Those values are
+all distinct; the DOB columns of a synthetic corpus (benchmark.py), entered
+in the usual formats, give the speedup on a realistic column.
+
+Usage:
+    python check_id_normalizer.py [csv ...] [--random N] [--records N] [--seed S]
+
+Exits with status 1 if any value normalizes differently.
+"""
+
+import argparse
+import glob
+import math
+import os
+import random
+import sys
+import time
+
+from benchmark import synthetic_corpus
+from check_normalizer import read_cells
+from id_normalizer import normalize_dob, normalize_dob_column
+
+EDGE_CASES = [
+    None,
+    math.nan,
+    '',
+    '   ',
+    '1990-01-15',
+    ' 1990-01-15\n',
+    '1990/01/15',
+    '19900115',
+    '15-01-1990',
+    '15/01/1990',
+    '15 01 1990',
+    '1990 1 15',
+    '1990111',                  # 7 digits: strptime still parses it
+    '20000229',                 # leap day
+    '19000229',                 # not a leap year
+    '29022000',
+    '00000101',                 # year 0
+    '09991231',                 # year below 1000
+    '31129999',
+    '1990-13-01',
+    '1990-1-5',
+    '১৯৯০-০১-১৫',               # Bengali digits
+    '\x1c19900115\x1f',          # ASCII separators count as whitespace
+    '1990\x000115',
+    '1' * 40,
+    19900115,
+    19900115.0,
+    6032068741.0,
+    '6032068741',
+    '6032068741.0',
+    ' 603 206 8741 ',
+    '603-206-8741.5',
+    '.6032068741',
+    'NID: 6032068741',
+    '৬০৩২০৬৮৭৪১',
+    1.5,
+]
+
+RANDOM_ALPHABET = '0123456789' * 4 + '-/ .\t\n\x1ca০x,'
+DATE_FORMATS = ['%04d-%02d-%02d', '%04d%02d%02d', '%04d/%d/%d', '%02d/%02d/%04d', '%02d-%02d-%04d', '%d %d %d']
+
+
+def random_values(count, seed):
+    """Random dates in the usual formats (some invalid) and random digit/separator strings"""
+    rng = random.Random(seed)
+    values = []
+    for _ in range(count):
+        if rng.random() < 0.4:
+            year, month, day = rng.randint(900, 2100), rng.randint(0, 13), rng.randint(0, 32)
+            fmt = rng.choice(DATE_FORMATS)
+            parts = (year, month, day) if fmt.startswith('%04d') else (day, month, year)
+            values.append(rng.choice(['', ' ', '\t']) + fmt % parts + rng.choice(['', ' ', '\n']))
+        else:
+            length = rng.randint(0, 14 if rng.random() < 0.95 else 40)
+            values.append(''.join(rng.choice(RANDOM_ALPHABET) for _ in range(length)))
+    return values
+
+
+def compare(name, values, column_function, value_function):
+    """Print timings and mismatches of one normalizer; return the mismatch count"""
+    start = time.perf_counter()
+    actual = column_function(values)
+    column_secs = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = [value_function(value) for value in values]
+    value_secs = time.perf_counter() - start
+
+    mismatches = [(value, e, a) for value, e, a in zip(values, expected, actual)
+                  if e != a or type(a) is not str]
+    if len(actual) != len(expected):
+        mismatches.append(('<length>', len(expected), len(actual)))
+
+    print(f"{name}: per-value {value_secs:.3f}s  column {column_secs:.3f}s  "
+          f"({value_secs / column_secs:.1f}x)  mismatches: {len(mismatches)}")
+    for value, e, a in mismatches[:20]:
+        print(f"  {value!r}\n    per-value: {e!r}\n    column:    {a!r}")
+    return len(mismatches)
+
+
+def main():
+    """Compare column and per-value DOB normalization"""
+    parser = argparse.ArgumentParser(description="Check normalize_dob_column against normalize_dob")
+    parser.add_argument('csv', nargs='*', help="CSV files whose cells are checked (default: data/*.csv)")
+    parser.add_argument('--random', type=int, default=100000, help="Random values checked (default: 100000)")
+    parser.add_argument('--records', type=int, default=100000,
+                        help="Records in the synthetic corpus (default: 100000, 0 to skip)")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for the random values and the corpus")
+    args = parser.parse_args()
+
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    csv_paths = args.csv or sorted(glob.glob(os.path.join(project_root, 'data', '*.csv')))
+
+    cells = set()
+    for csv_path in csv_paths:
+        cells.update(read_cells(csv_path))
+    values = EDGE_CASES + sorted(cells) + random_values(args.random, args.seed)
+
+    print(f"Files checked: {len(csv_paths)}")
+    print(f"Values: {len(values)}")
+    mismatches = compare('DOB', values, normalize_dob_column, normalize_dob)
+    if args.records:
+        entries, truth = synthetic_corpus(args.records, args.seed)
+        dobs = entries['dob'].tolist() + truth['dob'].tolist()
+        mismatches += compare('DOB (synthetic corpus)', dobs, normalize_dob_column, normalize_dob)
+    # An empty column and a column of one value take the edge paths
+    for value in EDGE_CASES:
+        mismatches += normalize_dob_column([value]) != [normalize_dob(value)]
+    mismatches += normalize_dob_column([]) != []
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Differential check for normalizer.py
+
+Runs every text cell of the data CSVs (plus a few hand-picked edge cases)
+through the frozen, original loop-based normalization and through
+normalizer.normalize, and reports any difference.
+
+Usage:
+    python check_normalizer.py [csv ...]
+
+Exits with status 1 if any value normalizes differently.
+"""
+
+import csv
+import glob
+import os
+import sys
+import time
+import unicodedata
+
+from normalizer import normalize
+
+# Frozen copy of the original ResultsEvaluator mapping - do not edit
+LEGACY_DEVANAGARI_TO_BENGALI = dict(zip(
+    'कखगघङचछजझञटठडढण'
+    'तथदधनपफबभमयरलवश'
+    'षसहअआइईउऊएऐओऔाि'
+    'ीुूेैोौ्ंःऀ',
+    'কখগঘঙচছজঝঞডঢণতণ'
+    'তথদধনপফবভমযরল঵শ'
+    'ষসহঅআইঈউঊএঐওঔাি'
+    'ীুূেৈোৌ্ঁঃঀ',
+))
+LEGACY_VOWEL_MATRAS = set('ািীুূেৈোৌ')
+
+EDGE_CASES = [
+    '',
+    '   ',
+    '্ক',                     # leading virama
+    'কা্্খ',   # virama after matra, then a second one
+    'ক্ষ',               # valid conjunct
+    'कमल नाथ',  # Devanagari name
+    'टठडढ',         # shifted retroflex mappings
+    'का्',               # Devanagari virama after matra
+    'গ্রাম। ডাকঘর॥',  # dandas
+    'অা',                     # decomposable sequence for NFC
+    'দো',               # O sign as two code points
+    '  Md.\tKarim \n Uddin  ',
+]
+
+
+def legacy_normalize(text: str) -> str:
+    """Original ResultsEvaluator.normalize_text pipeline for a string"""
+    text = unicodedata.normalize('NFC', text.strip())
+    text = text.replace('।', '.').replace('॥', '.')
+    text = ''.join(LEGACY_DEVANAGARI_TO_BENGALI.get(char, char) for char in text)
+    result = []
+    for i, char in enumerate(text):
+        if char == '্' and (i == 0 or text[i - 1] in LEGACY_VOWEL_MATRAS):
+            continue
+        result.append(char)
+    return ' '.join(''.join(result).split())
+
+
+def read_cells(csv_path):
+    """Yield every non-empty cell of a comma or tab separated file"""
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        header = f.readline()
+        delimiter = '\t' if '\t' in header else ','
+        f.seek(0)
+        for row in csv.reader(f, delimiter=delimiter):
+            for cell in row:
+                if cell:
+                    yield cell
+
+
+def main():
+    """Compare legacy and precompiled normalization over the data CSVs"""
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    csv_paths = sys.argv[1:] or sorted(glob.glob(os.path.join(project_root, 'data', '*.csv')))
+
+    values = set(EDGE_CASES)
+    for csv_path in csv_paths:
+        values.update(read_cells(csv_path))
+    values = sorted(values)
+
+    start = time.perf_counter()
+    expected = [legacy_normalize(value) for value in values]
+    legacy_secs = time.perf_counter() - start
+
+    normalize.cache_clear()
+    start = time.perf_counter()
+    actual = [normalize(value) for value in values]
+    new_secs = time.perf_counter() - start
+
+    mismatches = [(value, e, a) for value, e, a in zip(values, expected, actual) if e != a]
+
+    print(f"Files checked: {len(csv_paths)}")
+    print(f"Distinct values: {len(values)}")
+    print(f"Legacy: {legacy_secs:.3f}s  Precompiled: {new_secs:.3f}s")
+    print(f"Mismatches: {len(mismatches)}")
+    for value, e, a in mismatches[:20]:
+        print(f"  {value!r}\n    legacy:      {e!r}\n    precompiled: {a!r}")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+"""
+Levenshtein edit distance for CER/WER
+
+Real edit distance (substitutions + deletions + insertions) at character or
+word level, replacing the SequenceMatcher ratio used by the legacy metrics.
+
+- levenshtein: distance only. Uses Myers' bit-parallel algorithm (Python ints
+  as bit vectors, so any length works) or, when a max_distance is given, a
+  banded DP that stops as soon as the threshold is exceeded.
+- edit_counts / alignment: full DP with traceback when the individual
+  operation counts or the aligned pairs are needed.
+- cer / wer: error rates in percent. cer_batch / wer_batch are convenience
+  loops over them for two columns (no vectorization; repeated pairs are
+  scored once).
+- trim_common_affixes: the differing middle of two sequences.
+"""
+
+from collections import namedtuple
+from typing import Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+EditCounts = namedtuple('EditCounts', ['hits', 'substitutions', 'deletions', 'insertions'])
+EditCounts.__doc__ = "Operation counts for turning a reference into a hypothesis"
+
+# Alignment operations
+MATCH = 'match'
+SUBSTITUTE = 'substitute'
+DELETE = 'delete'
+INSERT = 'insert'
+
+
+def trim_common_affixes(a: Sequence, b: Sequence) -> Tuple[Sequence, Sequence]:
+    """
+    Drop the common prefix and suffix, which never affect the distance
+
+    Returns:
+        (a, b) without the longest prefix and (non-overlapping) suffix they share
+    """
+    start = 0
+    limit = min(len(a), len(b))
+    while start < limit and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    return a[start:end_a], b[start:end_b]
+
+
+def _myers(pattern: Sequence[Hashable], text: Sequence[Hashable]) -> int:
+    """
+    Bit-parallel Levenshtein distance (Myers 1999, Hyyro 2003)
+    One pass over text with O(len(pattern) / wordsize) work per symbol.
+    """
+    m = len(pattern)
+    if m == 0:
+        return len(text)
+
+    peq = {}
+    for i, symbol in enumerate(pattern):
+        peq[symbol] = peq.get(symbol, 0) | (1 << i)
+
+    full = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv = full
+    mv = 0
+    score = m
+    for symbol in text:
+        eq = peq.get(symbol, 0)
+        xv = eq | mv
+        xh = ((((eq & pv) + pv) & full) ^ pv) | eq
+        ph = (mv | ~(xh | pv)) & full
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = (mh | ~(xv | ph)) & full
+        mv = ph & xv
+    return score
+
+
+def _banded(a: Sequence, b: Sequence, max_distance: int) -> int:
+    """
+    Levenshtein distance limited to a diagonal band of width 2k+1
+    Returns max_distance + 1 as soon as the distance must exceed max_distance.
+    """
+    n, m = len(a), len(b)
+    if abs(n - m) > max_distance:
+        return max_distance + 1
+
+    over = max_distance + 1
+    previous = list(range(m + 1))
+    for i in range(1, n + 1):
+        low = max(1, i - max_distance)
+        high = min(m, i + max_distance)
+        current = [over] * (m + 1)
+        current[0] = i if i <= max_distance else over
+        row_min = current[0]
+        ai = a[i - 1]
+        for j in range(low, high + 1):
+            cost = previous[j - 1] + (ai != b[j - 1])
+            deletion = previous[j] + 1
+            insertion = current[j - 1] + 1
+            value = min(cost, deletion, insertion, over)
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return over
+        previous = current
+    return min(previous[m], over)
+
+
+def levenshtein(a: Sequence[Hashable], b: Sequence[Hashable],
+                max_distance: Optional[int] = None) -> int:
+    """
+    Edit distance between two strings (or token lists)
+
+    Args:
+        a: Reference sequence
+        b: Hypothesis sequence
+        max_distance: Optional threshold; if the distance is larger,
+                      max_distance + 1 is returned (and computed early)
+
+    Returns:
+        Minimum number of substitutions, deletions and insertions
+    """
+    if a == b:
+        return 0
+    a, b = trim_common_affixes(a, b)
+    if max_distance is not None:
+        return _banded(a, b, max_distance)
+    # The bit vectors cover the pattern, so use the shorter sequence
+    if len(a) <= len(b):
+        return _myers(a, b)
+    return _myers(b, a)
+
+
+def alignment(a: Sequence[Hashable], b: Sequence[Hashable]) -> List[Tuple[str, Optional[Hashable], Optional[Hashable]]]:
+    """
+    Minimum-cost alignment of two sequences
+
+    Returns:
+        List of (operation, reference_symbol, hypothesis_symbol) tuples.
+        Deletions have hypothesis_symbol None, insertions reference_symbol None.
+    """
+    n, m = len(a), len(b)
+    # Python lists: element access is much cheaper than on a NumPy array
+    dp = [list(range(m + 1))]
+    for i in range(1, n + 1):
+        prev = dp[-1]
+        row = [i] * (m + 1)
+        ai = a[i - 1]
+        for j in range(1, m + 1):
+            row[j] = min(
+                prev[j - 1] + (ai != b[j - 1]),
+                prev[j] + 1,
+                row[j - 1] + 1,
+            )
+        dp.append(row)
+
+    ops = []
+    i, j = n, m
+    while i > 0 or j > 0:
+        if i > 0 and j > 0 and dp[i][j] == dp[i - 1][j - 1] + (a[i - 1] != b[j - 1]):
+            ops.append((MATCH if a[i - 1] == b[j - 1] else SUBSTITUTE, a[i - 1], b[j - 1]))
+            i -= 1
+            j -= 1
+        elif i > 0 and dp[i][j] == dp[i - 1][j] + 1:
+            ops.append((DELETE, a[i - 1], None))
+            i -= 1
+        else:
+            ops.append((INSERT, None, b[j - 1]))
+            j -= 1
+    ops.reverse()
+    return ops
+
+
+def edit_counts(a: Sequence[Hashable], b: Sequence[Hashable]) -> EditCounts:
+    """Count hits, substitutions, deletions and insertions of the best alignment"""
+    counts = {MATCH: 0, SUBSTITUTE: 0, DELETE: 0, INSERT: 0}
+    for op, _, _ in alignment(a, b):
+        counts[op] += 1
+    return EditCounts(counts[MATCH], counts[SUBSTITUTE], counts[DELETE], counts[INSERT])
+
+
+def error_rate(reference: Sequence[Hashable], hypothesis: Sequence[Hashable]) -> float:
+    """
+    Edit distance as a percentage of the reference length
+    An empty reference scores 0 against an empty hypothesis and 100 otherwise.
+    The rate can exceed 100 when the hypothesis has many insertions.
+    """
+    if len(reference) == 0:
+        return 0.0 if len(hypothesis) == 0 else 100.0
+    return round(levenshtein(reference, hypothesis) / len(reference) * 100, 2)
+
+
+def cer(reference: str, hypothesis: str) -> float:
+    """Character Error Rate (%) between two already-normalized strings"""
+    return error_rate(reference, hypothesis)
+
+
+def wer(reference: str, hypothesis: str) -> float:
+    """Word Error Rate (%) between two already-normalized strings"""
+    return error_rate(reference.split(), hypothesis.split())
+
+
+def _batch(references: Sequence[str], hypotheses: Sequence[str], tokenize) -> np.ndarray:
+    """Score aligned columns pair by pair, computing each distinct pair only once"""
+    if len(references) != len(hypotheses):
+        raise ValueError("references and hypotheses must have the same length")
+    scores = np.empty(len(references), dtype=np.float64)
+    seen = {}
+    for i, pair in enumerate(zip(references, hypotheses)):
+        score = seen.get(pair)
+        if score is None:
+            reference, hypothesis = pair
+            score = 0.0 if reference == hypothesis else error_rate(tokenize(reference), tokenize(hypothesis))
+            seen[pair] = score
+        scores[i] = score
+    return scores
+
+
+def cer_batch(references: Sequence[str], hypotheses: Sequence[str]) -> np.ndarray:
+    """
+    CER (%) for every pair of two equally long columns of normalized strings
+
+    A loop over cer() that skips repeated and identical pairs; it is no
+    faster than calling cer() per pair on distinct values.
+    """
+    return _batch(references, hypotheses, lambda text: text)
+
+
+def wer_batch(references: Sequence[str], hypotheses: Sequence[str]) -> np.ndarray:
+    """
+    WER (%) for every pair of two equally long columns of normalized strings
+
+    A loop over wer() that skips repeated and identical pairs; it is no
+    faster than calling wer() per pair on distinct values.
+    """
+    return _batch(references, hypotheses, str.split)
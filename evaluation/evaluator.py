@@ -2,14 +2,55 @@ import pandas as pd
 import numpy as np
 import os
 from difflib import SequenceMatcher
-import re
-from datetime import datetime
-import unicodedata
+import time
+import hashlib
+import pickle
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+try:
+    from . import address, edit_distance, id_normalizer, normalizer
+    from .results import ResultBuilder
+except ImportError:
+    import address
+    import edit_distance
+    import id_normalizer
+    import normalizer
+    from results import ResultBuilder
+
+# Scored fields, in report order
+METRIC_FIELDS = ['english_name', 'bangla_name', 'father_spouse', 'mother', 'dob', 'nid_no', 'address']
+
+# Smallest number of records sent to a worker process at once
+MIN_CHUNK_SIZE = 64
+
+# Bump when scoring output changes (invalidates incremental caches)
+METRICS_VERSION = 3
+
+# Columns score_record reads from an entered record and its ground truth row
+ENTRY_COLUMNS = ['image_id', 'english_name', 'bangla_name', 'father_spouse_name',
+                 'mother_name', 'dob', 'nid_no', 'plain_address']
+TRUTH_COLUMNS = ['name_english', 'name_bangla', 'father_name', 'spouse_name',
+                 'mother_name', 'dob', 'nid_no', 'address', 'doc_date']
+
+# Keys under which evaluate() attaches column-normalized DOB/NID to record dicts
+NORMALIZED_DOB = '_dob_normalized'
+NORMALIZED_NID = '_nid_normalized'
+
+class FieldComparison(NamedTuple):
+    """All metrics for one compared field"""
+    accuracy: float
+    cer: float
+    wer: float
+    lev_cer: float
+    lev_wer: float
 
 class ResultsEvaluator:
     """Evaluate NID data entry results against ground truth"""
     
-    def __init__(self, person1_csv, person2_csv, ground_truth_csv):
+    def __init__(self, person1_csv, person2_csv, ground_truth_csv, workers=1, cache_path=None,
+                 address_components=False, extra_csvs=()):
         """
         Initialize evaluator with result files and ground truth
         
@@ -17,17 +58,42 @@ class ResultsEvaluator:
             person1_csv: Path to person 1 results
             person2_csv: Path to person 2 results
             ground_truth_csv: Path to ground truth data (nid-data-140126.csv)
+            workers: Processes used for scoring (1 = no pool, 0/None = all cores)
+            cache_path: Optional score cache for incremental evaluation; only
+                        records whose fingerprint isn't cached are re-scored
+            address_components: Also score each address component (holding,
+                        post office, ...) separately
+            extra_csvs: Further entry result CSVs evaluated with persons 1 and 2,
+                        e.g. the shared work queue's (missing files are skipped)
         """
+        self.workers = workers
+        self.cache_path = cache_path
+        self.address_components = address_components
+        self.rescored_records = None
         self.person1_results = pd.read_csv(person1_csv) if os.path.exists(person1_csv) else pd.DataFrame()
         self.person2_results = pd.read_csv(person2_csv) if os.path.exists(person2_csv) else pd.DataFrame()
+        self.extra_results = [pd.read_csv(path) for path in extra_csvs if os.path.exists(path)]
         # Read ground truth with explicit na_values to handle both NaN and literal '\N' strings (backslash-N)
         # Only include specific markers, not generic 'NA' or 'N/A' which could match partial text
         self.ground_truth = pd.read_csv(ground_truth_csv, sep='\t', keep_default_na=True, 
                                        na_values=['\\N', 'nan', 'NaN', ''])
         
+    @classmethod
+    def for_scoring(cls, address_components=False):
+        """
+        Evaluator used only for its comparison methods (compare_field,
+        score_record); no result or ground truth CSVs are loaded
+        """
+        scorer = cls.__new__(cls)
+        scorer.workers = 1
+        scorer.cache_path = None
+        scorer.address_components = address_components
+        scorer.rescored_records = None
+        return scorer
+    
     def merge_results(self):
-        """Merge person 1 and person 2 results"""
-        merged = pd.concat([self.person1_results, self.person2_results], ignore_index=True)
+        """Merge person 1, person 2 and any extra results"""
+        merged = pd.concat([self.person1_results, self.person2_results, *self.extra_results], ignore_index=True)
         return merged
     
     def normalize_text(self, text_value):
@@ -37,189 +103,63 @@ class ResultsEvaluator:
         Converts Devanagari script to Bengali script
         Removes extra diacritical marks and viramas
         Removes problematic characters (Devanagari danda, etc.)
+        See normalizer.py (memoized, precompiled tables)
         """
         if pd.isna(text_value):
             return ""
         
-        text_str = str(text_value).strip()
-        # Apply NFC normalization
-        text_str = unicodedata.normalize('NFC', text_str)
-        
-        # Remove Devanagari Danda and replace with space/period
-        text_str = text_str.replace('\u0964', '.')  # Devanagari Danda -> period
-        text_str = text_str.replace('\u0965', '.')  # Devanagari Double Danda -> period
-        
-        # Convert Devanagari to Bengali if present
-        text_str = self._devanagari_to_bengali(text_str)
-        
-        # Remove extra/misplaced viramas (halant characters)
-        text_str = self._remove_invalid_viramas(text_str)
-        
-        # Clean up multiple spaces
-        text_str = ' '.join(text_str.split())
-        
-        return text_str
+        return normalizer.normalize(str(text_value))
     
     def _remove_invalid_viramas(self, text):
         """
         Remove viramas (halant) that appear in invalid positions
         Bengali virama: U+09CD
-        A virama is invalid if it appears after a vowel matra or at the end
-        """
-        virama = '\u09CD'
-        vowel_matras = {
-            '\u09BE',  # া (AA matra)
-            '\u09BF',  # ি (I matra)
-            '\u09C0',  # ী (II matra)
-            '\u09C1',  # ু (U matra)
-            '\u09C2',  # ূ (UU matra)
-            '\u09C7',  # ে (E matra)
-            '\u09C8',  # ৈ (AI matra)
-            '\u09CB',  # ো (O matra)
-            '\u09CC',  # ৌ (AU matra)
-        }
-        
-        result = []
-        i = 0
-        while i < len(text):
-            char = text[i]
-            
-            if char == virama:
-                # Check if this virama is invalid
-                # It's invalid if previous character is a vowel matra or if it's at the start
-                if i == 0 or text[i-1] in vowel_matras:
-                    # Skip this invalid virama
-                    i += 1
-                    continue
-            
-            result.append(char)
-            i += 1
-        
-        return ''.join(result)
+        A virama is invalid if it appears after a vowel matra or at the start
+        """
+        return normalizer.remove_invalid_viramas(text)
     
     def _devanagari_to_bengali(self, text):
         """
         Convert Devanagari script characters to Bengali equivalents
         This handles cases where Hindi/Devanagari was typed instead of Bengali
         """
-        # Mapping of Devanagari to Bengali Unicode characters
-        # Devanagari Unicode: 0900-097F, Bengali Unicode: 0980-09FF
-        devanagari_to_bengali = {
-            # Consonants
-            '\u0915': '\u0995',  # क -> ক
-            '\u0916': '\u0996',  # ख -> খ
-            '\u0917': '\u0997',  # ग -> গ
-            '\u0918': '\u0998',  # घ -> ঘ
-            '\u0919': '\u0999',  # ङ -> ঙ
-            '\u091A': '\u099A',  # च -> চ
-            '\u091B': '\u099B',  # छ -> ছ
-            '\u091C': '\u099C',  # ज -> জ
-            '\u091D': '\u099D',  # झ -> ঝ
-            '\u091E': '\u099E',  # ञ -> ঞ
-            '\u091F': '\u09A1',  # ट -> ট
-            '\u0920': '\u09A2',  # ठ -> ঠ
-            '\u0921': '\u09A3',  # ड -> ড
-            '\u0922': '\u09A4',  # ढ -> ঢ
-            '\u0923': '\u09A3',  # ण -> ণ
-            '\u0924': '\u09A4',  # त -> ত
-            '\u0925': '\u09A5',  # थ -> থ
-            '\u0926': '\u09A6',  # द -> দ
-            '\u0927': '\u09A7',  # ध -> ধ
-            '\u0928': '\u09A8',  # न -> ন
-            '\u092A': '\u09AA',  # प -> প
-            '\u092B': '\u09AB',  # फ -> ফ
-            '\u092C': '\u09AC',  # ब -> ব
-            '\u092D': '\u09AD',  # भ -> ভ
-            '\u092E': '\u09AE',  # म -> ম
-            '\u092F': '\u09AF',  # य -> য
-            '\u0930': '\u09B0',  # र -> র
-            '\u0932': '\u09B2',  # ल -> ল
-            '\u0935': '\u09B5',  # व -> ব
-            '\u0936': '\u09B6',  # श -> শ
-            '\u0937': '\u09B7',  # ष -> ষ
-            '\u0938': '\u09B8',  # स -> স
-            '\u0939': '\u09B9',  # ह -> হ
-            # Vowels (independent forms)
-            '\u0905': '\u0985',  # अ -> অ
-            '\u0906': '\u0986',  # आ -> আ
-            '\u0907': '\u0987',  # इ -> ই
-            '\u0908': '\u0988',  # ई -> ঈ
-            '\u0909': '\u0989',  # उ -> উ
-            '\u090A': '\u098A',  # ऊ -> ঊ
-            '\u090F': '\u098F',  # ए -> এ
-            '\u0910': '\u0990',  # ऐ -> ৈ
-            '\u0913': '\u0993',  # ओ -> ও
-            '\u0914': '\u0994',  # औ -> ৌ
-            # Vowel signs (matras/diacritics)
-            '\u093E': '\u09BE',  # ा -> া (AA matra)
-            '\u093F': '\u09BF',  # ि -> ি (I matra)
-            '\u0940': '\u09C0',  # ी -> ী (II matra)
-            '\u0941': '\u09C1',  # ु -> ু (U matra)
-            '\u0942': '\u09C2',  # ू -> ূ (UU matra)
-            '\u0947': '\u09C7',  # े -> ে (E matra)
-            '\u0948': '\u09C8',  # ै -> ৈ (AI matra)
-            '\u094B': '\u09CB',  # ो -> ো (O matra)
-            '\u094C': '\u09CC',  # ौ -> ৌ (AU matra)
-            # Special characters
-            '\u094D': '\u09CD',  # ् -> ্ (virama/halant)
-            '\u0902': '\u0981',  # ं -> ঁ (anusvara)
-            '\u0903': '\u0983',  # ः -> ঃ (visarga)
-            '\u0900': '\u0980',  # ॐ -> ৐ (om)
-        }
-        
-        result = []
-        for char in text:
-            result.append(devanagari_to_bengali.get(char, char))
-        return ''.join(result)
+        return normalizer.devanagari_to_bengali(text)
     
     def normalize_dob(self, dob_value):
         """
         Normalize DOB to YYYY-MM-DD format
         Handles: YYYY-MM-DD, YYYY/MM/DD, YYYYMMDD, etc.
+        See id_normalizer.py
         """
-        if pd.isna(dob_value):
-            return ""
-        
-        dob_str = str(dob_value).strip()
-        
-        # If already in YYYY-MM-DD format
-        if re.match(r'^\d{4}-\d{2}-\d{2}$', dob_str):
-            return dob_str
-        
-        # Replace common separators with dash
-        dob_normalized = dob_str.replace('/', '-').replace(' ', '-')
-        
-        # Remove extra dashes and spaces
-        dob_normalized = re.sub(r'-+', '-', dob_normalized).strip('-')
-        
-        # Try to parse and reformat
-        for fmt in ['%Y-%m-%d', '%Y%m%d', '%d-%m-%Y', '%d/%m/%Y']:
-            try:
-                parsed = datetime.strptime(dob_normalized.replace('-', ''), fmt.replace('-', '').replace('/', ''))
-                return parsed.strftime('%Y-%m-%d')
-            except:
-                continue
-        
-        return dob_str
+        return id_normalizer.normalize_dob(dob_value)
+    
+    def normalize_dob_column(self, values):
+        """
+        normalize_dob over a whole column (list of normalized strings)
+        See id_normalizer.py
+        """
+        return id_normalizer.normalize_dob_column(values)
     
     def normalize_nid(self, nid_value):
         """
         Normalize NID to integer (as string)
         Removes decimals, spaces, etc.
+        See id_normalizer.py
         """
-        if pd.isna(nid_value):
-            return ""
-        
-        nid_str = str(nid_value).strip()
-        
-        # Remove decimal point if present (e.g., 6032068741.0 -> 6032068741)
-        if '.' in nid_str:
-            nid_str = nid_str.split('.')[0]
-        
-        # Remove any non-digit characters
-        nid_str = re.sub(r'\D', '', nid_str)
-        
-        return nid_str
+        return id_normalizer.normalize_nid(nid_value)
+    
+    def add_normalized_ids(self, entries, predictions):
+        """
+        Attach normalized DOB and NID to matched record dicts
+        score_record uses them instead of normalizing again; DOBs are
+        normalized a column at a time.
+        """
+        for rows in (entries, predictions):
+            dobs = self.normalize_dob_column([row.get('dob', '') for row in rows])
+            nids = [self.normalize_nid(row.get('nid_no', '')) for row in rows]
+            for row, dob, nid in zip(rows, dobs, nids):
+                row[NORMALIZED_DOB] = dob
+                row[NORMALIZED_NID] = nid
     
     def extract_image_id(self, front_image_path):
         """Extract image ID from front_image path"""
@@ -278,194 +218,341 @@ class ResultsEvaluator:
         matcher = SequenceMatcher(None, actual_str, predicted_str)
         return round(matcher.ratio() * 100, 2)
     
-    def evaluate(self):
-        """Evaluate all results and generate comparison CSV"""
-        # Merge results from both persons
-        merged_results = self.merge_results()
+    def compare_field(self, actual, predicted):
+        """
+        Compute every metric for one field in a single pass
+        Each value is normalized once and one character-level match gives
+        both accuracy and CER. Results are identical to field_accuracy,
+        character_error_rate and word_error_rate, plus the edit-distance rates.
+        
+        Returns:
+            FieldComparison(accuracy, cer, wer, lev_cer, lev_wer)
+        """
+        actual_missing = pd.isna(actual)
+        predicted_missing = pd.isna(predicted)
+        if actual_missing or predicted_missing:
+            accuracy = 100.0 if actual_missing and predicted_missing else 0.0
+            return FieldComparison(accuracy, 100.0, 100.0, 100.0, 100.0)
+        
+        actual_str = self.normalize_text(actual).lower()
+        predicted_str = self.normalize_text(predicted).lower()
         
+        if actual_str == predicted_str:
+            return FieldComparison(100.0, 0.0, 0.0, 0.0, 0.0)
+        
+        actual_words = actual_str.split()
+        predicted_words = predicted_str.split()
+        
+        ratio = SequenceMatcher(None, actual_str, predicted_str).ratio()
+        accuracy = round(ratio * 100, 2)
+        if len(actual_str) == 0:
+            cer = 100.0
+        else:
+            cer = round((1 - ratio) * 100, 2)
+        
+        if len(actual_words) == 0:
+            wer = 0.0 if len(predicted_words) == 0 else 100.0
+        else:
+            word_ratio = SequenceMatcher(None, actual_words, predicted_words).ratio()
+            wer = round((1 - word_ratio) * 100, 2)
+        
+        return FieldComparison(
+            accuracy, cer, wer,
+            edit_distance.error_rate(actual_str, predicted_str),
+            edit_distance.error_rate(actual_words, predicted_words),
+        )
+    
+    @staticmethod
+    def _first_positions(keys):
+        """Hash index of key -> position of its first occurrence"""
+        keys = pd.Series(keys).reset_index(drop=True)
+        first = ~keys.duplicated(keep='first')
+        return dict(zip(keys[first], np.flatnonzero(first.to_numpy())))
+    
+    def _ground_truth_keys(self, frame):
+        """
+        Matching keys for ground truth rows: front image_id, back image_id and
+        NID number, as the strings the row-by-row comparison used
+        """
+        front_ids = frame['front_image'].apply(self.extract_image_id)
+        back_ids = frame['back_image'].apply(self.extract_image_id)
+        nid_keys = frame['nid_no'].astype(str).str.replace('.0', '', regex=False)
+        return front_ids, back_ids, nid_keys
+    
+    def _build_match_indexes(self):
+        """
+        Build hash indexes over the ground truth for record matching.
+        Keys are the same strings the row-by-row comparison used, so matches
+        (including first-match-wins on duplicates) are unchanged.
+        """
+        front_ids, back_ids, nid_keys = self._ground_truth_keys(self.ground_truth)
         # Create image_id column in ground truth from both front and back images
-        self.ground_truth['image_id'] = self.ground_truth['front_image'].apply(self.extract_image_id)
+        self.ground_truth['image_id'] = front_ids
         # Add fallback from back_image if front_image is missing
-        self.ground_truth['image_id_back'] = self.ground_truth['back_image'].apply(self.extract_image_id)
+        self.ground_truth['image_id_back'] = back_ids
         
-        # Create evaluation dataframe
-        evaluation_data = []
-        matched_count = 0
-        no_match_count = 0
-        
-        for idx, row in merged_results.iterrows():
-            # Extract ground truth values (from entered data - persons 1 and 2)
-            gt_english = row.get('english_name', '')
-            gt_bangla = row.get('bangla_name', '')
-            gt_father = row.get('father_spouse_name', '')
-            gt_mother = row.get('mother_name', '')
-            gt_dob = row.get('dob', '')
-            gt_nid = row.get('nid_no', '')
-            gt_address = row.get('plain_address', '')
-            image_id = row.get('image_id', '')
-            
-            # Try to find matching prediction (from nid-data-140126.csv) by:
-            # 1. PRIORITY: Match by image_id (front or back) - most reliable
-            # 2. FALLBACK: Match by NID number only if image_id is missing or not found
-            pred_row = None
+        return {
+            'front_image_id': self._first_positions(front_ids.astype(str)),
+            'back_image_id': self._first_positions(back_ids.astype(str)),
+            'nid_number': self._first_positions(nid_keys),
+        }
+    
+    def match_records(self, merged_results):
+        """
+        Match entered records to ground truth rows using hash indexes.
+        
+        Priority:
+        1. Match by image_id against the front image - most reliable
+        2. Match by image_id against the back image
+        3. Match by NID number, ONLY if the entered record has no image_id
+           (prevents matching to wrong records when multiple NIDs exist)
+        
+        Returns:
+            DataFrame with entry_pos, gt_pos and match_method for each matched
+            record, in entered-record order. Unmatched records are left out.
+        """
+        return self._match_with_indexes(merged_results, self._build_match_indexes())
+    
+    @staticmethod
+    def _entry_keys(merged_results):
+        """Entered image_id and NID columns (blank if the column is missing)"""
+        blank = pd.Series([''] * len(merged_results))
+        image_ids = merged_results['image_id'] if 'image_id' in merged_results else blank
+        nids = merged_results['nid_no'] if 'nid_no' in merged_results else blank
+        return image_ids, nids
+    
+    def _match_with_indexes(self, merged_results, indexes):
+        """Look up each entered record in the key -> ground truth position indexes"""
+        front_index = indexes['front_image_id']
+        back_index = indexes['back_image_id']
+        nid_index = indexes['nid_number']
+        
+        image_ids, nids = self._entry_keys(merged_results)
+        
+        entry_positions = []
+        gt_positions = []
+        match_methods = []
+        for entry_pos, (image_id, gt_nid) in enumerate(zip(image_ids, nids)):
+            gt_pos = None
             match_method = None
-            
-            # Try matching by image_id (from front_image) - PRIMARY METHOD
             if image_id:
-                pred_matches = self.ground_truth[self.ground_truth['image_id'].astype(str) == str(image_id)]
-                if not pred_matches.empty:
-                    pred_row = pred_matches.iloc[0]
-                    matched_count += 1
+                key = str(image_id)
+                gt_pos = front_index.get(key)
+                if gt_pos is not None:
                     match_method = 'front_image_id'
+                else:
+                    gt_pos = back_index.get(key)
+                    if gt_pos is not None:
+                        match_method = 'back_image_id'
             
-            # Try matching by back_image if front didn't match - SECONDARY METHOD
-            if pred_row is None and image_id:
-                pred_matches = self.ground_truth[self.ground_truth['image_id_back'].astype(str) == str(image_id)]
-                if not pred_matches.empty:
-                    pred_row = pred_matches.iloc[0]
-                    matched_count += 1
-                    match_method = 'back_image_id'
-            
-            # ONLY use NID matching if image_id is missing (no image data was submitted)
-            # This prevents matching to wrong records when multiple NIDs exist
-            if pred_row is None and (not image_id or str(image_id).strip() == ''):
+            if gt_pos is None and (not image_id or str(image_id).strip() == ''):
                 if gt_nid:
-                    pred_matches = self.ground_truth[
-                        self.ground_truth['nid_no'].astype(str).str.replace('.0', '') == str(gt_nid).replace('.0', '')
-                    ]
-                    if not pred_matches.empty:
-                        pred_row = pred_matches.iloc[0]
-                        matched_count += 1
+                    gt_pos = nid_index.get(str(gt_nid).replace('.0', ''))
+                    if gt_pos is not None:
                         match_method = 'nid_number'
             
-            if pred_row is None:
-                # If no match found, skip this record
-                no_match_count += 1
-                continue
-            
-            # Extract predicted (Polygon OCR from nid-data-140126.csv) values
-            pred_english = pred_row.get('name_english', '')
-            pred_bangla = pred_row.get('name_bangla', '')
-            # Use father_name, or fall back to spouse_name if father_name is missing
-            pred_father = pred_row.get('father_name', '')
-            if pd.isna(pred_father) or (isinstance(pred_father, str) and pred_father.strip() == ''):
-                pred_father = pred_row.get('spouse_name', '')
-            pred_mother = pred_row.get('mother_name', '')
-            pred_dob = pred_row.get('dob', '')
-            pred_nid = pred_row.get('nid_no', '')
-            pred_address = pred_row.get('address', '')
-            pred_doc_date = pred_row.get('doc_date', '')
-            
-            # Normalize DOB and NID for comparison
+            if gt_pos is not None:
+                entry_positions.append(entry_pos)
+                gt_positions.append(gt_pos)
+                match_methods.append(match_method)
+        
+        return pd.DataFrame({
+            'entry_pos': np.asarray(entry_positions, dtype=np.int64),
+            'gt_pos': np.asarray(gt_positions, dtype=np.int64),
+            'match_method': match_methods,
+        })
+    
+    def score_record(self, row, pred_row, match_method):
+        """
+        Compare one entered record with its matched ground truth row
+        
+        Args:
+            row: Entered record (dict)
+            pred_row: Matched ground truth row (dict)
+            match_method: How the two were matched
+        
+        Returns:
+            Evaluation row (dict) with values and metrics for every field
+        """
+        # Extract ground truth values (from entered data - persons 1 and 2)
+        gt_english = row.get('english_name', '')
+        gt_bangla = row.get('bangla_name', '')
+        gt_father = row.get('father_spouse_name', '')
+        gt_mother = row.get('mother_name', '')
+        gt_dob = row.get('dob', '')
+        gt_nid = row.get('nid_no', '')
+        gt_address = row.get('plain_address', '')
+        image_id = row.get('image_id', '')
+        
+        # Extract predicted (Polygon OCR from nid-data-140126.csv) values
+        pred_english = pred_row.get('name_english', '')
+        pred_bangla = pred_row.get('name_bangla', '')
+        # Use father_name, or fall back to spouse_name if father_name is missing
+        pred_father = pred_row.get('father_name', '')
+        if pd.isna(pred_father) or (isinstance(pred_father, str) and pred_father.strip() == ''):
+            pred_father = pred_row.get('spouse_name', '')
+        pred_mother = pred_row.get('mother_name', '')
+        pred_dob = pred_row.get('dob', '')
+        pred_nid = pred_row.get('nid_no', '')
+        pred_address = pred_row.get('address', '')
+        pred_doc_date = pred_row.get('doc_date', '')
+        
+        # Normalize DOB and NID for comparison (evaluate() normalizes whole columns up front)
+        if NORMALIZED_DOB in row and NORMALIZED_DOB in pred_row:
+            gt_dob_norm, gt_nid_norm = row[NORMALIZED_DOB], row[NORMALIZED_NID]
+            pred_dob_norm, pred_nid_norm = pred_row[NORMALIZED_DOB], pred_row[NORMALIZED_NID]
+        else:
             gt_dob_norm = self.normalize_dob(gt_dob)
             pred_dob_norm = self.normalize_dob(pred_dob)
             gt_nid_norm = self.normalize_nid(gt_nid)
             pred_nid_norm = self.normalize_nid(pred_nid)
-            
+        
 
-            # Calculate metrics for each field
-            english_acc = self.field_accuracy(gt_english, pred_english)
-            english_cer = self.character_error_rate(gt_english, pred_english)
-            english_wer = self.word_error_rate(gt_english, pred_english)
-            
-            bangla_acc = self.field_accuracy(gt_bangla, pred_bangla)
-            bangla_cer = self.character_error_rate(gt_bangla, pred_bangla)
-            bangla_wer = self.word_error_rate(gt_bangla, pred_bangla)
-            
-            father_acc = self.field_accuracy(gt_father, pred_father)
-            father_cer = self.character_error_rate(gt_father, pred_father)
-            father_wer = self.word_error_rate(gt_father, pred_father)
-            
-            mother_acc = self.field_accuracy(gt_mother, pred_mother)
-            mother_cer = self.character_error_rate(gt_mother, pred_mother)
-            mother_wer = self.word_error_rate(gt_mother, pred_mother)
-            
-            # Use normalized DOB for comparison
-            dob_acc = self.field_accuracy(gt_dob_norm, pred_dob_norm)
-            dob_cer = self.character_error_rate(gt_dob_norm, pred_dob_norm)
-            dob_wer = self.word_error_rate(gt_dob_norm, pred_dob_norm)
-            
-            # Use normalized NID for comparison
-            nid_acc = self.field_accuracy(gt_nid_norm, pred_nid_norm)
-            nid_cer = self.character_error_rate(gt_nid_norm, pred_nid_norm)
-            nid_wer = self.word_error_rate(gt_nid_norm, pred_nid_norm)
-            
-            # Use address for comparison (without prefix)
-            address_acc = self.field_accuracy(gt_address, pred_address)
-            address_cer = self.character_error_rate(gt_address, pred_address)
-            address_wer = self.word_error_rate(gt_address, pred_address)
-            
-            # Overall accuracy (average of all fields)
-            overall_acc = np.mean([english_acc, bangla_acc, father_acc, mother_acc, dob_acc, nid_acc, address_acc])
-            overall_cer = np.mean([english_cer, bangla_cer, father_cer, mother_cer, dob_cer, nid_cer, address_cer])
-            overall_wer = np.mean([english_wer, bangla_wer, father_wer, mother_wer, dob_wer, nid_wer, address_wer])
+        # Calculate metrics for each field
+        # DOB and NID are compared in their normalized form
+        comparisons = {
+            'english_name': self.compare_field(gt_english, pred_english),
+            'bangla_name': self.compare_field(gt_bangla, pred_bangla),
+            'father_spouse': self.compare_field(gt_father, pred_father),
+            'mother': self.compare_field(gt_mother, pred_mother),
+            'dob': self.compare_field(gt_dob_norm, pred_dob_norm),
+            'nid_no': self.compare_field(gt_nid_norm, pred_nid_norm),
+            'address': self.compare_field(gt_address, pred_address),
+        }
+        
+        eval_row = {
+            'image_id': image_id,
+            'match_method': match_method,
             
-            eval_row = {
-                'image_id': image_id,
-                
-                # Ground Truth (Entered) Values
-                'actual_english_name': gt_english,
-                'actual_bangla_name': gt_bangla,
-                'actual_father_spouse': gt_father,
-                'actual_mother': gt_mother,
-                'actual_dob': gt_dob_norm,  # Use normalized format
-                'actual_nid_no': gt_nid_norm,  # Use normalized format
-                'actual_address': gt_address,
-                
-                # Predicted (Polygon OCR from nid-data-140126.csv) Values
-                'predicted_english_name': pred_english,
-                'predicted_bangla_name': pred_bangla,
-                'predicted_father_spouse': pred_father,
-                'predicted_mother': pred_mother,
-                'predicted_dob': pred_dob_norm,  # Use normalized format
-                'predicted_nid_no': pred_nid_norm,  # Use normalized format
-                'predicted_address': pred_address,
-                'predicted_doc_date': pred_doc_date,
-                
-                # English Name Metrics
-                'english_name_accuracy': english_acc,
-                'english_name_cer': english_cer,
-                'english_name_wer': english_wer,
-                
-                # Bangla Name Metrics
-                'bangla_name_accuracy': bangla_acc,
-                'bangla_name_cer': bangla_cer,
-                'bangla_name_wer': bangla_wer,
-                
-                # Father/Spouse Metrics
-                'father_spouse_accuracy': father_acc,
-                'father_spouse_cer': father_cer,
-                'father_spouse_wer': father_wer,
-                
-                # Mother Metrics
-                'mother_accuracy': mother_acc,
-                'mother_cer': mother_cer,
-                'mother_wer': mother_wer,
-                
-                # DOB Metrics
-                'dob_accuracy': dob_acc,
-                'dob_cer': dob_cer,
-                'dob_wer': dob_wer,
-                
-                # NID Metrics
-                'nid_no_accuracy': nid_acc,
-                'nid_no_cer': nid_cer,
-                'nid_no_wer': nid_wer,
-                
-                # Address Metrics
-                'address_accuracy': address_acc,
-                'address_cer': address_cer,
-                'address_wer': address_wer,
-                
-                # Overall Metrics
-                'overall_accuracy': round(overall_acc, 2),
-                'overall_cer': round(overall_cer, 2),
-                'overall_wer': round(overall_wer, 2),
-            }
+            # Ground Truth (Entered) Values
+            'actual_english_name': gt_english,
+            'actual_bangla_name': gt_bangla,
+            'actual_father_spouse': gt_father,
+            'actual_mother': gt_mother,
+            'actual_dob': gt_dob_norm,  # Use normalized format
+            'actual_nid_no': gt_nid_norm,  # Use normalized format
+            'actual_address': gt_address,
             
-            evaluation_data.append(eval_row)
+            # Predicted (Polygon OCR from nid-data-140126.csv) Values
+            'predicted_english_name': pred_english,
+            'predicted_bangla_name': pred_bangla,
+            'predicted_father_spouse': pred_father,
+            'predicted_mother': pred_mother,
+            'predicted_dob': pred_dob_norm,  # Use normalized format
+            'predicted_nid_no': pred_nid_norm,  # Use normalized format
+            'predicted_address': pred_address,
+            'predicted_doc_date': pred_doc_date,
+        }
         
-        return pd.DataFrame(evaluation_data)
+        for field, result in comparisons.items():
+            eval_row[f'{field}_accuracy'] = result.accuracy
+            eval_row[f'{field}_cer'] = result.cer
+            eval_row[f'{field}_wer'] = result.wer
+            eval_row[f'{field}_lev_cer'] = result.lev_cer
+            eval_row[f'{field}_lev_wer'] = result.lev_wer
+        
+        # Overall metrics (average of all fields)
+        for metric in FieldComparison._fields:
+            overall = np.mean([getattr(result, metric) for result in comparisons.values()])
+            eval_row[f'overall_{metric}'] = round(overall, 2)
+        
+        # Address components (holding, village/road, post office, ...) scored separately
+        if self.address_components:
+            address_scores = address.compare_components(gt_address, pred_address)
+            eval_row['address_components_accuracy'] = address_scores.pop('components_accuracy')
+            for component, rate in address_scores.items():
+                eval_row[f'address_{component}_lev_cer'] = rate
+        
+        return eval_row
+    
+    def evaluate(self):
+        """Evaluate all results and generate comparison CSV"""
+        # Merge results from both persons
+        merged_results = self.merge_results()
+        
+        matches = self.match_records(merged_results)
+        entries = merged_results.iloc[matches['entry_pos']].to_dict('records')
+        predictions = self.ground_truth.iloc[matches['gt_pos']].to_dict('records')
+        self.add_normalized_ids(entries, predictions)
+        records = list(zip(entries, predictions, matches['match_method']))
+        
+        # Evaluation rows go into compact typed columns as they are scored
+        results = ResultBuilder(capacity=len(records))
+        if self.cache_path:
+            results.extend(self._score_incremental(records))
+        else:
+            results.extend(self._score_records(records))
+        
+        # Create evaluation dataframe
+        return results.to_frame()
+    
+    def _score_records(self, records):
+        """Score records in-process or in a process pool, yielding rows in record order"""
+        workers = self.workers or os.cpu_count() or 1
+        if workers <= 1 or len(records) < 2 * MIN_CHUNK_SIZE:
+            return (self.score_record(*record) for record in records)
+        return self._score_parallel(records, workers)
+    
+    def record_fingerprint(self, row, pred_row, match_method):
+        """Hash of every input score_record reads, plus the metric and normalizer versions and options"""
+        values = [METRICS_VERSION, normalizer.NORMALIZER_VERSION, self.address_components, match_method]
+        values += [row.get(column, '') for column in ENTRY_COLUMNS]
+        values += [pred_row.get(column, '') for column in TRUTH_COLUMNS]
+        return hashlib.blake2b(repr(values).encode('utf-8'), digest_size=16).hexdigest()
+    
+    def _load_cache(self):
+        """Load the fingerprint -> evaluation row cache (empty if missing or unreadable)"""
+        try:
+            with open(self.cache_path, 'rb') as f:
+                cache = pickle.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+            print(f"Ignoring unreadable score cache {self.cache_path}: {e}")
+            return {}
+        return cache if isinstance(cache, dict) else {}
+    
+    def _save_cache(self, cache):
+        """Write the score cache atomically"""
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.cache_path)
+    
+    def _score_incremental(self, records):
+        """
+        Score only records whose fingerprint isn't in the cache
+        Identical records are scored once. The cache is rewritten with the
+        current records only, so entries for deleted records are dropped.
+        """
+        cache = self._load_cache()
+        fingerprints = [self.record_fingerprint(*record) for record in records]
+        
+        pending = {}
+        for fingerprint, record in zip(fingerprints, records):
+            if fingerprint not in cache and fingerprint not in pending:
+                pending[fingerprint] = record
+        
+        scored = self._score_records(list(pending.values()))
+        cache.update(zip(pending.keys(), scored))
+        self.rescored_records = len(pending)
+        
+        self._save_cache({fingerprint: cache[fingerprint] for fingerprint in fingerprints})
+        return [cache[fingerprint] for fingerprint in fingerprints]
+    
+    def _score_parallel(self, records, workers):
+        """
+        Score matched records in a process pool
+        Records are split into contiguous chunks (a few per worker to even
+        out long addresses) and rows are yielded in record order as chunks finish.
+        """
+        chunk_size = max(MIN_CHUNK_SIZE, -(-len(records) // (workers * 4)))
+        chunks = [records[i:i + chunk_size] for i in range(0, len(records), chunk_size)]
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(type(self), self.address_components)) as executor:
+            for chunk_rows in executor.map(_score_chunk, chunks):
+                yield from chunk_rows
     
     def generate_report(self, output_csv):
         """Generate evaluation report and save to CSV"""
@@ -473,8 +560,16 @@ class ResultsEvaluator:
         merged_results = self.merge_results()
         total_records = len(merged_results)
         
+        start_time = time.perf_counter()
         evaluation_df = self.evaluate()
+        elapsed = self.elapsed = time.perf_counter() - start_time
         
+        evaluation_df.to_csv(output_csv, index=False)
+        self._print_report(evaluation_df, total_records, elapsed, output_csv)
+        return evaluation_df
+    
+    def _print_report(self, evaluation_df, total_records, elapsed, output_csv):
+        """Print matching and metric statistics for a finished evaluation"""
         if len(evaluation_df) == 0:
             print("\n" + "="*80)
             print("WARNING: No matching records found between entered data and ground truth!")
@@ -487,16 +582,13 @@ class ResultsEvaluator:
             print("  1. Image IDs don't match between datasets")
             print("  2. NID numbers are different or missing")
             print("  3. No data has been entered yet")
-            print("\nCreating empty evaluation file...")
-            evaluation_df.to_csv(output_csv, index=False)
-            return evaluation_df
+            print(f"\nCreated empty evaluation file: {output_csv}")
+            return
         
         matched_records = len(evaluation_df)
         unmatched_records = total_records - matched_records
         match_rate = (matched_records / total_records * 100) if total_records > 0 else 0
         
-        evaluation_df.to_csv(output_csv, index=False)
-        
         # Print summary statistics
         print("\n" + "="*80)
         print("EVALUATION REPORT SUMMARY")
@@ -506,15 +598,22 @@ class ResultsEvaluator:
         print(f"  Matched with ground truth: {matched_records}")
         print(f"  No match found: {unmatched_records}")
         print(f"  Match rate: {match_rate:.2f}%")
+        for method, count in evaluation_df['match_method'].value_counts().items():
+            print(f"    by {method}: {count}")
         print(f"\nTotal records evaluated: {matched_records}")
+        print(f"Evaluation time: {elapsed:.2f}s ({self.workers or os.cpu_count()} worker(s))")
+        if self.rescored_records is not None:
+            print(f"Incremental: re-scored {self.rescored_records} new/changed records, "
+                  f"reused {matched_records - self.rescored_records}")
         print(f"\nOverall Statistics:")
         print(f"  Average Accuracy: {evaluation_df['overall_accuracy'].mean():.2f}%")
         print(f"  Average CER: {evaluation_df['overall_cer'].mean():.2f}%")
         print(f"  Average WER: {evaluation_df['overall_wer'].mean():.2f}%")
+        print(f"  Average CER (edit distance): {evaluation_df['overall_lev_cer'].mean():.2f}%")
+        print(f"  Average WER (edit distance): {evaluation_df['overall_lev_wer'].mean():.2f}%")
         
         print(f"\nPer-Field Statistics:")
-        fields = ['english_name', 'bangla_name', 'father_spouse', 'mother', 'dob', 'nid_no', 'address']
-        for field in fields:
+        for field in METRIC_FIELDS:
             acc_col = f'{field}_accuracy'
             cer_col = f'{field}_cer'
             wer_col = f'{field}_wer'
@@ -522,26 +621,98 @@ class ResultsEvaluator:
             print(f"    Accuracy: {evaluation_df[acc_col].mean():.2f}%")
             print(f"    CER: {evaluation_df[cer_col].mean():.2f}%")
             print(f"    WER: {evaluation_df[wer_col].mean():.2f}%")
+            print(f"    CER (edit distance): {evaluation_df[f'{field}_lev_cer'].mean():.2f}%")
+            print(f"    WER (edit distance): {evaluation_df[f'{field}_lev_wer'].mean():.2f}%")
+        
+        if 'address_components_accuracy' in evaluation_df.columns:
+            print(f"\nAddress Components (CER, edit distance):")
+            print(f"  Components matched: {evaluation_df['address_components_accuracy'].mean():.2f}%")
+            for component in address.COMPONENTS:
+                print(f"    {component}: {evaluation_df[f'address_{component}_lev_cer'].mean():.2f}%")
         
         print(f"\nEvaluation report saved to: {output_csv}")
         print("="*80 + "\n")
-        
-        return evaluation_df
+
+
+# Scorer used by pool worker processes (set once per process by _init_worker)
+_worker_scorer = None
+
+
+def _init_worker(evaluator_class, address_components):
+    """Process pool initializer: create a scorer without loading any CSVs"""
+    global _worker_scorer
+    _worker_scorer = evaluator_class.for_scoring(address_components)
+
+
+def _score_chunk(records):
+    """Process pool task: score a chunk of (entry, ground truth, match_method) records"""
+    return [_worker_scorer.score_record(*record) for record in records]
 
 
 def main():
     """Main function to run evaluation"""
+    parser = argparse.ArgumentParser(description="Evaluate NID data entry results against ground truth")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Processes used for scoring (0 = all CPU cores, default: 1)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Only re-score records that changed since the last incremental run")
+    parser.add_argument('--streaming', action='store_true',
+                        help="Read the ground truth in chunks instead of loading it (for large exports)")
+    parser.add_argument('--chunk-size', type=int, default=50000,
+                        help="Rows per chunk in streaming mode (default: 50000)")
+    parser.add_argument('--address-components', action='store_true',
+                        help="Also score each address component (holding, post office, ...) separately")
+    parser.add_argument('--record', action='store_true',
+                        help="Record this run in the run registry (data/runs.sqlite)")
+    parser.add_argument('--label', default='',
+                        help="Label stored with this run in the run registry (implies --record)")
+    args = parser.parse_args()
+    if args.streaming and args.incremental:
+        # StreamingEvaluator scores every chunk in full and has no score cache
+        parser.error("--incremental can't be combined with --streaming")
+    
     project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     
     # Define file paths
     person1_results = os.path.join(project_root, "data", "nid-data-entry-results-person1.csv")
     person2_results = os.path.join(project_root, "data", "nid-data-entry-results-person2.csv")
+    # Written by the shared work-queue entry app (streamlit/app_entry.py)
+    shared_results = os.path.join(project_root, "data", "nid-data-entry-results-shared.csv")
     ground_truth = os.path.join(project_root, "data", "nid-data-140126.csv")
     output_csv = os.path.join(project_root, "data", "evaluation_results.csv")
+    cache_path = os.path.join(project_root, "data", "evaluation_results.cache.pkl") if args.incremental else None
     
     # Run evaluation
-    evaluator = ResultsEvaluator(person1_results, person2_results, ground_truth)
-    evaluator.generate_report(output_csv)
+    if args.streaming:
+        try:
+            from .streaming import StreamingEvaluator
+        except ImportError:
+            from streaming import StreamingEvaluator
+        evaluator = StreamingEvaluator(person1_results, person2_results, ground_truth,
+                                       chunk_size=args.chunk_size, workers=args.workers,
+                                       address_components=args.address_components,
+                                       extra_csvs=[shared_results])
+    else:
+        evaluator = ResultsEvaluator(person1_results, person2_results, ground_truth,
+                                     workers=args.workers, cache_path=cache_path,
+                                     address_components=args.address_components,
+                                     extra_csvs=[shared_results])
+    evaluation_df = evaluator.generate_report(output_csv)
+
+    if (args.record or args.label) and len(evaluation_df):
+        try:
+            from .runs import RunRegistry
+        except ImportError:
+            from runs import RunRegistry
+        registry = RunRegistry(os.path.join(project_root, "data", "runs.sqlite"))
+        run_id = registry.record(
+            'evaluation', evaluation_df,
+            config={'ground_truth': os.path.basename(ground_truth), 'streaming': args.streaming,
+                    'incremental': args.incremental, 'address_components': args.address_components},
+            stats={'elapsed': evaluator.elapsed, 'workers': args.workers or os.cpu_count()},
+            label=args.label,
+        )
+        print(f"Run recorded: {run_id}")
 
 
 if __name__ == "__main__":
@@ -8,11 +8,20 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 
+try:
+    from .aggregate import load_aggregates
+    from .stats import format_ci, DEFAULT_CONFIDENCE
+except ImportError:
+    from aggregate import load_aggregates
+    from stats import format_ci, DEFAULT_CONFIDENCE
+
 
 def generate_overall_summary(evaluation_csv='data/evaluation_results.csv', output_file='data/EVALUATION_SUMMARY.txt'):
     """Generate comprehensive evaluation summary"""
     
     df = pd.read_csv(evaluation_csv)
+    aggregates = load_aggregates(evaluation_csv, df)
+    columns = aggregates['columns']
     
     # Define fields
     fields = {
@@ -48,13 +57,14 @@ def generate_overall_summary(evaluation_csv='data/evaluation_results.csv', outpu
     summary_lines.append("OVERALL METRICS")
     summary_lines.append("=" * 92)
     
-    overall_acc = df['overall_accuracy'].mean()
-    overall_cer = df['overall_cer'].mean()
-    overall_wer = df['overall_wer'].mean()
+    overall_acc = columns['overall_accuracy']['mean']
+    overall_cer = columns['overall_cer']['mean']
+    overall_wer = columns['overall_wer']['mean']
     
-    summary_lines.append(f"Average Accuracy:               {overall_acc:>6.2f}%")
-    summary_lines.append(f"Average CER (Character Error):  {overall_cer:>6.2f}%")
-    summary_lines.append(f"Average WER (Word Error):       {overall_wer:>6.2f}%")
+    summary_lines.append(f"Average Accuracy:               {overall_acc:>6.2f}%  {format_ci(columns['overall_accuracy'])}")
+    summary_lines.append(f"Average CER (Character Error):  {overall_cer:>6.2f}%  {format_ci(columns['overall_cer'])}")
+    summary_lines.append(f"Average WER (Word Error):       {overall_wer:>6.2f}%  {format_ci(columns['overall_wer'])}")
+    summary_lines.append(f"(Intervals: {DEFAULT_CONFIDENCE:.0%} bootstrap confidence intervals of the mean)")
     summary_lines.append("")
     
     # Accuracy Distribution
@@ -62,12 +72,13 @@ def generate_overall_summary(evaluation_csv='data/evaluation_results.csv', outpu
     summary_lines.append("ACCURACY DISTRIBUTION")
     summary_lines.append("=" * 92)
     
-    excellent = len(df[df['overall_accuracy'] >= 95])
-    good = len(df[(df['overall_accuracy'] >= 80) & (df['overall_accuracy'] < 95)])
-    fair = len(df[(df['overall_accuracy'] >= 60) & (df['overall_accuracy'] < 80)])
-    poor = len(df[df['overall_accuracy'] < 60])
+    tiers = aggregates['tiers']
+    excellent = tiers['excellent']
+    good = tiers['good']
+    fair = tiers['fair']
+    poor = tiers['poor']
     
-    total = len(df)
+    total = aggregates['records']
     
     summary_lines.append(f"🟢 EXCELLENT (≥95%):            {excellent:>3} records ({100*excellent/total:>5.1f}%)")
     summary_lines.append(f"🔵 GOOD (80-95%):               {good:>3} records ({100*good/total:>5.1f}%)")
@@ -100,17 +111,17 @@ def generate_overall_summary(evaluation_csv='data/evaluation_results.csv', outpu
     
     field_stats = []
     for field_key, field_name in fields.items():
-        acc = df[f'{field_key}_accuracy'].mean()
-        cer = df[f'{field_key}_cer'].mean()
-        wer = df[f'{field_key}_wer'].mean()
-        field_stats.append((field_name, acc, cer, wer))
+        acc = columns[f'{field_key}_accuracy']
+        cer = columns[f'{field_key}_cer']['mean']
+        wer = columns[f'{field_key}_wer']['mean']
+        field_stats.append((field_name, acc['mean'], cer, wer, format_ci(acc)))
     
     field_stats.sort(key=lambda x: x[1], reverse=True)
     
-    summary_lines.append(f"{'Field':<20} {'Accuracy':>10} {'CER':>10} {'WER':>10} {'Quality':>15}")
+    summary_lines.append(f"{'Field':<20} {'Accuracy':>10} {'Accuracy CI':>17} {'CER':>10} {'WER':>10} {'Quality':>15}")
     summary_lines.append("-" * 92)
     
-    for field_name, acc, cer, wer in field_stats:
+    for field_name, acc, cer, wer, acc_ci in field_stats:
         if acc >= 95:
             quality = "🟢 Excellent"
         elif acc >= 80:
@@ -120,7 +131,7 @@ def generate_overall_summary(evaluation_csv='data/evaluation_results.csv', outpu
         else:
             quality = "🔴 Poor"
         
-        summary_lines.append(f"{field_name:<20} {acc:>9.2f}% {cer:>9.2f}% {wer:>9.2f}% {quality:>15}")
+        summary_lines.append(f"{field_name:<20} {acc:>9.2f}% {acc_ci:>17} {cer:>9.2f}% {wer:>9.2f}% {quality:>15}")
     
     summary_lines.append("")
     
@@ -130,22 +141,14 @@ def generate_overall_summary(evaluation_csv='data/evaluation_results.csv', outpu
     summary_lines.append("=" * 92)
     
     for field_key, field_name in fields.items():
-        acc_col = f'{field_key}_accuracy'
-        cer_col = f'{field_key}_cer'
-        wer_col = f'{field_key}_wer'
-        
-        acc_mean = df[acc_col].mean()
-        acc_min = df[acc_col].min()
-        acc_max = df[acc_col].max()
-        acc_std = df[acc_col].std()
-        
-        cer_mean = df[cer_col].mean()
-        wer_mean = df[wer_col].mean()
+        acc = columns[f'{field_key}_accuracy']
+        cer = columns[f'{field_key}_cer']
+        wer = columns[f'{field_key}_wer']
         
         summary_lines.append(f"\n{field_name.upper()}")
-        summary_lines.append(f"  Accuracy:  Mean={acc_mean:.2f}%  Min={acc_min:.2f}%  Max={acc_max:.2f}%  StdDev={acc_std:.2f}%")
-        summary_lines.append(f"  CER:       Mean={cer_mean:.2f}%")
-        summary_lines.append(f"  WER:       Mean={wer_mean:.2f}%")
+        summary_lines.append(f"  Accuracy:  Mean={acc['mean']:.2f}% {format_ci(acc)}  Min={acc['min']:.2f}%  Max={acc['max']:.2f}%  StdDev={acc['std']:.2f}%")
+        summary_lines.append(f"  CER:       Mean={cer['mean']:.2f}% {format_ci(cer)}")
+        summary_lines.append(f"  WER:       Mean={wer['mean']:.2f}% {format_ci(wer)}")
     
     summary_lines.append("")
     
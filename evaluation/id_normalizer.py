@@ -0,0 +1,154 @@
+"""
+DOB and NID normalization
+
+normalize_dob / normalize_nid normalize one value (the rules the evaluator
+has always used). normalize_dob_column gives the same results as
+normalize_dob for a whole column at once, which matters when a run
+normalizes hundreds of thousands of dates: each distinct value is handled
+once, with pandas string methods and pd.to_datetime instead of a strptime
+call per format.
+
+NIDs have no column version: without pyarrow, pandas string methods are
+Python loops, and normalize_nid is already about as fast as one.
+
+check_id_normalizer.py compares the two over the data CSVs and random
+values.
+"""
+
+import re
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# normalize_dob's "already YYYY-MM-DD" pattern
+ISO_DATE = r'\d{4}-\d{2}-\d{2}'
+
+# Dropped from DOBs before they are read as YYYYMMDD / DDMMYYYY
+DATE_SEPARATORS = r'[ /-]'
+
+# Years pd.to_datetime can represent in full (Timestamp.min / max fall mid-year)
+MIN_YEAR = pd.Timestamp.min.year + 1
+MAX_YEAR = pd.Timestamp.max.year - 1
+
+
+def normalize_dob(dob_value):
+    """
+    Normalize DOB to YYYY-MM-DD format
+    Handles: YYYY-MM-DD, YYYY/MM/DD, YYYYMMDD, etc.
+    """
+    if pd.isna(dob_value):
+        return ""
+
+    dob_str = str(dob_value).strip()
+
+    # If already in YYYY-MM-DD format
+    if re.match(r'^\d{4}-\d{2}-\d{2}$', dob_str):
+        return dob_str
+
+    # Replace common separators with dash
+    dob_normalized = dob_str.replace('/', '-').replace(' ', '-')
+
+    # Remove extra dashes and spaces
+    dob_normalized = re.sub(r'-+', '-', dob_normalized).strip('-')
+
+    # Try to parse and reformat
+    for fmt in ['%Y-%m-%d', '%Y%m%d', '%d-%m-%Y', '%d/%m/%Y']:
+        try:
+            parsed = datetime.strptime(dob_normalized.replace('-', ''), fmt.replace('-', '').replace('/', ''))
+            return parsed.strftime('%Y-%m-%d')
+        except:
+            continue
+
+    return dob_str
+
+
+def normalize_nid(nid_value):
+    """
+    Normalize NID to integer (as string)
+    Removes decimals, spaces, etc.
+    """
+    if pd.isna(nid_value):
+        return ""
+
+    nid_str = str(nid_value).strip()
+
+    # Remove decimal point if present (e.g., 6032068741.0 -> 6032068741)
+    if '.' in nid_str:
+        nid_str = nid_str.split('.')[0]
+
+    # Remove any non-digit characters
+    nid_str = re.sub(r'\D', '', nid_str)
+
+    return nid_str
+
+
+def _distinct_strings(values):
+    """
+    The distinct values of a column, as strings
+
+    Returns:
+        (codes, distinct): codes[i] is the position of values[i] in the
+        object-dtype Series distinct, or -1 for a missing value
+    """
+    values = pd.Series(list(values), dtype=object)
+    if pd.api.types.infer_dtype(values, skipna=True) not in ('string', 'empty'):
+        present = values.notna()
+        values[present] = values[present].map(str)
+    codes, distinct = pd.factorize(values)
+    return codes, pd.Series(distinct, dtype=object)
+
+
+def _parse_eight_digits(digits):
+    """
+    Dates from 8-digit strings, read as YYYYMMDD or else DDMMYYYY
+
+    Returns:
+        (dates, unsure): dates is NaT where neither order is a valid date;
+        unsure marks strings with a possible year outside [MIN_YEAR, MAX_YEAR],
+        where pd.to_datetime can't be trusted to agree with strptime
+    """
+    ymd = pd.to_datetime(digits, format='%Y%m%d', errors='coerce')
+    retry = ymd.isna()
+    dmy = pd.to_datetime(digits[retry], format='%d%m%Y', errors='coerce')
+
+    number = digits.astype('int64')
+    head, tail = number // 10000, number % 10000
+    ymd_out = ~head.between(MIN_YEAR, MAX_YEAR) & (tail // 100).between(1, 12)
+    dmy_out = ~tail.between(MIN_YEAR, MAX_YEAR) & (head % 100).between(1, 12)
+    return ymd.fillna(dmy), ymd_out | (retry & dmy_out)
+
+
+def normalize_dob_column(values):
+    """
+    normalize_dob over a whole column
+
+    Dates already in YYYY-MM-DD pass through. Values that are 8 ASCII digits
+    once '/', '-' and spaces are dropped are parsed with pd.to_datetime as
+    YYYYMMDD or else DDMMYYYY (the order normalize_dob tries). Other strings
+    of 6 to 8 digits (7 digits, Bengali digits, years outside the Timestamp
+    range, ...) go through normalize_dob; anything else is only stripped.
+
+    Returns:
+        List of normalized strings
+    """
+    codes, distinct = _distinct_strings(values)
+    text = distinct.str.strip()
+    result = text.copy()
+
+    iso = text.str.fullmatch(ISO_DATE).astype(bool)
+    digits = text[~iso].str.replace(DATE_SEPARATORS, '', regex=True)
+    eight = digits.str.fullmatch('[0-9]{8}').astype(bool)
+    dates, unsure = _parse_eight_digits(digits[eight])
+    # Neither order valid: normalize_dob returns the stripped value, already in result
+    parsed = dates.notna() & ~unsure
+    result[parsed.index[parsed]] = dates[parsed].dt.strftime('%Y-%m-%d')
+
+    # strptime reads both formats from 6 to 8 (Unicode) digits; anything else
+    # can't parse, and normalize_dob returns the stripped value
+    short = ~eight & digits.str.fullmatch(r'\d{6,8}').astype(bool)
+    fallback = unsure.index[unsure].union(short.index[short])
+    result[fallback] = distinct[fallback].map(normalize_dob)
+
+    # Missing values have code -1, which picks the '' appended at the end
+    return np.append(result.to_numpy(dtype=object), '')[codes].tolist()
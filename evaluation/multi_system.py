@@ -0,0 +1,183 @@
+"""
+Score several systems against one truth source in a single pass
+
+Usage:
+    python multi_system.py --truth annotators --systems polygon gemini
+    python multi_system.py --sources my_models.json --systems polygon my_model
+
+Output is long-format, one row per (record, system, field):
+
+    image_id, truth, system, field, actual, predicted,
+    accuracy, cer, wer, lev_cer, lev_wer
+
+so a single groupby compares every system.
+"""
+
+import argparse
+import itertools
+import os
+
+import pandas as pd
+
+try:
+    from .evaluator import ResultsEvaluator, METRIC_FIELDS, FieldComparison
+    from .sources import default_registry
+    from .stats import paired_test
+    from .results import ResultBuilder
+    from . import id_normalizer
+except ImportError:
+    from evaluator import ResultsEvaluator, METRIC_FIELDS, FieldComparison
+    from sources import default_registry
+    from stats import paired_test
+    from results import ResultBuilder
+    import id_normalizer
+
+METRICS = list(FieldComparison._fields)
+
+
+class MultiSystemEvaluator:
+    """Evaluate any number of registered systems against a registered truth source"""
+
+    def __init__(self, registry, truth, systems):
+        """
+        Initialize the evaluator (sources are loaded by evaluate)
+
+        Args:
+            registry: SourceRegistry with every source used
+            truth: Name of the truth source
+            systems: Names of the sources to score
+        """
+        self.registry = registry
+        self.truth = truth
+        self.systems = list(systems)
+        # Field comparisons are the same as in the entry evaluation
+        self.scorer = ResultsEvaluator.for_scoring()
+
+    def _normalized(self, field_key, values):
+        """Column as compared for a field (DOB and NID in their normalized form)"""
+        if field_key == 'dob':
+            return id_normalizer.normalize_dob_column(values)
+        if field_key == 'nid_no':
+            return [id_normalizer.normalize_nid(value) for value in values]
+        return list(values)
+
+    def evaluate(self):
+        """
+        Score every system against the truth source
+
+        Truth is loaded, keyed and normalized once and shared by all systems;
+        text normalization is memoized across systems.
+
+        Returns:
+            Long-format DataFrame (one row per record, system and field)
+        """
+        truth_df = self.registry.get(self.truth).load()
+        truth_keys = truth_df['image_id'].tolist()
+        truth_values = {field_key: self._normalized(field_key, truth_df[field_key]) for field_key in METRIC_FIELDS}
+
+        rows = ResultBuilder(columns=['image_id', 'truth', 'system', 'field', 'actual', 'predicted'] + METRICS)
+        for system in self.systems:
+            system_df = self.registry.get(system).load()
+            index = ResultsEvaluator._first_positions(system_df['image_id'])
+            index.pop('', None)
+            system_values = {field_key: self._normalized(field_key, system_df[field_key]) for field_key in METRIC_FIELDS}
+
+            for truth_pos, key in enumerate(truth_keys):
+                system_pos = index.get(key)
+                if system_pos is None:
+                    continue
+                for field_key in METRIC_FIELDS:
+                    actual = truth_values[field_key][truth_pos]
+                    predicted = system_values[field_key][system_pos]
+                    result = self.scorer.compare_field(actual, predicted)
+                    rows.append((key, self.truth, system, field_key, actual, predicted) + tuple(result))
+
+        return rows.to_frame()
+
+    @staticmethod
+    def summarize(long_df, metric='accuracy'):
+        """
+        Mean of one metric per system and field, plus an overall column
+
+        Returns:
+            DataFrame indexed by system with one column per field
+        """
+        table = long_df.pivot_table(index='system', columns='field', values=metric, aggfunc='mean')
+        table = table.reindex(columns=[f for f in METRIC_FIELDS if f in table.columns])
+        table['overall'] = long_df.groupby('system')[metric].mean()
+        table['records'] = long_df.groupby('system')['image_id'].count() // len(METRIC_FIELDS)
+        return table.round(2)
+
+    @staticmethod
+    def paired_tests(long_df, metric='accuracy'):
+        """
+        Paired significance tests between every two systems
+
+        Each record's metric is averaged over its fields; systems are compared
+        on the records both of them scored.
+
+        Returns:
+            DataFrame with system_a, system_b and the paired_test results
+        """
+        per_record = long_df.pivot_table(index='image_id', columns='system', values=metric, aggfunc='mean')
+        rows = []
+        for system_a, system_b in itertools.combinations(per_record.columns, 2):
+            both = per_record[[system_a, system_b]].dropna()
+            rows.append({'system_a': system_a, 'system_b': system_b,
+                         **paired_test(both[system_a], both[system_b])})
+        return pd.DataFrame(rows, columns=['system_a', 'system_b', 'n', 'mean_diff',
+                                           'ci_low', 'ci_high', 'p_value'])
+
+    def generate_report(self, output_csv):
+        """Score all systems, save the long-format CSV and print a comparison"""
+        long_df = self.evaluate()
+        long_df.to_csv(output_csv, index=False)
+
+        print("\n" + "="*80)
+        print(f"SYSTEM COMPARISON (truth: {self.truth})")
+        print("="*80)
+        if len(long_df) == 0:
+            print("No records matched between the truth and any system.")
+        else:
+            for metric in ('accuracy', 'lev_cer', 'lev_wer'):
+                print(f"\nMean {metric} (%):")
+                print(self.summarize(long_df, metric).to_string())
+            if long_df['system'].nunique() >= 2:
+                print("\nPaired tests on record accuracy (A - B, 95% bootstrap CI, sign-flip p-value):")
+                print(self.paired_tests(long_df).round(4).to_string(index=False))
+        unmatched = [system for system in self.systems if system not in set(long_df.get('system', []))]
+        if unmatched:
+            print(f"\nNo matching records for: {', '.join(unmatched)}")
+        print(f"\nLong-format results saved to: {output_csv}")
+        print("="*80 + "\n")
+        return long_df
+
+
+def main():
+    """Compare systems from the command line"""
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    registry = default_registry(project_root)
+
+    parser = argparse.ArgumentParser(description="Score OCR systems against a truth source")
+    parser.add_argument('--truth', default='annotators', help="Truth source (default: annotators)")
+    parser.add_argument('--systems', nargs='+', default=['polygon', 'gemini'],
+                        help="Sources to score (default: polygon gemini)")
+    parser.add_argument('--sources', help="JSON file with extra source definitions")
+    parser.add_argument('--output', default=os.path.join(project_root, 'data', 'system_comparison.csv'),
+                        help="Long-format output CSV")
+    parser.add_argument('--list', action='store_true', help="List registered sources and exit")
+    args = parser.parse_args()
+
+    if args.sources:
+        registry.load_json(args.sources)
+    if args.list:
+        for name in registry.names():
+            source = registry.get(name)
+            print(f"{name:12} {source.description or ', '.join(source.paths)}")
+        return
+
+    MultiSystemEvaluator(registry, args.truth, args.systems).generate_report(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Bengali text normalizer
+
+Precompiled version of the ResultsEvaluator normalization pipeline:
+strip -> NFC -> danda to '.' -> Devanagari to Bengali -> invalid virama
+removal -> whitespace collapse. Translation table and regex are built once at
+import and results are memoized, so repeated names and address fragments are
+normalized only once.
+
+Standard library only, so the OCR scripts and Streamlit apps can import it
+without pandas.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+# Bump when normalization output changes (invalidates cached scores)
+NORMALIZER_VERSION = 1
+
+# Devanagari -> Bengali character mapping.
+# Kept exactly as the evaluator has always applied it, including the shifted
+# entries for the retroflex row, so scores stay comparable across runs.
+DEVANAGARI_TO_BENGALI = {
+    # Consonants
+    '\u0915': '\u0995',  # क -> ক
+    '\u0916': '\u0996',  # ख -> খ
+    '\u0917': '\u0997',  # ग -> গ
+    '\u0918': '\u0998',  # घ -> ঘ
+    '\u0919': '\u0999',  # ङ -> ঙ
+    '\u091A': '\u099A',  # च -> চ
+    '\u091B': '\u099B',  # छ -> ছ
+    '\u091C': '\u099C',  # ज -> জ
+    '\u091D': '\u099D',  # झ -> ঝ
+    '\u091E': '\u099E',  # ञ -> ঞ
+    '\u091F': '\u09A1',  # ट -> ড
+    '\u0920': '\u09A2',  # ठ -> ঢ
+    '\u0921': '\u09A3',  # ड -> ণ
+    '\u0922': '\u09A4',  # ढ -> ত
+    '\u0923': '\u09A3',  # ण -> ণ
+    '\u0924': '\u09A4',  # त -> ত
+    '\u0925': '\u09A5',  # थ -> থ
+    '\u0926': '\u09A6',  # द -> দ
+    '\u0927': '\u09A7',  # ध -> ধ
+    '\u0928': '\u09A8',  # न -> ন
+    '\u092A': '\u09AA',  # प -> প
+    '\u092B': '\u09AB',  # फ -> ফ
+    '\u092C': '\u09AC',  # ब -> ব
+    '\u092D': '\u09AD',  # भ -> ভ
+    '\u092E': '\u09AE',  # म -> ম
+    '\u092F': '\u09AF',  # य -> য
+    '\u0930': '\u09B0',  # र -> র
+    '\u0932': '\u09B2',  # ल -> ল
+    '\u0935': '\u09B5',  # व -> ব
+    '\u0936': '\u09B6',  # श -> শ
+    '\u0937': '\u09B7',  # ष -> ষ
+    '\u0938': '\u09B8',  # स -> স
+    '\u0939': '\u09B9',  # ह -> হ
+    # Vowels (independent forms)
+    '\u0905': '\u0985',  # अ -> অ
+    '\u0906': '\u0986',  # आ -> আ
+    '\u0907': '\u0987',  # इ -> ই
+    '\u0908': '\u0988',  # ई -> ঈ
+    '\u0909': '\u0989',  # उ -> উ
+    '\u090A': '\u098A',  # ऊ -> ঊ
+    '\u090F': '\u098F',  # ए -> এ
+    '\u0910': '\u0990',  # ऐ -> ঐ
+    '\u0913': '\u0993',  # ओ -> ও
+    '\u0914': '\u0994',  # औ -> ঔ
+    # Vowel signs (matras/diacritics)
+    '\u093E': '\u09BE',  # ा -> া (AA matra)
+    '\u093F': '\u09BF',  # ि -> ি (I matra)
+    '\u0940': '\u09C0',  # ी -> ী (II matra)
+    '\u0941': '\u09C1',  # ु -> ু (U matra)
+    '\u0942': '\u09C2',  # ू -> ূ (UU matra)
+    '\u0947': '\u09C7',  # े -> ে (E matra)
+    '\u0948': '\u09C8',  # ै -> ৈ (AI matra)
+    '\u094B': '\u09CB',  # ो -> ো (O matra)
+    '\u094C': '\u09CC',  # ौ -> ৌ (AU matra)
+    # Special characters
+    '\u094D': '\u09CD',  # ् -> ্ (virama/halant)
+    '\u0902': '\u0981',  # ं -> ঁ (anusvara)
+    '\u0903': '\u0983',  # ः -> ঃ (visarga)
+    '\u0900': '\u0980',  # ॐ -> ঀ (om)
+}
+
+# Devanagari Danda / Double Danda -> period
+DANDAS = {
+    '\u0964': '.',
+    '\u0965': '.',
+}
+
+_SCRIPT_TABLE = str.maketrans(DEVANAGARI_TO_BENGALI)
+_NORMALIZE_TABLE = str.maketrans({**DANDAS, **DEVANAGARI_TO_BENGALI})
+
+# Bengali vowel signs a virama can't follow
+VOWEL_MATRAS = '\u09BE\u09BF\u09C0\u09C1\u09C2\u09C7\u09C8\u09CB\u09CC'
+
+# A virama is invalid at the start of the text or right after a vowel matra
+_INVALID_VIRAMA_RE = re.compile(f'\\A\u09CD|(?<=[{VOWEL_MATRAS}])\u09CD')
+
+
+def devanagari_to_bengali(text: str) -> str:
+    """Convert Devanagari characters to their Bengali equivalents"""
+    return text.translate(_SCRIPT_TABLE)
+
+
+def remove_invalid_viramas(text: str) -> str:
+    """Remove viramas (U+09CD) at the start of the text or after a vowel matra"""
+    return _INVALID_VIRAMA_RE.sub('', text)
+
+
+@lru_cache(maxsize=65536)
+def normalize(text: str) -> str:
+    """
+    Normalize a string for comparison
+
+    Args:
+        text: Raw text
+
+    Returns:
+        NFC text in Bengali script with dandas as periods, invalid viramas
+        removed and whitespace collapsed
+    """
+    text = unicodedata.normalize('NFC', text.strip())
+    text = text.translate(_NORMALIZE_TABLE)
+    text = _INVALID_VIRAMA_RE.sub('', text)
+    return ' '.join(text.split())
+
+
+def normalize_value(value) -> str:
+    """Normalize any cell value; None and NaN become an empty string"""
+    if value is None or (isinstance(value, float) and value != value):
+        return ''
+    return normalize(str(value))
@@ -0,0 +1,208 @@
+"""
+Array-backed evaluation results
+
+A list of per-record dicts, each holding dozens of boxed floats and strings,
+costs far more than the values themselves, and turning it into a DataFrame
+keeps both copies alive at once. ResultBuilder collects rows into typed
+columns instead:
+
+- Metric columns (accuracy, cer, wer and names ending in them) are
+  preallocated float32 arrays. Metrics are rounded to 2 decimals, which
+  float32 holds exactly for any rate below 131072%; a column that receives
+  a value float32 can't round-trip is promoted to float64, so output never
+  changes.
+- Every other column is dictionary encoded: int32 codes into one object per
+  distinct value (match methods, system names, dates and names repeat).
+  Columns whose values are mostly distinct (image ids, NIDs, addresses)
+  switch to a plain array of references, which costs less than a dictionary.
+- Rows are buffered and written to the columns a chunk at a time.
+
+to_frame() returns the same DataFrame (columns, dtypes and values) as
+pd.DataFrame(rows).
+
+Usage:
+    results = ResultBuilder(capacity=len(records))
+    results.extend(score_record(*record) for record in records)
+    df = results.to_frame()
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+METRIC_SUFFIXES = ('_accuracy', '_cer', '_wer')
+
+# Rows buffered before they are written to the columns
+DEFAULT_CHUNK_SIZE = 4096
+
+# Metrics are rounded to this many decimals
+METRIC_DECIMALS = 2
+
+
+class _MetricColumn:
+    """float32 column (float64 once a value doesn't round-trip)"""
+
+    def __init__(self, capacity):
+        self.data = np.full(capacity, np.nan, dtype=np.float32)
+        self.compact = True
+
+    def resize(self, capacity):
+        data = np.full(capacity, np.nan, dtype=self.data.dtype)
+        data[:len(self.data)] = self.data[:capacity]
+        self.data = data
+
+    def write(self, start, values):
+        values = np.asarray(values, dtype=np.float64)
+        if self.compact:
+            restored = np.round(values.astype(np.float32).astype(np.float64), METRIC_DECIMALS)
+            if not np.array_equal(restored, values, equal_nan=True):
+                self.data = self.data.astype(np.float64)
+                self.compact = False
+        self.data[start:start + len(values)] = values
+
+    def values(self, size):
+        if self.compact:
+            return np.round(self.data[:size].astype(np.float64), METRIC_DECIMALS)
+        return self.data[:size].copy()
+
+
+class _EncodedColumn:
+    """Dictionary-encoded column: int32 codes into the distinct values"""
+
+    def __init__(self, capacity):
+        self.codes = np.full(capacity, -1, dtype=np.int32)   # -1 = missing (NaN)
+        self.distinct = []
+        self.index = {}
+
+    def resize(self, capacity):
+        codes = np.full(capacity, -1, dtype=np.int32)
+        codes[:len(self.codes)] = self.codes[:capacity]
+        self.codes = codes
+
+    def write(self, start, values):
+        index = self.index
+        codes = self.codes
+        for position, value in enumerate(values, start):
+            if value.__class__ is float and value != value:
+                continue
+            # Other types are keyed by type too: 1, 1.0 and True are equal but print differently
+            key = value if value.__class__ is str else (value.__class__, value)
+            code = index.get(key)
+            if code is None:
+                code = index[key] = len(self.distinct)
+                self.distinct.append(value)
+            codes[position] = code
+
+    def values(self, size):
+        # Code -1 picks the trailing NaN
+        distinct = np.empty(len(self.distinct) + 1, dtype=object)
+        distinct[:-1] = self.distinct
+        distinct[-1] = np.nan
+        return distinct[self.codes[:size]]
+
+
+class _ObjectColumn:
+    """Column of references to the values themselves"""
+
+    def __init__(self, capacity):
+        self.data = np.full(capacity, np.nan, dtype=object)
+
+    def resize(self, capacity):
+        data = np.full(capacity, np.nan, dtype=object)
+        data[:len(self.data)] = self.data[:capacity]
+        self.data = data
+
+    def write(self, start, values):
+        self.data[start:start + len(values)] = values
+
+    def values(self, size):
+        return self.data[:size].copy()
+
+
+class ResultBuilder:
+    """Collect evaluation rows into compact typed columns"""
+
+    def __init__(self, capacity: int = 0, columns: Optional[Sequence[str]] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Args:
+            capacity: Expected number of rows (columns grow past it if needed)
+            columns: Column names when rows are tuples in this order;
+                None when rows are dicts (columns in first-seen order)
+            chunk_size: Rows buffered before they are written to the columns
+        """
+        self.capacity = max(capacity, 0)
+        self.chunk_size = max(chunk_size, 1)
+        self.tuple_rows = columns is not None
+        self.columns: Dict[str, object] = {}
+        self.size = 0
+        self.pending: List = []
+        for name in columns or []:
+            self._add_column(name)
+
+    def __len__(self):
+        return self.size + len(self.pending)
+
+    def _add_column(self, name):
+        column_class = _MetricColumn if f'_{name}'.endswith(METRIC_SUFFIXES) else _EncodedColumn
+        self.columns[name] = column_class(self.capacity)
+
+    def _reserve(self, size):
+        if size <= self.capacity:
+            return
+        self.capacity = max(size, 2 * self.capacity)
+        for column in self.columns.values():
+            column.resize(self.capacity)
+
+    def append(self, row):
+        """Add one row (a dict, or a tuple in column order)"""
+        self.pending.append(row)
+        if len(self.pending) >= self.chunk_size:
+            self.flush()
+
+    def extend(self, rows: Iterable):
+        """Add rows from any iterable (consumed lazily, a chunk at a time)"""
+        for row in rows:
+            self.append(row)
+
+    def flush(self):
+        """Write buffered rows to the columns"""
+        chunk, self.pending = self.pending, []
+        if not chunk:
+            return
+        self._reserve(self.size + len(chunk))
+
+        if self.tuple_rows:
+            column_values = zip(tuple(self.columns), zip(*chunk))
+        else:
+            for row in chunk:
+                if not row.keys() <= self.columns.keys():
+                    for name in row:
+                        if name not in self.columns:
+                            self._add_column(name)
+            names = tuple(self.columns)
+            if all(tuple(row) == names for row in chunk):
+                column_values = zip(names, zip(*[row.values() for row in chunk]))
+            else:
+                column_values = ((name, [row.get(name, np.nan) for row in chunk]) for name in names)
+
+        size = self.size + len(chunk)
+        for name, values in column_values:
+            column = self.columns[name]
+            column.write(self.size, values)
+            if isinstance(column, _EncodedColumn) and len(column.distinct) > size // 2:
+                references = _ObjectColumn(self.capacity)
+                references.data[:size] = column.values(size)
+                self.columns[name] = references
+        self.size = size
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame of all rows (identical to building it from the rows directly)"""
+        self.flush()
+        if not self.columns:
+            return pd.DataFrame()
+        # Object columns get the dtype pd.DataFrame(rows) would infer (str, int64, float64, ...)
+        frame = pd.DataFrame({name: column.values(self.size) for name, column in self.columns.items()})
+        return frame.infer_objects()
+
@@ -0,0 +1,355 @@
+"""
+Run registry: history of evaluation and OCR benchmark runs
+
+Usage:
+    python runs.py list                              # most recent runs
+    python runs.py list --kind ocr_benchmark --limit 200
+    python runs.py show latest
+    python runs.py compare previous latest           # per-field diff with significance
+    python runs.py compare 20260119-101500 20260120 --metric lev_cer
+
+operations/ocr_benchmark.py records every run, and evaluator.py the runs given
+--record or --label, in a SQLite database (data/runs.sqlite). Runs are
+append-only and keyed by run id; each holds its config (model, prompt hash,
+normalizer and metrics versions), timing and throughput, per-field summary
+metrics, and the per-record accuracy and lev_cer values (compressed float32
+arrays) used for paired significance tests. Listing reads one indexed table, so it stays instant with
+hundreds of runs.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import time
+import uuid
+import zlib
+from typing import ContextManager, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .evaluator import METRIC_FIELDS, METRICS_VERSION, FieldComparison
+    from .stats import paired_test
+    from .sqlite_db import connect
+    from . import normalizer
+except ImportError:
+    from evaluator import METRIC_FIELDS, METRICS_VERSION, FieldComparison
+    from stats import paired_test
+    from sqlite_db import connect
+    import normalizer
+
+METRICS = list(FieldComparison._fields)
+
+# Per-record values kept for significance tests
+STORED_METRICS = ['accuracy', 'lev_cer']
+
+RUN_ALIASES = {'latest': 0, 'previous': 1}
+
+
+def metric_frame(results):
+    """
+    Per-record metrics as one row per image_id and one column per {field}_{metric}
+
+    Accepts evaluation results (wide) or a long-format multi_system.py frame
+    (one system).
+    """
+    if 'field' in results.columns:
+        wide = results.pivot_table(index='image_id', columns='field', values=METRICS, aggfunc='mean')
+        wide.columns = [f'{field_key}_{metric}' for metric, field_key in wide.columns]
+        for metric in METRICS:
+            fields = [f'{f}_{metric}' for f in METRIC_FIELDS if f'{f}_{metric}' in wide.columns]
+            wide[f'overall_{metric}'] = wide[fields].mean(axis=1).round(2)
+        return wide
+    frame = results.copy()
+    frame['image_id'] = frame['image_id'].astype(str).str.replace(r'\.0$', '', regex=True)
+    columns = [c for c in frame.columns if c.endswith(tuple(f'_{m}' for m in METRICS))]
+    return frame.groupby('image_id', sort=False)[columns].mean()
+
+
+class RunRegistry:
+    """Append-only store of runs, their config, timing and metrics"""
+
+    def __init__(self, db_path: str):
+        """
+        Open the registry, creating the database if needed.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = db_path
+        self._init_db()
+
+    def _connect(self) -> ContextManager[sqlite3.Connection]:
+        """Open a connection that waits for other writers instead of failing."""
+        return connect(self.db_path)
+
+    def _init_db(self) -> None:
+        """Create tables and indexes if they don't exist."""
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    label TEXT,
+                    created_at REAL NOT NULL,
+                    model TEXT,
+                    prompt_hash TEXT,
+                    normalizer_version INTEGER,
+                    metrics_version INTEGER,
+                    records INTEGER,
+                    elapsed REAL,
+                    throughput REAL,
+                    overall_accuracy REAL,
+                    overall_lev_cer REAL,
+                    config TEXT,
+                    stats TEXT
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_created ON runs (created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_kind ON runs (kind, created_at)")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS run_metrics (
+                    run_id TEXT NOT NULL,
+                    field TEXT NOT NULL,
+                    metric TEXT NOT NULL,
+                    mean REAL,
+                    std REAL,
+                    n INTEGER,
+                    PRIMARY KEY (run_id, field, metric)
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS run_values (
+                    run_id TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    data BLOB NOT NULL,
+                    PRIMARY KEY (run_id, name)
+                )
+                """
+            )
+
+    def record(self, kind: str, results: pd.DataFrame, config: Optional[Dict] = None,
+               stats: Optional[Dict] = None, label: str = '') -> str:
+        """
+        Add a run
+
+        Args:
+            kind: 'evaluation', 'ocr_benchmark', ...
+            results: Evaluation results, or long-format results for one system
+            config: Run settings; 'model' and 'prompt_hash' are also indexed columns
+            stats: Timing and counts; the throughput is 'processed' (default:
+                   records scored) over 'elapsed' seconds
+
+        Returns:
+            The new run id
+        """
+        config = dict(config or {})
+        config.setdefault('normalizer_version', normalizer.NORMALIZER_VERSION)
+        config.setdefault('metrics_version', METRICS_VERSION)
+        stats = dict(stats or {})
+
+        per_record = metric_frame(results) if len(results) else pd.DataFrame()
+        records = stats.get('processed', len(per_record))
+        elapsed = stats.get('elapsed')
+        throughput = records / elapsed if elapsed else None
+
+        def overall(metric):
+            column = f'overall_{metric}'
+            return float(per_record[column].mean()) if column in per_record else None
+
+        run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        metric_rows = []
+        for field_key in METRIC_FIELDS + ['overall']:
+            for metric in METRICS:
+                column = f'{field_key}_{metric}'
+                if column in per_record:
+                    values = per_record[column]
+                    metric_rows.append((run_id, field_key, metric, float(values.mean()),
+                                        float(values.std()), int(values.count())))
+        value_rows = [(run_id, 'image_id', zlib.compress('\n'.join(per_record.index.astype(str)).encode('utf-8')))]
+        for column in per_record.columns:
+            if column.endswith(tuple(f'_{m}' for m in STORED_METRICS)):
+                data = per_record[column].to_numpy(dtype=np.float32).tobytes()
+                value_rows.append((run_id, column, zlib.compress(data)))
+
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, kind, label, time.time(), config.get('model'), config.get('prompt_hash'),
+                 config['normalizer_version'], config['metrics_version'], records, elapsed,
+                 throughput, overall('accuracy'), overall('lev_cer'),
+                 json.dumps(config, default=str), json.dumps(stats, default=str)),
+            )
+            conn.executemany("INSERT INTO run_metrics VALUES (?, ?, ?, ?, ?, ?)", metric_rows)
+            conn.executemany("INSERT INTO run_values VALUES (?, ?, ?)", value_rows)
+            conn.execute("COMMIT")
+        return run_id
+
+    def list_runs(self, kind: Optional[str] = None, limit: int = 50) -> pd.DataFrame:
+        """Most recent runs first (summary columns only)"""
+        query = ("SELECT run_id, kind, label, created_at, model, prompt_hash, records, elapsed, "
+                 "throughput, overall_accuracy, overall_lev_cer FROM runs")
+        params: List = []
+        if kind:
+            query += " WHERE kind = ?"
+            params.append(kind)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+        with self._connect() as conn:
+            runs = pd.read_sql_query(query, conn, params=params)
+        runs['created_at'] = pd.to_datetime(runs['created_at'], unit='s').dt.strftime('%Y-%m-%d %H:%M:%S')
+        return runs
+
+    def resolve(self, run: str) -> str:
+        """
+        Full run id for 'latest', 'previous' or a unique run id prefix
+
+        Raises:
+            KeyError: If no run (or more than one) matches
+        """
+        with self._connect() as conn:
+            if run in RUN_ALIASES:
+                row = conn.execute("SELECT run_id FROM runs ORDER BY created_at DESC LIMIT 1 OFFSET ?",
+                                   (RUN_ALIASES[run],)).fetchone()
+                matches = [row['run_id']] if row else []
+            else:
+                matches = [row['run_id'] for row in conn.execute(
+                    "SELECT run_id FROM runs WHERE run_id >= ? AND run_id < ? LIMIT 2",
+                    (run, run + '\uffff'),
+                )]
+        if len(matches) != 1:
+            raise KeyError(f"{'No' if not matches else 'More than one'} run matches '{run}'")
+        return matches[0]
+
+    def get(self, run: str) -> Dict:
+        """Run row with config and stats decoded"""
+        run_id = self.resolve(run)
+        with self._connect() as conn:
+            row = dict(conn.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone())
+        row['config'] = json.loads(row['config'] or '{}')
+        row['stats'] = json.loads(row['stats'] or '{}')
+        return row
+
+    def metrics(self, run: str) -> pd.DataFrame:
+        """Summary metrics of a run: one row per field, one column per metric (means)"""
+        run_id = self.resolve(run)
+        with self._connect() as conn:
+            rows = pd.read_sql_query("SELECT field, metric, mean FROM run_metrics WHERE run_id = ?",
+                                     conn, params=(run_id,))
+        table = rows.pivot(index='field', columns='metric', values='mean')
+        order = [f for f in METRIC_FIELDS + ['overall'] if f in table.index]
+        return table.reindex(index=order, columns=[m for m in METRICS if m in table.columns])
+
+    def values(self, run: str) -> pd.DataFrame:
+        """Stored per-record values of a run, indexed by image_id"""
+        run_id = self.resolve(run)
+        with self._connect() as conn:
+            rows = conn.execute("SELECT name, data FROM run_values WHERE run_id = ?", (run_id,)).fetchall()
+        data = {row['name']: zlib.decompress(row['data']) for row in rows}
+        image_ids = data.pop('image_id').decode('utf-8')
+        index = image_ids.split('\n') if image_ids else []
+        return pd.DataFrame({name: np.frombuffer(raw, dtype=np.float32) for name, raw in data.items()},
+                            index=pd.Index(index, name='image_id'))
+
+    def compare(self, run_a: str, run_b: str, metric: str = 'accuracy') -> pd.DataFrame:
+        """
+        Per-field difference between two runs (B - A) on the records both scored
+
+        Returns:
+            DataFrame indexed by field: n, mean_a, mean_b, diff, ci_low, ci_high, p_value
+        """
+        values_a, values_b = self.values(run_a), self.values(run_b)
+        common = values_a.index.intersection(values_b.index)
+        values_a, values_b = values_a.loc[common], values_b.loc[common]
+        rows = {}
+        for field_key in METRIC_FIELDS + ['overall']:
+            column = f'{field_key}_{metric}'
+            if column not in values_a or column not in values_b:
+                continue
+            test = paired_test(values_b[column].to_numpy(dtype=float), values_a[column].to_numpy(dtype=float))
+            rows[field_key] = {
+                'n': test['n'],
+                'mean_a': float(values_a[column].mean()),
+                'mean_b': float(values_b[column].mean()),
+                'diff': test['mean_diff'],
+                'ci_low': test['ci_low'],
+                'ci_high': test['ci_high'],
+                'p_value': test['p_value'],
+            }
+        return pd.DataFrame.from_dict(rows, orient='index')
+
+
+def _print_run(run: Dict) -> None:
+    """Print a run's config, stats and timing"""
+    print(f"Run {run['run_id']} ({run['kind']}{', ' + run['label'] if run['label'] else ''})")
+    print(f"  Created: {pd.to_datetime(run['created_at'], unit='s'):%Y-%m-%d %H:%M:%S}")
+    print(f"  Records: {run['records']}")
+    if run['elapsed']:
+        print(f"  Elapsed: {run['elapsed']:.2f}s ({run['throughput']:.1f} records/s)")
+    for key, value in run['config'].items():
+        print(f"  {key}: {value}")
+    for key, value in run['stats'].items():
+        if key != 'elapsed':
+            print(f"  {key}: {value}")
+
+
+def main():
+    """Inspect and compare recorded runs from the command line"""
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    parser = argparse.ArgumentParser(description="Evaluation and OCR benchmark run history")
+    parser.add_argument('--db', default=os.path.join(project_root, 'data', 'runs.sqlite'),
+                        help="Run registry database")
+    commands = parser.add_subparsers(dest='command', required=True)
+    list_parser = commands.add_parser('list', help="List recent runs")
+    list_parser.add_argument('--kind', help="Only runs of this kind (evaluation, ocr_benchmark)")
+    list_parser.add_argument('--limit', type=int, default=50)
+    show_parser = commands.add_parser('show', help="Show a run's config, timing and metrics")
+    show_parser.add_argument('run', help="Run id (or unique prefix), latest or previous")
+    compare_parser = commands.add_parser('compare', help="Per-field diff of two runs with significance")
+    compare_parser.add_argument('run_a', help="Baseline run")
+    compare_parser.add_argument('run_b', help="Run compared to the baseline")
+    compare_parser.add_argument('--metric', choices=STORED_METRICS, default='accuracy')
+    args = parser.parse_args()
+
+    registry = RunRegistry(args.db)
+    try:
+        _run_command(registry, args)
+    except KeyError as e:
+        parser.error(e.args[0])
+
+
+def _run_command(registry: RunRegistry, args: argparse.Namespace) -> None:
+    """Execute a parsed list/show/compare command"""
+    if args.command == 'list':
+        runs = registry.list_runs(args.kind, args.limit)
+        print(runs.round(2).to_string(index=False) if len(runs) else "No runs recorded.")
+    elif args.command == 'show':
+        _print_run(registry.get(args.run))
+        print("\nMean metrics (%):")
+        print(registry.metrics(args.run).round(2).to_string())
+    else:
+        run_a, run_b = registry.get(args.run_a), registry.get(args.run_b)
+        print(f"A: {run_a['run_id']} ({run_a['kind']})  B: {run_b['run_id']} ({run_b['kind']})")
+        for key in sorted(set(run_a['config']) | set(run_b['config'])):
+            if run_a['config'].get(key) != run_b['config'].get(key):
+                print(f"  {key}: {run_a['config'].get(key)} -> {run_b['config'].get(key)}")
+        if run_a['throughput'] and run_b['throughput']:
+            print(f"  Throughput: {run_a['throughput']:.1f} -> {run_b['throughput']:.1f} records/s "
+                  f"({(run_b['throughput'] / run_a['throughput'] - 1) * 100:+.1f}%)")
+        print(f"\n{args.metric} per field, B - A (95% bootstrap CI, sign-flip p-value):")
+        comparison = registry.compare(run_a['run_id'], run_b['run_id'], args.metric)
+        print(comparison.round(4).to_string() if len(comparison) else "No records scored in both runs.")
+
+
+if __name__ == "__main__":
+    main()
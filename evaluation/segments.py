@@ -0,0 +1,242 @@
+"""
+Per-segment breakdown of evaluation results
+
+Usage:
+    python segments.py                                     # by doc_date and match_method
+    python segments.py --by resolution --images data/images
+    python segments.py --by doc_date --metrics accuracy lev_cer --query "overall < 95"
+    python segments.py --by scanner --metadata data/image_metadata.csv
+
+Every field metric is averaged per segment in one grouped pass and shown as
+a compact pivot (segments x fields, plus overall and a record count). Segment
+columns can be any column of the evaluation CSV, one of the derived columns
+below, or a column joined from image metadata (a CSV keyed by image_id, or
+file size and dimensions read from the image directory):
+
+    doc_date, doc_month     from predicted_doc_date
+    image_bytes, image_width, image_height, image_megapixels
+    resolution              megapixel band of the image
+
+Numeric columns with many distinct values are split into quartiles.
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    from PIL import Image
+except ImportError:  # dimensions are skipped without Pillow
+    Image = None
+
+try:
+    from .evaluator import METRIC_FIELDS
+    from .sources import image_key
+except ImportError:
+    from evaluator import METRIC_FIELDS
+    from sources import image_key
+
+DEFAULT_SEGMENTS = ['doc_date', 'match_method']
+DEFAULT_METRICS = ['accuracy', 'lev_cer']
+
+IMAGE_SIDES = ['nid_front_image', 'nid_back_image']
+
+RESOLUTION_BANDS = [0, 0.3, 1, 3, np.inf]
+RESOLUTION_LABELS = ['<0.3MP', '0.3-1MP', '1-3MP', '>3MP']
+
+# Numeric segment columns with more distinct values than this are binned
+MAX_LEVELS = 20
+QUANTILES = 4
+
+
+def image_metadata(images_dir, image_ids):
+    """
+    File size and dimensions of each record's image
+
+    The front image is used when present, else the back image. Dimensions
+    are read from the image header (requires Pillow).
+
+    Returns:
+        DataFrame with image_id, image_bytes, image_width, image_height
+    """
+    rows = []
+    for image_id in dict.fromkeys(image_ids):
+        row = {'image_id': image_id, 'image_bytes': np.nan, 'image_width': np.nan, 'image_height': np.nan}
+        for side in IMAGE_SIDES:
+            path = os.path.join(images_dir, side, f"{image_id}.jpg")
+            try:
+                row['image_bytes'] = os.path.getsize(path)
+            except OSError:
+                continue
+            if Image is not None:
+                try:
+                    with Image.open(path) as img:
+                        row['image_width'], row['image_height'] = img.size
+                except OSError:
+                    pass
+            break
+        rows.append(row)
+    return pd.DataFrame(rows, columns=['image_id', 'image_bytes', 'image_width', 'image_height'])
+
+
+def add_segment_columns(df, images_dir=None, metadata_csv=None):
+    """
+    Add derived and joined segment columns to evaluation results
+
+    Args:
+        df: Evaluation results
+        images_dir: Directory with nid_front_image/ and nid_back_image/
+        metadata_csv: CSV of extra per-image columns keyed by image_id
+
+    Returns:
+        Copy of df with the extra columns
+    """
+    df = df.copy()
+    df['image_key'] = [image_key(value) for value in df['image_id']]
+
+    if 'predicted_doc_date' in df.columns:
+        doc_dates = pd.to_datetime(df['predicted_doc_date'], errors='coerce')
+        df['doc_date'] = doc_dates.dt.strftime('%Y-%m-%d')
+        df['doc_month'] = doc_dates.dt.strftime('%Y-%m')
+
+    if images_dir:
+        metadata = image_metadata(images_dir, df['image_key'])
+        df = df.merge(metadata.rename(columns={'image_id': 'image_key'}), on='image_key', how='left')
+        df['image_megapixels'] = df['image_width'] * df['image_height'] / 1e6
+        df['resolution'] = pd.cut(df['image_megapixels'], RESOLUTION_BANDS, labels=RESOLUTION_LABELS)
+
+    if metadata_csv:
+        metadata = pd.read_csv(metadata_csv)
+        metadata['image_key'] = [image_key(value) for value in metadata.pop('image_id')]
+        metadata = metadata.drop_duplicates('image_key')
+        df = df.merge(metadata, on='image_key', how='left', suffixes=('', '_meta'))
+
+    return df
+
+
+def _segment_keys(df, by):
+    """Group keys for each segment column (many-valued numeric columns as quartiles)"""
+    keys = []
+    for column in by:
+        if column not in df.columns:
+            raise KeyError(f"Unknown segment column '{column}'")
+        values = df[column]
+        if pd.api.types.is_numeric_dtype(values) and values.nunique() > MAX_LEVELS:
+            values = pd.qcut(values, QUANTILES, duplicates='drop')
+        keys.append(values.rename(column))
+    return keys
+
+
+def metric_columns(metric):
+    """Evaluation CSV columns of one metric, for every field and overall"""
+    return [f'{field_key}_{metric}' for field_key in METRIC_FIELDS + ['overall']]
+
+
+def available(df, by, metrics):
+    """
+    Split segment columns and metrics into those the results have and those they don't
+
+    Returns:
+        (by, metrics, missing): the usable segment columns and metrics, and
+        the missing ones
+    """
+    usable_by = [column for column in by if column in df.columns]
+    usable_metrics = [metric for metric in metrics
+                      if all(column in df.columns for column in metric_columns(metric))]
+    missing = [name for name in list(by) + list(metrics) if name not in usable_by + usable_metrics]
+    return usable_by, usable_metrics, missing
+
+
+def segment_table(df, by, metrics=DEFAULT_METRICS):
+    """
+    Mean of every field metric per segment, in one grouped pass
+
+    Returns:
+        DataFrame indexed by segment with a records column and one column per
+        (metric, field), fields including overall
+    """
+    fields = METRIC_FIELDS + ['overall']
+    columns = [column for metric in metrics for column in metric_columns(metric)]
+    missing = [column for column in columns if column not in df.columns]
+    if missing:
+        raise KeyError(f"Evaluation results have no {', '.join(missing)} column(s)")
+
+    grouped = df.groupby(_segment_keys(df, by), dropna=False, observed=True, sort=True)
+    table = grouped[columns].mean()
+    table.columns = pd.MultiIndex.from_tuples(
+        [(metric, field_key) for metric in metrics for field_key in fields],
+        names=['metric', 'field'],
+    )
+    table.insert(0, ('records', ''), grouped.size())
+    return table
+
+
+def segment_pivot(table, metric='accuracy', query=None, min_records=1):
+    """
+    One metric of a segment table as a segments x fields pivot
+
+    Args:
+        table: Output of segment_table
+        metric: Metric to show
+        query: Optional DataFrame.query filter over the pivot columns
+               (fields, overall, records), e.g. "overall < 95"
+        min_records: Hide segments with fewer records
+    """
+    pivot = table[metric].copy()
+    pivot.insert(0, 'records', table[('records', '')])
+    pivot = pivot[pivot['records'] >= min_records]
+    if query:
+        pivot = pivot.query(query)
+    return pivot.round(2)
+
+
+def main():
+    """Print per-segment breakdowns from the command line"""
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    data_dir = os.path.join(project_root, 'data')
+
+    parser = argparse.ArgumentParser(description="Per-segment breakdown of evaluation results")
+    parser.add_argument('--input', default=os.path.join(data_dir, 'evaluation_results.csv'),
+                        help="Evaluation results CSV")
+    parser.add_argument('--by', nargs='+', default=DEFAULT_SEGMENTS, help="Segment columns")
+    parser.add_argument('--metrics', nargs='+', default=DEFAULT_METRICS,
+                        help="Metrics to show (accuracy, cer, wer, lev_cer, lev_wer)")
+    parser.add_argument('--images', help="Image directory, for image_bytes/width/height and resolution")
+    parser.add_argument('--metadata', help="CSV of per-image columns keyed by image_id")
+    parser.add_argument('--query', help='Filter segments, e.g. "overall < 95 and records >= 10"')
+    parser.add_argument('--min-records', type=int, default=1, help="Hide smaller segments")
+    parser.add_argument('--sort', help="Sort segments by this pivot column (ascending)")
+    parser.add_argument('--output', help="Also save the full segment table to this CSV")
+    args = parser.parse_args()
+
+    df = add_segment_columns(pd.read_csv(args.input), args.images, args.metadata)
+    by, metrics, missing = available(df, args.by, args.metrics)
+    if missing:
+        # Results written by an older evaluator lack the newer columns (match_method, lev_cer, ...)
+        print(f"Skipping {', '.join(missing)}: not in {args.input}. "
+              f"Re-run evaluator.py to add the current columns.")
+    if not by or not metrics:
+        parser.error(f"no segment column or no metric left to show in {args.input}")
+    table = segment_table(df, by, metrics)
+
+    print("\n" + "="*80)
+    print(f"SEGMENTS BY {', '.join(by).upper()} ({len(table)} segments, {len(df)} records)")
+    print("="*80)
+    for metric in metrics:
+        pivot = segment_pivot(table, metric, args.query, args.min_records)
+        if args.sort:
+            pivot = pivot.sort_values(args.sort)
+        print(f"\nMean {metric} (%):")
+        print(pivot.to_string() if len(pivot) else "No segments match.")
+    if args.output:
+        flat = table.copy()
+        flat.columns = [f'{field_key}_{metric}' if field_key else metric for metric, field_key in flat.columns]
+        flat.to_csv(args.output)
+        print(f"\nSegment table saved to: {args.output}")
+    print("="*80 + "\n")
+
+
+if __name__ == "__main__":
+    main()
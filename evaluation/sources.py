@@ -0,0 +1,215 @@
+"""
+Source registry for multi-system evaluation
+
+A source is any table of NID field values keyed by image_id: an annotator's
+entry results, the Polygon OCR export, the Gemini OCR benchmark or a future
+model. Each source declares its files, format and a mapping from the
+evaluated fields to its own columns, and loads into one common layout:
+
+    image_id, english_name, bangla_name, father_spouse, mother, dob, nid_no, address
+
+Custom sources can be added in code (SourceRegistry.register) or from a JSON
+file (SourceRegistry.load_json) with a list of Source field dicts.
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+try:
+    from .evaluator import METRIC_FIELDS
+except ImportError:
+    from evaluator import METRIC_FIELDS
+
+# Column mapping shared by every file written by the entry apps or the OCR benchmark
+ENTRY_RESULT_COLUMNS = {
+    'english_name': ['english_name'],
+    'bangla_name': ['bangla_name'],
+    'father_spouse': ['father_spouse_name'],
+    'mother': ['mother_name'],
+    'dob': ['dob'],
+    'nid_no': ['nid_no'],
+    'address': ['plain_address'],
+}
+
+# Polygon OCR export (tab-separated); father falls back to spouse
+POLYGON_COLUMNS = {
+    'english_name': ['name_english'],
+    'bangla_name': ['name_bangla'],
+    'father_spouse': ['father_name', 'spouse_name'],
+    'mother': ['mother_name'],
+    'dob': ['dob'],
+    'nid_no': ['nid_no'],
+    'address': ['address'],
+}
+
+POLYGON_NA_VALUES = ['\\N', 'nan', 'NaN', '']
+
+
+def image_key(value) -> str:
+    """Turn an image_id cell or image path into a matching key ('' if missing)"""
+    if pd.isna(value):
+        return ''
+    if isinstance(value, float) and value == int(value):
+        return str(int(value))
+    text = str(value).strip()
+    if '/' in text:
+        text = text.split('/')[-1]
+    return text.replace('.jpg', '')
+
+
+def _is_missing(value) -> bool:
+    """Missing for column fallback purposes: NaN or a blank string"""
+    return pd.isna(value) or (isinstance(value, str) and value.strip() == '')
+
+
+@dataclass
+class Source:
+    """A table of NID field values that can act as truth or as a system under test"""
+    name: str
+    paths: List[str]
+    format: str = 'csv'
+    columns: Dict[str, List[str]] = field(default_factory=lambda: dict(ENTRY_RESULT_COLUMNS))
+    image_id_columns: List[str] = field(default_factory=lambda: ['image_id'])
+    na_values: Optional[List[str]] = None
+    annotator_column: Optional[str] = None
+    description: str = ''
+
+    def _read(self, path: str) -> pd.DataFrame:
+        """Read one file of the source"""
+        sep = '\t' if self.format == 'tsv' else ','
+        if self.na_values is None:
+            return pd.read_csv(path, sep=sep)
+        return pd.read_csv(path, sep=sep, keep_default_na=True, na_values=self.na_values)
+
+    def load(self) -> pd.DataFrame:
+        """
+        Load the source into the common layout
+
+        Files that don't exist are skipped. For each field, the first mapped
+        column with a value wins; if all are missing, the last column's value
+        is kept. The image_id key comes from the first image_id column with a value.
+
+        Returns:
+            DataFrame with image_id plus one column per evaluated field, and an
+            annotator column (from annotator_column, else the source name)
+        """
+        frames = [self._read(path) for path in self.paths if os.path.exists(path)]
+        raw = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        records = raw.to_dict('records')
+
+        loaded = {'image_id': []}
+        for record in records:
+            key = ''
+            for column in self.image_id_columns:
+                key = image_key(record.get(column))
+                if key:
+                    break
+            loaded['image_id'].append(key)
+
+        for field_key in METRIC_FIELDS:
+            columns = self.columns.get(field_key, [])
+            values = []
+            for record in records:
+                value = ''
+                for column in columns:
+                    value = record.get(column, '')
+                    if not _is_missing(value):
+                        break
+                values.append(value)
+            loaded[field_key] = values
+
+        if self.annotator_column:
+            loaded['annotator'] = [
+                str(record.get(self.annotator_column)) if not _is_missing(record.get(self.annotator_column))
+                else self.name
+                for record in records
+            ]
+        else:
+            loaded['annotator'] = [self.name] * len(records)
+
+        return pd.DataFrame(loaded)
+
+
+class SourceRegistry:
+    """Named sources available for evaluation"""
+
+    def __init__(self):
+        self._sources: Dict[str, Source] = {}
+
+    def register(self, source: Source) -> None:
+        """Add or replace a source"""
+        self._sources[source.name] = source
+
+    def get(self, name: str) -> Source:
+        """Get a source by name"""
+        if name not in self._sources:
+            raise KeyError(f"Unknown source '{name}'. Available: {', '.join(self.names())}")
+        return self._sources[name]
+
+    def names(self) -> List[str]:
+        """Registered source names"""
+        return list(self._sources)
+
+    def load_json(self, json_path: str, base_dir: Optional[str] = None) -> None:
+        """
+        Register sources from a JSON list of Source fields
+
+        Args:
+            json_path: Path to the JSON file
+            base_dir: Directory relative paths are resolved against
+                      (default: the JSON file's directory)
+        """
+        base_dir = base_dir or os.path.dirname(os.path.abspath(json_path))
+        with open(json_path, 'r', encoding='utf-8') as f:
+            specs = json.load(f)
+        for spec in specs:
+            spec = dict(spec)
+            spec['paths'] = [os.path.join(base_dir, path) for path in spec['paths']]
+            self.register(Source(**spec))
+
+
+def default_registry(project_root: Optional[str] = None) -> SourceRegistry:
+    """
+    Registry of the project's own sources
+
+    Args:
+        project_root: Repository root (default: parent of this directory)
+    """
+    project_root = project_root or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    data_dir = os.path.join(project_root, 'data')
+    person1 = os.path.join(data_dir, 'nid-data-entry-results-person1.csv')
+    person2 = os.path.join(data_dir, 'nid-data-entry-results-person2.csv')
+    shared = os.path.join(data_dir, 'nid-data-entry-results-shared.csv')
+
+    registry = SourceRegistry()
+    registry.register(Source('person1', [person1], description="Person 1 entry results"))
+    registry.register(Source('person2', [person2], description="Person 2 entry results"))
+    registry.register(Source(
+        'shared', [shared], annotator_column='annotator',
+        description="Shared work-queue entry results (one annotator per row)",
+    ))
+    registry.register(Source(
+        'annotators', [person1, person2, shared],
+        description="All manual entry results (person 1, person 2 and the shared queue)",
+    ))
+    registry.register(Source(
+        'consensus', [os.path.join(data_dir, 'consensus_truth.csv')],
+        description="Consensus of all annotators (written by agreement.py)",
+    ))
+    registry.register(Source(
+        'polygon', [os.path.join(data_dir, 'nid-data-140126.csv')],
+        format='tsv',
+        columns=POLYGON_COLUMNS,
+        image_id_columns=['front_image', 'back_image'],
+        na_values=POLYGON_NA_VALUES,
+        description="Polygon OCR export",
+    ))
+    registry.register(Source(
+        'gemini', [os.path.join(project_root, 'benchmark_ocr_results.csv')],
+        description="Gemini OCR benchmark results",
+    ))
+    return registry
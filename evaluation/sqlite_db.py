@@ -0,0 +1,37 @@
+"""
+SQLite connections shared by the run registry and the annotation work queue
+
+Both databases are written by several processes at once (parallel runs,
+annotators in separate browser sessions), so every connection waits for
+other writers and manages its own transactions.
+
+Standard library only, so the Streamlit apps can import it without pandas.
+"""
+
+import sqlite3
+from contextlib import contextmanager
+from typing import Iterator
+
+# Seconds a connection waits for another writer's lock before failing
+BUSY_TIMEOUT = 30
+
+
+@contextmanager
+def connect(db_path: str) -> Iterator[sqlite3.Connection]:
+    """
+    Open a connection that waits for other writers instead of failing.
+
+    The connection is in autocommit mode (transactions are started with an
+    explicit BEGIN) and returns sqlite3.Row rows. An open transaction is
+    rolled back if the block raises.
+    """
+    conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    try:
+        yield conn
+    except Exception:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
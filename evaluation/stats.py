@@ -0,0 +1,182 @@
+"""
+Bootstrap confidence intervals and paired significance tests
+
+Everything is expressed as matrix products so NumPy does the looping:
+
+- Resampling: each bootstrap sample is a row of a weight matrix (how often
+  every record was drawn); weights @ values gives every sample's column sums
+  at once. Samples are processed in blocks to bound memory.
+- Paired tests: random sign-flip matrices @ per-record differences give the
+  permutation null distribution of the mean difference.
+
+Up to POISSON_MIN_RECORDS records the weights are exact multinomial draw
+counts. Above that they are Poisson(1) counts (the Poisson bootstrap), which
+are independent per record and drawn with a table lookup instead of a
+bincount; at that size the two give the same intervals. 10,000 resamples
+over 100,000 records run in a few seconds.
+"""
+
+import math
+import warnings
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_RESAMPLES = 10000
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_SEED = 0
+
+# Elements (resamples x records) materialized per block
+BLOCK_ELEMENTS = 1 << 24
+
+POISSON_MIN_RECORDS = 10000
+
+# Poisson(1) counts indexed by a uniform 16-bit draw (inverse CDF)
+_POISSON_CDF = np.cumsum([math.exp(-1) / math.factorial(k) for k in range(16)])
+POISSON_TABLE = np.searchsorted(np.round(_POISSON_CDF * 65536), np.arange(65536),
+                                side='right').astype(np.float32)
+
+# +1/-1 indexed by a uniform byte
+SIGN_TABLE = np.where(np.arange(256) & 1, 1.0, -1.0).astype(np.float32)
+
+
+def _block_size(n_records: int, n_resamples: int) -> int:
+    """Resamples per block so a block's weight matrix stays within BLOCK_ELEMENTS"""
+    return max(1, min(n_resamples, BLOCK_ELEMENTS // max(n_records, 1)))
+
+
+def _resample_weights(rng: np.random.Generator, n_records: int, block: int) -> np.ndarray:
+    """Matrix of (block, n_records) record weights, one bootstrap sample per row"""
+    if n_records >= POISSON_MIN_RECORDS:
+        return POISSON_TABLE[rng.integers(0, 65536, size=(block, n_records), dtype=np.uint16)]
+    draws = rng.integers(0, n_records, size=(block, n_records), dtype=np.int64)
+    draws += (np.arange(block, dtype=np.int64) * n_records)[:, None]
+    counts = np.bincount(draws.ravel(), minlength=block * n_records)
+    return counts.reshape(block, n_records).astype(np.float32)
+
+
+def _column_means(values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """Mean of each column over its non-NaN values (NaN for an all-NaN column)"""
+    counts = valid.sum(axis=0)
+    sums = np.where(valid, values, 0.0).sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sums / counts
+
+
+def bootstrap_means(values: np.ndarray, n_resamples: int = DEFAULT_RESAMPLES,
+                    seed: Optional[int] = DEFAULT_SEED) -> np.ndarray:
+    """
+    Bootstrap distribution of column means
+
+    Args:
+        values: (n_records, n_columns) array; NaNs are ignored per column
+        n_resamples: Number of bootstrap samples
+        seed: Random seed (None for a fresh one)
+
+    Returns:
+        (n_resamples, n_columns) array of resampled means
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    n_records, n_columns = values.shape
+    if n_records == 0:
+        return np.full((n_resamples, n_columns), np.nan)
+
+    # Values are centered so float32 sums stay precise; the [values | valid]
+    # matrix gives sums and counts from one product
+    valid = ~np.isnan(values)
+    center = _column_means(values, valid)
+    filled = np.where(valid, values - np.nan_to_num(center), 0.0)
+    stacked = np.hstack([filled, valid]).astype(np.float32)
+
+    rng = np.random.default_rng(seed)
+    means = np.empty((n_resamples, n_columns))
+    block = _block_size(n_records, n_resamples)
+    for start in range(0, n_resamples, block):
+        size = min(block, n_resamples - start)
+        sums = _resample_weights(rng, n_records, size) @ stacked
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means[start:start + size] = sums[:, :n_columns] / sums[:, n_columns:] + np.nan_to_num(center)
+    return means
+
+
+def bootstrap_ci(data: pd.DataFrame, n_resamples: int = DEFAULT_RESAMPLES,
+                 confidence: float = DEFAULT_CONFIDENCE,
+                 seed: Optional[int] = DEFAULT_SEED) -> pd.DataFrame:
+    """
+    Percentile bootstrap confidence interval for the mean of every column
+
+    Args:
+        data: DataFrame of numeric metric columns (one row per record)
+        n_resamples: Number of bootstrap samples
+        confidence: Interval coverage, e.g. 0.95
+        seed: Random seed (None for a fresh one)
+
+    Returns:
+        DataFrame indexed by column with mean, ci_low, ci_high
+    """
+    values = data.to_numpy(dtype=np.float64)
+    means = bootstrap_means(values, n_resamples, seed)
+    alpha = (1 - confidence) / 2
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # all-NaN columns
+        low, high = np.nanquantile(means, [alpha, 1 - alpha], axis=0)
+    return pd.DataFrame({
+        'mean': _column_means(values, ~np.isnan(values)),
+        'ci_low': low,
+        'ci_high': high,
+    }, index=data.columns)
+
+
+def paired_test(a: Sequence[float], b: Sequence[float], n_resamples: int = DEFAULT_RESAMPLES,
+                confidence: float = DEFAULT_CONFIDENCE, seed: Optional[int] = DEFAULT_SEED) -> dict:
+    """
+    Paired comparison of two systems scored on the same records
+
+    The p-value is from a sign-flip permutation test on the per-record
+    differences (two-sided); the interval is a bootstrap CI of the mean
+    difference. Records missing in either system are dropped.
+
+    Args:
+        a: Metric per record for system A
+        b: Metric per record for system B (same record order)
+
+    Returns:
+        Dict with n, mean_diff (A - B), ci_low, ci_high and p_value
+    """
+    diff = np.asarray(a, dtype=np.float64) - np.asarray(b, dtype=np.float64)
+    diff = diff[~np.isnan(diff)]
+    n = diff.size
+    if n == 0:
+        return {'n': 0, 'mean_diff': np.nan, 'ci_low': np.nan, 'ci_high': np.nan, 'p_value': np.nan}
+
+    observed = diff.mean()
+    means = bootstrap_means(diff, n_resamples, seed)[:, 0]
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(means, [alpha, 1 - alpha])
+
+    rng = np.random.default_rng(None if seed is None else seed + 1)
+    scaled = (diff / n).astype(np.float32)
+    threshold = abs(observed) * (1 - 1e-6)
+    extreme = 0
+    block = _block_size(n, n_resamples)
+    for start in range(0, n_resamples, block):
+        size = min(block, n_resamples - start)
+        signs = SIGN_TABLE[rng.integers(0, 256, size=(size, n), dtype=np.uint8)]
+        extreme += int(np.count_nonzero(np.abs(signs @ scaled) >= threshold))
+    p_value = (extreme + 1) / (n_resamples + 1)
+
+    return {
+        'n': int(n),
+        'mean_diff': float(observed),
+        'ci_low': float(low),
+        'ci_high': float(high),
+        'p_value': float(p_value),
+    }
+
+
+def format_ci(row) -> str:
+    """Format a bootstrap_ci row (or aggregates column dict) as '[low - high]'"""
+    return f"[{row['ci_low']:.2f} - {row['ci_high']:.2f}]"
@@ -0,0 +1,179 @@
+"""
+Streaming evaluation for large ground truth exports
+
+StreamingEvaluator never loads the ground truth export as a whole. It reads
+the export in chunks, twice:
+
+1. Key pass - only the front_image, back_image and nid_no columns, keeping
+   the row offset of keys that some entered record actually asks for
+2. Gather pass - only the columns used for scoring, keeping the matched rows
+
+Evaluation rows are then scored and written to the output CSV in chunks, so
+peak memory depends on the number of entered records, not the export size.
+"""
+
+import os
+import time
+
+import pandas as pd
+
+try:
+    from .evaluator import ResultsEvaluator, TRUTH_COLUMNS
+    from .results import ResultBuilder
+except ImportError:
+    from evaluator import ResultsEvaluator, TRUTH_COLUMNS
+    from results import ResultBuilder
+
+KEY_COLUMNS = ['front_image', 'back_image', 'nid_no']
+
+
+class StreamingEvaluator(ResultsEvaluator):
+    """Evaluate entered results against a ground truth export read in chunks"""
+
+    def __init__(self, person1_csv, person2_csv, ground_truth_csv, chunk_size=50000, workers=1,
+                 address_components=False, extra_csvs=()):
+        """
+        Initialize the streaming evaluator (the ground truth is not loaded)
+
+        Args:
+            person1_csv: Path to person 1 results
+            person2_csv: Path to person 2 results
+            ground_truth_csv: Path to the tab-separated ground truth export
+            chunk_size: Ground truth rows read, and evaluation rows written, at a time
+            workers: Processes used for scoring (1 = no pool, 0/None = all cores)
+            address_components: Also score each address component separately
+            extra_csvs: Further entry result CSVs (e.g. the shared work queue's)
+        """
+        self.person1_results = pd.read_csv(person1_csv) if os.path.exists(person1_csv) else pd.DataFrame()
+        self.person2_results = pd.read_csv(person2_csv) if os.path.exists(person2_csv) else pd.DataFrame()
+        self.extra_results = [pd.read_csv(path) for path in extra_csvs if os.path.exists(path)]
+        self.ground_truth_csv = ground_truth_csv
+        self.ground_truth = None
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.cache_path = None
+        self.address_components = address_components
+        self.rescored_records = None
+
+    def _read_chunks(self, columns):
+        """
+        Iterate over the ground truth export in chunks
+        Values are read as text (NIDs are not rounded through float) with the
+        same missing-value markers as ResultsEvaluator.
+
+        Yields:
+            (row offset of the chunk's first row, DataFrame with the requested columns)
+        """
+        wanted = set(columns)
+        reader = pd.read_csv(self.ground_truth_csv, sep='\t', keep_default_na=True,
+                             na_values=['\\N', 'nan', 'NaN', ''], dtype=str,
+                             usecols=lambda column: column in wanted,
+                             chunksize=self.chunk_size)
+        offset = 0
+        for chunk in reader:
+            yield offset, chunk
+            offset += len(chunk)
+
+    def build_key_index(self, merged_results):
+        """
+        Key pass: first ground truth row offset for each key an entered record uses
+        Only keys present in the entered records are kept, so the indexes are
+        bounded by the number of entered records.
+        """
+        image_ids, nids = self._entry_keys(merged_results)
+        wanted_ids = {str(image_id) for image_id in image_ids if image_id}
+        wanted_nids = {
+            str(nid).replace('.0', '')
+            for image_id, nid in zip(image_ids, nids)
+            if (not image_id or str(image_id).strip() == '') and nid
+        }
+
+        indexes = {'front_image_id': {}, 'back_image_id': {}, 'nid_number': {}}
+        for offset, chunk in self._read_chunks(KEY_COLUMNS):
+            front_ids, back_ids, nid_keys = self._ground_truth_keys(chunk)
+            for name, keys, wanted in (
+                ('front_image_id', front_ids.astype(str), wanted_ids),
+                ('back_image_id', back_ids.astype(str), wanted_ids),
+                ('nid_number', nid_keys, wanted_nids),
+            ):
+                index = indexes[name]
+                for position, key in enumerate(keys):
+                    if key in wanted and key not in index:
+                        index[key] = offset + position
+        return indexes
+
+    def match_records(self, merged_results):
+        """Match entered records to ground truth row offsets (same priority as ResultsEvaluator)"""
+        return self._match_with_indexes(merged_results, self.build_key_index(merged_results))
+
+    def _gather_rows(self, offsets):
+        """Gather pass: scoring columns of the ground truth rows at the given offsets"""
+        pending = sorted(set(offsets))
+        rows = {}
+        i = 0
+        for offset, chunk in self._read_chunks(TRUTH_COLUMNS):
+            if i == len(pending):
+                break
+            end = offset + len(chunk)
+            while i < len(pending) and pending[i] < end:
+                rows[pending[i]] = chunk.iloc[pending[i] - offset].to_dict()
+                i += 1
+        return rows
+
+    def _matched_records(self):
+        """Entered records paired with their ground truth rows, in entered order"""
+        merged_results = self.merge_results()
+        matches = self.match_records(merged_results)
+        truth_rows = self._gather_rows(matches['gt_pos'])
+        entries = merged_results.iloc[matches['entry_pos']].to_dict('records')
+        predictions = [truth_rows[gt_pos] for gt_pos in matches['gt_pos']]
+        self.add_normalized_ids(entries, predictions)
+        return list(zip(entries, predictions, matches['match_method']))
+
+    def evaluate(self):
+        """Evaluate all results and return the evaluation rows as a DataFrame"""
+        records = self._matched_records()
+        results = ResultBuilder(capacity=len(records))
+        results.extend(self._score_records(records))
+        return results.to_frame()
+
+    def evaluate_to_csv(self, output_csv):
+        """
+        Score matched records and append them to the output CSV chunk by chunk
+
+        Returns:
+            Number of evaluation rows written
+        """
+        records = self._matched_records()
+        tmp_path = f"{output_csv}.tmp"
+        written = 0
+        for start in range(0, len(records), self.chunk_size):
+            chunk_records = records[start:start + self.chunk_size]
+            results = ResultBuilder(capacity=len(chunk_records))
+            results.extend(self._score_records(chunk_records))
+            chunk = results.to_frame()
+            chunk.to_csv(tmp_path, mode='w' if start == 0 else 'a', header=start == 0, index=False)
+            written += len(chunk)
+        if written == 0:
+            pd.DataFrame().to_csv(tmp_path, index=False)
+        os.replace(tmp_path, output_csv)
+        return written
+
+    def generate_report(self, output_csv):
+        """Generate evaluation report, writing the CSV in chunks"""
+        total_records = len(self.merge_results())
+
+        start_time = time.perf_counter()
+        written = self.evaluate_to_csv(output_csv)
+        elapsed = self.elapsed = time.perf_counter() - start_time
+
+        # The printed summary (and the run registry) only need ids and metric columns
+        if written:
+            evaluation_df = pd.read_csv(
+                output_csv,
+                usecols=lambda column: column in ('image_id', 'match_method') or column.endswith(('_accuracy', '_cer', '_wer')),
+            )
+        else:
+            evaluation_df = pd.DataFrame()
+        self._print_report(evaluation_df, total_records, elapsed, output_csv)
+        return evaluation_df
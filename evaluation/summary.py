@@ -1,6 +1,14 @@
 import pandas as pd
 import os
 
+try:
+    from .aggregate import load_aggregates
+    from .stats import format_ci, DEFAULT_CONFIDENCE
+except ImportError:
+    from aggregate import load_aggregates
+    from stats import format_ci, DEFAULT_CONFIDENCE
+
+
 def print_summary(evaluation_csv):
     """Print summary statistics from evaluation results"""
     if not os.path.exists(evaluation_csv):
@@ -8,6 +16,9 @@ def print_summary(evaluation_csv):
         return
     
     df = pd.read_csv(evaluation_csv)
+    aggregates = load_aggregates(evaluation_csv, df=df)
+    columns = aggregates['columns']
+    total = aggregates['records']
     
     print("\n" + "="*100)
     print("DETAILED EVALUATION SUMMARY")
@@ -15,11 +26,11 @@ def print_summary(evaluation_csv):
     
     print(f"\n📊 OVERALL STATISTICS")
     print("-" * 100)
-    print(f"Total Records Evaluated: {len(df)}")
-    print(f"\nAccuracy Metrics:")
-    print(f"  • Average Accuracy:  {df['overall_accuracy'].mean():>6.2f}%  (min: {df['overall_accuracy'].min():>6.2f}%, max: {df['overall_accuracy'].max():>6.2f}%)")
-    print(f"  • Average CER:       {df['overall_cer'].mean():>6.2f}%  (min: {df['overall_cer'].min():>6.2f}%, max: {df['overall_cer'].max():>6.2f}%)")
-    print(f"  • Average WER:       {df['overall_wer'].mean():>6.2f}%  (min: {df['overall_wer'].min():>6.2f}%, max: {df['overall_wer'].max():>6.2f}%)")
+    print(f"Total Records Evaluated: {total}")
+    print(f"\nAccuracy Metrics ({DEFAULT_CONFIDENCE:.0%} bootstrap CI):")
+    for metric, label in (('accuracy', 'Accuracy:  '), ('cer', 'CER:       '), ('wer', 'WER:       ')):
+        stats = columns[f'overall_{metric}']
+        print(f"  • Average {label}{stats['mean']:>6.2f}%  {format_ci(stats)}  (min: {stats['min']:>6.2f}%, max: {stats['max']:>6.2f}%)")
     
     print(f"\n\n📋 FIELD-BY-FIELD ANALYSIS")
     print("-" * 100)
@@ -35,38 +46,36 @@ def print_summary(evaluation_csv):
     ]
     
     for field_key, field_label in fields:
-        acc_col = f'{field_key}_accuracy'
-        cer_col = f'{field_key}_cer'
-        wer_col = f'{field_key}_wer'
+        acc = columns[f'{field_key}_accuracy']
+        cer = columns[f'{field_key}_cer']
+        wer = columns[f'{field_key}_wer']
         
         print(f"\n{field_label}:")
-        print(f"  Accuracy: {df[acc_col].mean():>6.2f}%  | CER: {df[cer_col].mean():>6.2f}%  | WER: {df[wer_col].mean():>6.2f}%")
-        print(f"    (Accuracy range: {df[acc_col].min():.2f}% - {df[acc_col].max():.2f}%)")
+        print(f"  Accuracy: {acc['mean']:>6.2f}% {format_ci(acc)}  | "
+              f"CER: {cer['mean']:>6.2f}% {format_ci(cer)}  | "
+              f"WER: {wer['mean']:>6.2f}% {format_ci(wer)}")
+        print(f"    (Accuracy range: {acc['min']:.2f}% - {acc['max']:.2f}%)")
     
     print(f"\n\n🎯 ACCURACY DISTRIBUTION")
     print("-" * 100)
     
-    # Accuracy buckets
-    buckets = [(90, 100), (80, 90), (70, 80), (60, 70), (50, 60), (0, 50)]
-    for lower, upper in buckets:
-        count = len(df[(df['overall_accuracy'] >= lower) & (df['overall_accuracy'] < upper)])
-        percentage = (count / len(df)) * 100
+    # Accuracy buckets, highest first
+    edges = aggregates['histogram']['edges']
+    counts = aggregates['histogram']['counts']
+    for lower, upper, count in reversed(list(zip(edges[:-1], edges[1:], counts))):
+        percentage = (count / total) * 100
         bar = "█" * int(percentage / 5)
         print(f"  {lower:>3}% - {upper:>3}%: {count:>3} records ({percentage:>5.1f}%) {bar}")
     
     print(f"\n\n📈 QUALITY ASSESSMENT")
     print("-" * 100)
     
-    excellent = len(df[df['overall_accuracy'] >= 95])
-    good = len(df[(df['overall_accuracy'] >= 80) & (df['overall_accuracy'] < 95)])
-    fair = len(df[(df['overall_accuracy'] >= 60) & (df['overall_accuracy'] < 80)])
-    poor = len(df[df['overall_accuracy'] < 60])
-    
+    tiers = aggregates['tiers']
     print(f"\nQuality Tiers:")
-    print(f"  • Excellent (≥95%):  {excellent:>3} records ({excellent/len(df)*100:>5.1f}%)")
-    print(f"  • Good (80-95%):     {good:>3} records ({good/len(df)*100:>5.1f}%)")
-    print(f"  • Fair (60-80%):     {fair:>3} records ({fair/len(df)*100:>5.1f}%)")
-    print(f"  • Poor (<60%):       {poor:>3} records ({poor/len(df)*100:>5.1f}%)")
+    print(f"  • Excellent (≥95%):  {tiers['excellent']:>3} records ({tiers['excellent']/total*100:>5.1f}%)")
+    print(f"  • Good (80-95%):     {tiers['good']:>3} records ({tiers['good']/total*100:>5.1f}%)")
+    print(f"  • Fair (60-80%):     {tiers['fair']:>3} records ({tiers['fair']/total*100:>5.1f}%)")
+    print(f"  • Poor (<60%):       {tiers['poor']:>3} records ({tiers['poor']/total*100:>5.1f}%)")
     
     print(f"\n\n💾 OUTPUT FILE")
     print("-" * 100)
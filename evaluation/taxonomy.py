@@ -0,0 +1,339 @@
+"""
+Per-field error taxonomy with character confusion counts
+
+Usage:
+    python taxonomy.py                          # residual errors after normalization
+    python taxonomy.py --raw                    # errors before normalization
+    python taxonomy.py --fields address --top 30
+    python taxonomy.py --input ../data/system_comparison.csv --system gemini
+
+Every (entered, predicted) pair is aligned with edit_distance.alignment and
+each aligned character pair is counted per field. Counts are kept as sparse
+int64 arrays: a (reference, hypothesis) pair is one int64 key built from
+two alphabet codes, and pending keys are merged into sorted key/count arrays
+with np.unique, so memory is bounded by the number of distinct confusions,
+not the number of aligned characters. Matches in the common prefix and suffix
+of a pair are tallied per character without aligning them.
+
+Errors are grouped into categories: virama, Devanagari look-alike (characters
+the normalizer maps to Bengali), vowel sign, digit, letter, space and
+punctuation. For addresses, comma-separated segments are also aligned to count
+dropped segments.
+"""
+
+import argparse
+import os
+from array import array
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .evaluator import METRIC_FIELDS
+    from . import edit_distance, normalizer
+except ImportError:
+    from evaluator import METRIC_FIELDS
+    import edit_distance
+    import normalizer
+
+VIRAMA = '\u09CD'
+
+# Bengali dependent signs other than the virama
+VOWEL_SIGNS = set(normalizer.VOWEL_MATRAS) | set('\u0981\u0982\u0983\u09BC\u09C3\u09C4\u09D7')
+
+CATEGORIES = ['virama', 'devanagari', 'vowel_sign', 'digit', 'letter', 'space', 'punctuation']
+
+# Pending keys merged into the sorted arrays at a time
+FLUSH_SIZE = 1 << 20
+
+
+def char_class(char):
+    """Category of a single character ('' for the empty side of an insertion/deletion)"""
+    if char == '':
+        return ''
+    if char == VIRAMA:
+        return 'virama'
+    if '\u0900' <= char <= '\u097F':
+        return 'devanagari'
+    if char in VOWEL_SIGNS:
+        return 'vowel_sign'
+    if char.isdigit():
+        return 'digit'
+    if char.isalpha():
+        return 'letter'
+    if char.isspace():
+        return 'space'
+    return 'punctuation'
+
+
+def char_label(char):
+    """Readable label for a character: the character and its code point"""
+    if char == '':
+        return '∅'
+    return f"{char} (U+{ord(char):04X})"
+
+
+class Alphabet:
+    """Integer codes for characters (0 is the empty side of an insertion/deletion)"""
+
+    def __init__(self):
+        self.codes = {'': 0}
+        self.chars = ['']
+
+    def code(self, char):
+        """Code of a character, assigning a new one on first use"""
+        code = self.codes.get(char)
+        if code is None:
+            code = self.codes[char] = len(self.chars)
+            self.chars.append(char)
+        return code
+
+    def classes(self):
+        """Category of every code, as an array indexed by code"""
+        return np.array([char_class(char) for char in self.chars], dtype=object)
+
+
+class ConfusionCounts:
+    """Sparse (reference, hypothesis) character counts backed by int64 arrays"""
+
+    def __init__(self, alphabet):
+        self.alphabet = alphabet
+        self.keys = np.empty(0, dtype=np.int64)
+        self.counts = np.empty(0, dtype=np.int64)
+        self._pending = array('q')
+        self._matches = Counter()
+
+    def add_matches(self, text):
+        """Count every character of text as matched"""
+        self._matches.update(text)
+
+    def add_alignment(self, ops):
+        """Count the aligned pairs of one alignment"""
+        code = self.alphabet.code
+        pending = self._pending
+        for op, ref, hyp in ops:
+            if op == edit_distance.MATCH:
+                self._matches[ref] += 1
+            else:
+                pending.append(code(ref or '') << 32 | code(hyp or ''))
+        if len(pending) >= FLUSH_SIZE:
+            self._flush()
+
+    def _flush(self):
+        """Merge pending keys and matches into the sorted key/count arrays"""
+        code = self.alphabet.code
+        match_keys = [code(char) for char in self._matches]
+        keys = np.concatenate([
+            self.keys,
+            np.frombuffer(self._pending, dtype=np.int64) if len(self._pending) else np.empty(0, np.int64),
+            np.array([c << 32 | c for c in match_keys], dtype=np.int64),
+        ])
+        weights = np.concatenate([
+            self.counts,
+            np.ones(len(self._pending), dtype=np.int64),
+            np.array(list(self._matches.values()), dtype=np.int64),
+        ])
+        self.keys, inverse = np.unique(keys, return_inverse=True)
+        self.counts = np.bincount(inverse, weights=weights, minlength=len(self.keys)).astype(np.int64)
+        self._pending = array('q')
+        self._matches = Counter()
+
+    def table(self):
+        """
+        All counts as arrays
+
+        Returns:
+            (reference codes, hypothesis codes, counts)
+        """
+        self._flush()
+        return self.keys >> 32, self.keys & 0xFFFFFFFF, self.counts
+
+    def operation_totals(self):
+        """Counts of matches, substitutions, deletions and insertions"""
+        ref, hyp, counts = self.table()
+        return {
+            edit_distance.MATCH: int(counts[ref == hyp].sum()),
+            edit_distance.SUBSTITUTE: int(counts[(ref != hyp) & (ref != 0) & (hyp != 0)].sum()),
+            edit_distance.DELETE: int(counts[hyp == 0].sum()),
+            edit_distance.INSERT: int(counts[ref == 0].sum()),
+        }
+
+    def category_totals(self):
+        """
+        Error counts per category
+
+        An error is filed under the first category in CATEGORIES that either
+        of its characters belongs to.
+        """
+        ref, hyp, counts = self.table()
+        errors = ref != hyp
+        classes = self.alphabet.classes()
+        ref_class, hyp_class = classes[ref[errors]], classes[hyp[errors]]
+        counts = counts[errors]
+        totals = {}
+        assigned = np.zeros(len(counts), dtype=bool)
+        for category in CATEGORIES:
+            mask = ~assigned & ((ref_class == category) | (hyp_class == category))
+            totals[category] = int(counts[mask].sum())
+            assigned |= mask
+        return totals
+
+    def top_confusions(self, n=20):
+        """
+        Most frequent errors
+
+        Returns:
+            DataFrame: reference, hypothesis, operation, category, count
+        """
+        ref, hyp, counts = self.table()
+        errors = np.flatnonzero(ref != hyp)
+        top = errors[np.argsort(-counts[errors], kind='stable')[:n]]
+        rows = []
+        for i in top:
+            ref_char = self.alphabet.chars[ref[i]]
+            hyp_char = self.alphabet.chars[hyp[i]]
+            if ref_char == '':
+                operation = edit_distance.INSERT
+            elif hyp_char == '':
+                operation = edit_distance.DELETE
+            else:
+                operation = edit_distance.SUBSTITUTE
+            category = next((c for c in CATEGORIES if c in (char_class(ref_char), char_class(hyp_char))), '')
+            rows.append((char_label(ref_char), char_label(hyp_char), operation, category, int(counts[i])))
+        return pd.DataFrame(rows, columns=['reference', 'hypothesis', 'operation', 'category', 'count'])
+
+
+class ErrorTaxonomy:
+    """Character confusion counts and error categories for every field"""
+
+    def __init__(self, fields=METRIC_FIELDS, raw=False):
+        """
+        Args:
+            fields: Fields to analyze
+            raw: Align the values as entered instead of after normalization
+        """
+        self.fields = list(fields)
+        self.raw = raw
+        self.alphabet = Alphabet()
+        self.confusions = {field_key: ConfusionCounts(self.alphabet) for field_key in self.fields}
+        self.pairs = Counter()
+        self.segments = Counter()
+
+    def _prepare(self, value):
+        """Text as compared by the metrics (or as entered, in raw mode)"""
+        if pd.isna(value):
+            return ''
+        if self.raw:
+            return str(value).lower()
+        return normalizer.normalize_value(value).lower()
+
+    def add(self, field_key, reference, hypothesis):
+        """Align one pair of values and count its characters"""
+        reference = self._prepare(reference)
+        hypothesis = self._prepare(hypothesis)
+        confusions = self.confusions[field_key]
+        self.pairs[field_key] += 1
+
+        if field_key == 'address':
+            ref_segments = [s.strip() for s in reference.split(',') if s.strip()]
+            hyp_segments = [s.strip() for s in hypothesis.split(',') if s.strip()]
+            self.segments['total'] += len(ref_segments)
+            if ref_segments != hyp_segments:
+                for op, _, _ in edit_distance.alignment(ref_segments, hyp_segments):
+                    self.segments[op] += 1
+
+        if reference == hypothesis:
+            confusions.add_matches(reference)
+            return
+        ref_core, hyp_core = edit_distance.trim_common_affixes(reference, hypothesis)
+        prefix = len(reference) - len(ref_core)
+        confusions.add_matches(reference[:prefix])
+        confusions.add_matches(reference[prefix + len(ref_core):])
+        confusions.add_alignment(edit_distance.alignment(ref_core, hyp_core))
+
+    def add_evaluation(self, evaluation_df):
+        """Add every field of an evaluation results DataFrame (actual_* vs predicted_*)"""
+        for field_key in self.fields:
+            for reference, hypothesis in zip(evaluation_df[f'actual_{field_key}'],
+                                             evaluation_df[f'predicted_{field_key}']):
+                self.add(field_key, reference, hypothesis)
+
+    def add_long(self, long_df):
+        """Add a long-format DataFrame (field, actual, predicted), e.g. from multi_system.py"""
+        for field_key, reference, hypothesis in zip(long_df['field'], long_df['actual'], long_df['predicted']):
+            if field_key in self.confusions:
+                self.add(field_key, reference, hypothesis)
+
+    def summary(self):
+        """
+        Per-field operation and category totals
+
+        Returns:
+            DataFrame indexed by field: pairs, characters, match, substitute,
+            delete, insert, error_rate, then one column per category
+        """
+        rows = {}
+        for field_key in self.fields:
+            confusions = self.confusions[field_key]
+            operations = confusions.operation_totals()
+            characters = operations[edit_distance.MATCH] + operations[edit_distance.SUBSTITUTE] \
+                + operations[edit_distance.DELETE]
+            errors = sum(operations.values()) - operations[edit_distance.MATCH]
+            rows[field_key] = {
+                'pairs': self.pairs[field_key],
+                'characters': characters,
+                **operations,
+                'error_rate': round(100 * errors / characters, 2) if characters else 0.0,
+                **confusions.category_totals(),
+            }
+        return pd.DataFrame.from_dict(rows, orient='index')
+
+    def generate_report(self, top=15):
+        """Print the per-field summary, address segment drops and top confusions"""
+        print("\n" + "="*80)
+        print(f"ERROR TAXONOMY ({'raw values' if self.raw else 'after normalization'})")
+        print("="*80)
+        print("\nOperations and error categories per field:")
+        print(self.summary().to_string())
+
+        if 'address' in self.fields and self.segments['total']:
+            dropped = self.segments[edit_distance.DELETE]
+            print(f"\nAddress segments: {self.segments['total']} entered, {dropped} dropped, "
+                  f"{self.segments[edit_distance.SUBSTITUTE]} changed, "
+                  f"{self.segments[edit_distance.INSERT]} extra")
+
+        for field_key in self.fields:
+            confusions = self.confusions[field_key].top_confusions(top)
+            if len(confusions):
+                print(f"\nTop confusions - {field_key}:")
+                print(confusions.to_string(index=False))
+        print("="*80 + "\n")
+
+
+def main():
+    """Print the error taxonomy from the command line"""
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    parser = argparse.ArgumentParser(description="Per-field character error taxonomy")
+    parser.add_argument('--input', default=os.path.join(project_root, 'data', 'evaluation_results.csv'),
+                        help="Evaluation results CSV, or long-format CSV from multi_system.py")
+    parser.add_argument('--system', help="System to analyze in a long-format CSV")
+    parser.add_argument('--fields', nargs='+', default=METRIC_FIELDS, help="Fields to analyze")
+    parser.add_argument('--raw', action='store_true', help="Align values before normalization")
+    parser.add_argument('--top', type=int, default=15, help="Confusions listed per field")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.input, dtype=str, keep_default_na=False)
+    taxonomy = ErrorTaxonomy(args.fields, raw=args.raw)
+    if 'field' in df.columns:
+        if args.system:
+            df = df[df['system'] == args.system]
+        taxonomy.add_long(df)
+    else:
+        taxonomy.add_evaluation(df)
+    taxonomy.generate_report(args.top)
+
+
+if __name__ == "__main__":
+    main()
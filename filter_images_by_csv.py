@@ -202,7 +202,12 @@ class CSVImageFilter:
 
 def main():
     """Example usage of the CSVImageFilter."""
-    import sys
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Delete images whose file names aren't in the CSV (dry run first)")
+    parser.add_argument('--confirm', action='store_true',
+                        help="Delete after the dry run without asking for confirmation")
+    args = parser.parse_args()
     
     # Configuration
     csv_file = "data/nid-data-140126.csv"
@@ -217,7 +222,7 @@ def main():
         return
     
     # Check for --confirm flag to skip confirmation
-    confirm_delete = '--confirm' in sys.argv
+    confirm_delete = args.confirm
     
     # Perform dry run first (no actual deletion)
     print("=" * 70)
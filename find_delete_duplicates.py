@@ -115,8 +115,7 @@ def delete_duplicates(common_ids: Set[str], front_dir: str, back_dir: str, dry_r
     print(f"\nTotal files to delete: {total_deleted}")
 
 
-def main():
-    base_dir = "/home/kabin/Polygon/github/nid_check/data/images"
+def main(base_dir: str = "/home/kabin/Polygon/github/nid_check/data/images"):
     front_dir = os.path.join(base_dir, "nid_front_image")
     back_dir = os.path.join(base_dir, "nid_back_image")
     
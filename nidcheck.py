@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+nidcheck - one command line for the NID OCR and evaluation tools
+
+Usage:
+    python nidcheck.py ocr --limit 10            # Gemini OCR on unprocessed image pairs
+    python nidcheck.py stats                     # processed / remaining image pairs
+    python nidcheck.py evaluate --workers 4      # score all entry results against ground truth
+    python nidcheck.py summarize --report        # summary of data/evaluation_results.csv
+    python nidcheck.py dedupe                    # images duplicated in front and back dirs
+    python nidcheck.py filter --confirm          # delete images not in the ground truth CSV
+
+Each command imports its module (and pandas, NumPy or LangChain) only when it
+runs, and the Gemini API key is read only by commands that call the API, so
+`--help` and `stats` start instantly and need no credentials.
+`nidcheck <command> --help` shows the options of that command.
+"""
+
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+OPERATIONS_DIR = os.path.join(ROOT, "operations")
+EVALUATION_DIR = os.path.join(ROOT, "evaluation")
+EVALUATION_CSV = os.path.join(ROOT, "data", "evaluation_results.csv")
+
+
+def _use(directory):
+    """Make a script directory's flat imports resolvable"""
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+
+
+def _run_main(command, main, args):
+    """Run a script's main() as if it was invoked with args"""
+    saved = sys.argv
+    sys.argv = [f"nidcheck {command}"] + args
+    try:
+        main()
+    finally:
+        sys.argv = saved
+
+
+def ocr(args):
+    _use(OPERATIONS_DIR)
+    from ocr_benchmark import main
+    _run_main("ocr", main, args)
+
+
+def stats(args):
+    argparse.ArgumentParser(prog="nidcheck stats", description=COMMANDS["stats"][1]).parse_args(args)
+    _use(OPERATIONS_DIR)
+    from ocr_benchmark import OCRBenchmark
+    OCRBenchmark().get_stats()
+
+
+def evaluate(args):
+    _use(EVALUATION_DIR)
+    from evaluator import main
+    _run_main("evaluate", main, args)
+
+
+def summarize(args):
+    parser = argparse.ArgumentParser(prog="nidcheck summarize", description=COMMANDS["summarize"][1])
+    parser.add_argument("--csv", default=EVALUATION_CSV, help="Evaluation results CSV")
+    parser.add_argument("--report", nargs="?", const=os.path.join(ROOT, "data", "EVALUATION_SUMMARY.txt"),
+                        help="Also write the full text report (default: data/EVALUATION_SUMMARY.txt)")
+    options = parser.parse_args(args)
+    _use(EVALUATION_DIR)
+    if options.report:
+        from generate_summary import generate_overall_summary
+        generate_overall_summary(options.csv, options.report)
+    else:
+        from summary import print_summary
+        print_summary(options.csv)
+
+
+def dedupe(args):
+    parser = argparse.ArgumentParser(prog="nidcheck dedupe", description=COMMANDS["dedupe"][1])
+    parser.add_argument("--images-dir", default=os.path.join(ROOT, "data", "images"),
+                        help="Directory holding nid_front_image/ and nid_back_image/")
+    options = parser.parse_args(args)
+    _use(ROOT)
+    from find_delete_duplicates import main
+    main(options.images_dir)
+
+
+def filter_images(args):
+    _use(ROOT)
+    from filter_images_by_csv import main
+    # The script's paths are relative to the project root
+    os.chdir(ROOT)
+    _run_main("filter", main, args)
+
+
+COMMANDS = {
+    "ocr": (ocr, "Run Gemini OCR on image pairs not processed yet"),
+    "stats": (stats, "Show how many image pairs have been processed"),
+    "evaluate": (evaluate, "Score person 1, person 2 and shared-queue entry results against the ground truth"),
+    "summarize": (summarize, "Print the evaluation summary"),
+    "dedupe": (dedupe, "Find and delete images duplicated in both the front and back directories"),
+    "filter": (filter_images, "Delete images that aren't listed in the ground truth CSV"),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="nidcheck", description="NID OCR and evaluation tools")
+    commands = parser.add_subparsers(dest="command", metavar="command", required=True)
+    for name, (_, description) in COMMANDS.items():
+        # Options (and --help) are handled by the command itself
+        commands.add_parser(name, help=description, add_help=False)
+    options, args = parser.parse_known_args(argv)
+    COMMANDS[options.command][0](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,11 @@
-"""Configuration module for loading environment variables."""
+"""Configuration module for loading environment variables.
+
+GEMINI_API_KEY is loaded on first access, so importing the paths below
+needs neither an API key nor python-dotenv.
+"""
 
 import os
 from pathlib import Path
-from dotenv import load_dotenv
-
-# First try to get from environment variable (exported)
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-
-# If not in environment, load from .env file
-if not GEMINI_API_KEY:
-    env_path = Path(__file__).parent / ".env"
-    load_dotenv(env_path)
-    GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-
-if not GEMINI_API_KEY:
-    raise ValueError(
-        "GEMINI_API_KEY not found in environment or .env file. "
-        "Please set GEMINI_API_KEY environment variable or create a .env file with your Gemini API key."
-    )
 
 # Paths
 BASE_DIR = Path(__file__).parent.parent
@@ -25,3 +13,32 @@ DATA_DIR = BASE_DIR / "data" / "images"
 FRONT_DIR = DATA_DIR / "nid_front_image"
 BACK_DIR = DATA_DIR / "nid_back_image"
 BENCHMARK_CSV = BASE_DIR / "benchmark_ocr_results.csv"
+
+
+def load_api_key() -> str:
+    """Read GEMINI_API_KEY from the environment, or else from the .env file."""
+    # First try to get from environment variable (exported)
+    api_key = os.getenv("GEMINI_API_KEY")
+
+    # If not in environment, load from .env file
+    if not api_key:
+        from dotenv import load_dotenv
+
+        env_path = Path(__file__).parent / ".env"
+        load_dotenv(env_path)
+        api_key = os.getenv("GEMINI_API_KEY")
+
+    if not api_key:
+        raise ValueError(
+            "GEMINI_API_KEY not found in environment or .env file. "
+            "Please set GEMINI_API_KEY environment variable or create a .env file with your Gemini API key."
+        )
+    return api_key
+
+
+def __getattr__(name: str):
+    """Load GEMINI_API_KEY on first access (also for `from config import GEMINI_API_KEY`)."""
+    if name == "GEMINI_API_KEY":
+        value = globals()[name] = load_api_key()
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,14 +1,50 @@
 """Gemini OCR module using LangChain for extracting NID information from images."""
 
 import base64
+import hashlib
 import json
 import time
 import re
 from pathlib import Path
-from typing import Dict, Optional
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.messages import HumanMessage
-from config import GEMINI_API_KEY
+from typing import TYPE_CHECKING, Dict, Optional
+
+# LangChain and the API key are loaded when a GeminiOCR is created, so
+# MODEL_NAME and prompt_hash() are importable without them
+if TYPE_CHECKING:
+    from langchain_core.messages import HumanMessage
+
+MODEL_NAME = "gemini-2.5-flash"
+
+FRONT_PROMPT = """You are an expert at reading National ID (NID) documents from Bangladesh.
+        
+Analyze this NID front image and extract the following information in JSON format:
+{
+    "english_name": "the name in English",
+    "bangla_name": "the name in Bengali script",
+    "father_spouse_name": "father's name or spouse's name if present",
+    "mother_name": "mother's name",
+    "dob": "date of birth in yyyy-mm-dd format",
+    "nid_no": "the NID number"
+}
+
+If any field is not visible or cannot be extracted, use empty string for that field.
+Return ONLY valid JSON inside code blocks, no additional text."""
+
+BACK_PROMPT = """You are an expert at reading National ID (NID) documents from Bangladesh.
+        
+Analyze this NID back image and extract the following information in JSON format:
+{
+    "plain_address": "the complete address written on the back"
+}
+
+If the address field is not visible or cannot be extracted, use empty string.
+Return ONLY valid JSON inside code blocks, no additional text."""
+
+
+def prompt_hash() -> str:
+    """Short hash of the prompts, to tell benchmark runs with different prompts apart."""
+    digest = hashlib.sha256(f"{FRONT_PROMPT}\0{BACK_PROMPT}".encode("utf-8"))
+    return digest.hexdigest()[:12]
 
 
 class GeminiOCR:
@@ -16,8 +52,11 @@ class GeminiOCR:
 
     def __init__(self):
         """Initialize LangChain Gemini client."""
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        from config import GEMINI_API_KEY
+
         self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
+            model=MODEL_NAME,
             google_api_key=GEMINI_API_KEY,
             temperature=0.1,
         )
@@ -56,7 +95,7 @@ class GeminiOCR:
             self.request_count += 1
             self.last_request_time = current_time
 
-    def _invoke_with_retry(self, message: HumanMessage) -> dict:
+    def _invoke_with_retry(self, message: "HumanMessage") -> dict:
         """
         Invoke LLM with retry logic for quota exhaustion.
         
@@ -106,20 +145,9 @@ class GeminiOCR:
         - dob (yyyy-mm-dd format)
         - nid_no
         """
-        prompt = """You are an expert at reading National ID (NID) documents from Bangladesh.
-        
-Analyze this NID front image and extract the following information in JSON format:
-{
-    "english_name": "the name in English",
-    "bangla_name": "the name in Bengali script",
-    "father_spouse_name": "father's name or spouse's name if present",
-    "mother_name": "mother's name",
-    "dob": "date of birth in yyyy-mm-dd format",
-    "nid_no": "the NID number"
-}
+        prompt = FRONT_PROMPT
 
-If any field is not visible or cannot be extracted, use empty string for that field.
-Return ONLY valid JSON inside code blocks, no additional text."""
+        from langchain_core.messages import HumanMessage
 
         try:
             # Apply rate limiting
@@ -215,15 +243,9 @@ Return ONLY valid JSON inside code blocks, no additional text."""
         Returns fields:
         - plain_address
         """
-        prompt = """You are an expert at reading National ID (NID) documents from Bangladesh.
-        
-Analyze this NID back image and extract the following information in JSON format:
-{
-    "plain_address": "the complete address written on the back"
-}
+        prompt = BACK_PROMPT
 
-If the address field is not visible or cannot be extracted, use empty string.
-Return ONLY valid JSON inside code blocks, no additional text."""
+        from langchain_core.messages import HumanMessage
 
         try:
             # Apply rate limiting
@@ -0,0 +1,452 @@
+"""Load test for the OCR pipeline against a local mock Gemini server.
+
+Starts an HTTP stand-in for the Gemini generateContent endpoint and drives
+OCRBenchmark.process_all_pairs over synthetic image pairs, so changes to
+rate limiting, retries or concurrency can be measured without an API key or
+quota. The mock server draws each reply's latency from a configurable
+distribution and can answer with 429 RESOURCE_EXHAUSTED (with a retryDelay
+hint) or a malformed reply.
+
+Waits are simulated: server latency and the pipeline's own sleeps (rate
+limiting, quota countdowns) run --time-scale times faster than real time,
+and the report is in modelled time, i.e. what the same run would take
+against the real endpoint.
+
+Usage:
+    python load_test.py --pairs 2000
+    python load_test.py --pairs 5000 --latency lognormal:800,0.6 --rate-429 0.05 --retry-delay 20
+    python load_test.py --rpm 60 --malformed 0.02 --output load_test.json
+"""
+
+import argparse
+import contextlib
+import json
+import math
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# GeminiOCR requires an API key; the mock server doesn't check it
+os.environ.setdefault("GEMINI_API_KEY", "mock-key")
+
+import gemini_ocr  # noqa: E402
+import ocr_benchmark  # noqa: E402
+from gemini_ocr import MODEL_NAME  # noqa: E402
+
+FRONT_REPLY = {
+    "english_name": "MOHAMMAD KARIM UDDIN",
+    "bangla_name": "মোহাম্মদ করিম উদ্দিন",
+    "father_spouse_name": "আবদুল করিম",
+    "mother_name": "ফাতেমা বেগম",
+    "dob": "1990-01-15",
+    "nid_no": "6032068741",
+}
+BACK_REPLY = {
+    "plain_address": "বাসা/হোল্ডিং: ১২৩১, গ্রাম/রাস্তা: সেনপাড়া, ডাকঘর: মিরপুর - ১২১৬, কাফরুল, ঢাকা",
+}
+MALFORMED_REPLIES = [
+    "I could not read this image.",
+    '```json\n{"english_name": "MOHAMMAD KAR',
+    '```json\n{"plain_address": ঢাকা}\n```',
+]
+
+
+def parse_latency(spec: str):
+    """
+    Latency distribution from a spec, as a function of a random.Random.
+
+    Specs (milliseconds): fixed:MS, uniform:LOW,HIGH, lognormal:MEDIAN,SIGMA
+
+    Returns:
+        Function returning one latency in seconds
+    """
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",") if v]
+    if kind == "fixed" and len(values) == 1:
+        return lambda rng: values[0] / 1000
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1]) / 1000
+    if kind == "lognormal" and len(values) == 2:
+        mu = math.log(values[0])
+        return lambda rng: rng.lognormvariate(mu, values[1]) / 1000
+    raise ValueError(f"Invalid latency spec '{spec}' (fixed:MS, uniform:LOW,HIGH, lognormal:MEDIAN,SIGMA)")
+
+
+class MockGeminiServer:
+    """Local HTTP stand-in for the Gemini generateContent endpoint."""
+
+    def __init__(self, latency: str = "lognormal:800,0.5", rate_429: float = 0.0,
+                 retry_delay: float = 30.0, malformed: float = 0.0,
+                 time_scale: float = 1.0, seed: int = 0):
+        """
+        Configure the server (started by start()).
+
+        Args:
+            latency: Latency distribution spec (see parse_latency)
+            rate_429: Fraction of requests answered with 429 RESOURCE_EXHAUSTED
+            retry_delay: retryDelay hint in 429 replies (seconds)
+            malformed: Fraction of replies that aren't valid JSON
+            time_scale: Real sleep per modelled second of latency
+            seed: Seed for latency and fault draws
+        """
+        self.draw_latency = parse_latency(latency)
+        self.rate_429 = rate_429
+        self.retry_delay = retry_delay
+        self.malformed = malformed
+        self.time_scale = time_scale
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = {"requests": 0, "ok": 0, "rate_limited": 0, "malformed": 0}
+        self.httpd = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _reply(self, prompt: str) -> Tuple[int, dict, float]:
+        """Draw (status, body, modelled latency) for one request."""
+        with self.lock:
+            self.counts["requests"] += 1
+            latency = self.draw_latency(self.rng)
+            fault = self.rng.random()
+            if fault < self.rate_429:
+                self.counts["rate_limited"] += 1
+                return 429, {"error": {
+                    "code": 429,
+                    "message": f"You exceeded your current quota. Please retry in {self.retry_delay}s.",
+                    "status": "RESOURCE_EXHAUSTED",
+                    "details": [{"@type": "type.googleapis.com/google.rpc.RetryInfo",
+                                 "retryDelay": f"{int(self.retry_delay)}s"}],
+                }}, latency * 0.1
+            if fault < self.rate_429 + self.malformed:
+                self.counts["malformed"] += 1
+                text = self.rng.choice(MALFORMED_REPLIES)
+            else:
+                self.counts["ok"] += 1
+                reply = BACK_REPLY if "back image" in prompt else FRONT_REPLY
+                text = f"```json\n{json.dumps(reply, ensure_ascii=False)}\n```"
+        return 200, {"candidates": [{
+            "content": {"parts": [{"text": text}], "role": "model"},
+            "finishReason": "STOP",
+        }]}, latency
+
+    def start(self) -> "MockGeminiServer":
+        """Start serving on a free local port in a background thread."""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                parts = request.get("contents", [{}])[0].get("parts", [])
+                prompt = " ".join(part.get("text", "") for part in parts)
+                status, body, latency = server._reply(prompt)
+                time.sleep(latency * server.time_scale)
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.send_header("X-Mock-Latency", f"{latency:.6f}")
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        """Shut the server down."""
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+
+
+class ScaledClock:
+    """
+    Drop-in for the time module that runs sleeps faster than real time.
+
+    time() and perf_counter() return modelled time: real time plus the part
+    of every sleep (and every simulated server latency) that was skipped.
+    """
+
+    def __init__(self, scale: float):
+        self.scale = scale
+        self.offset = 0.0
+        self.slept = 0.0
+
+    def advance(self, seconds: float) -> None:
+        """Account for modelled time that was only partly waited."""
+        self.offset += seconds * (1 - self.scale)
+
+    def sleep(self, seconds: float) -> None:
+        """Sleep a scaled fraction of seconds; counts as the full wait."""
+        if seconds > 0:
+            self.slept += seconds
+            self.advance(seconds)
+            time.sleep(seconds * self.scale)
+
+    def time(self) -> float:
+        """Modelled wall-clock time."""
+        return time.time() + self.offset
+
+    def perf_counter(self) -> float:
+        """Modelled performance counter."""
+        return time.perf_counter() + self.offset
+
+
+class _Reply:
+    """LLM reply with the same content attribute as a LangChain message."""
+
+    def __init__(self, content: str):
+        self.content = content
+
+
+class MockGeminiClient:
+    """
+    Minimal generateContent REST client with the invoke() interface GeminiOCR uses.
+
+    Errors are raised with the status and body in the message, like the
+    real client, so the pipeline's 429 detection and retryDelay parsing run
+    unchanged.
+    """
+
+    def __init__(self, base_url: str, clock: ScaledClock, model: str = MODEL_NAME):
+        self.url = f"{base_url}/v1beta/models/{model}:generateContent"
+        self.clock = clock
+        self.latencies: List[float] = []
+
+    def invoke(self, messages) -> _Reply:
+        """Send one message (text and image_url parts) and return the reply text."""
+        parts = []
+        for block in messages[0].content:
+            if block.get("type") == "text":
+                parts.append({"text": block["text"]})
+            elif block.get("type") == "image_url":
+                data = block["image_url"]["url"].split(",", 1)[-1]
+                parts.append({"inline_data": {"mime_type": "image/jpeg", "data": data}})
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps({"contents": [{"role": "user", "parts": parts}]}).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request) as response:
+                status, headers, body = response.status, response.headers, response.read()
+        except urllib.error.HTTPError as e:
+            status, headers, body = e.code, e.headers, e.read()
+        modelled = float(headers.get("X-Mock-Latency", 0))
+        self.clock.advance(modelled)
+        # Modelled latency plus the real client/server overhead
+        self.latencies.append(modelled + time.perf_counter() - start - modelled * self.clock.scale)
+
+        reply = json.loads(body)
+        if status != 200:
+            error = reply.get("error", {})
+            raise RuntimeError(f"{status} {error.get('status', '')}. {json.dumps(reply)}")
+        return _Reply(reply["candidates"][0]["content"]["parts"][0]["text"])
+
+
+def make_image_pairs(directory: Path, pairs: int, image_kb: int, seed: int = 0) -> Tuple[Path, Path]:
+    """
+    Write synthetic front/back image pairs (random bytes; the mock doesn't decode them).
+
+    Returns:
+        (front directory, back directory)
+    """
+    rng = random.Random(seed)
+    front_dir, back_dir = directory / "nid_front_image", directory / "nid_back_image"
+    front_dir.mkdir(parents=True)
+    back_dir.mkdir(parents=True)
+    payload = rng.randbytes(image_kb * 1024)
+    for i in range(pairs):
+        image_id = str(1_760_000_000_000_000 + i)
+        (front_dir / f"{image_id}.jpg").write_bytes(payload)
+        (back_dir / f"{image_id}.jpg").write_bytes(payload)
+    return front_dir, back_dir
+
+
+def percentile(values: List[float], q: float) -> float:
+    """q-th percentile (0-100) of values, by linear interpolation."""
+    if not values:
+        return float("nan")
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[min(max(int(q), 1), 99) - 1]
+
+
+def run_load_test(pairs: int = 1000, latency: str = "lognormal:800,0.5", rate_429: float = 0.0,
+                  retry_delay: float = 30.0, malformed: float = 0.0, rpm: Optional[int] = None,
+                  time_scale: float = 0.001, image_kb: int = 100, seed: int = 0,
+                  verbose: bool = False) -> Dict:
+    """
+    Drive OCRBenchmark over synthetic pairs against the mock server.
+
+    Args:
+        pairs: Image pairs to process
+        latency, rate_429, retry_delay, malformed: Mock server behaviour
+        rpm: Requests per minute allowed by GeminiOCR's limiter (default: its own)
+        time_scale: Real seconds per modelled second of waiting
+        image_kb: Size of each synthetic image
+        seed: Seed for images, latency and faults
+        verbose: Show the pipeline's per-pair output
+
+    Returns:
+        Report dict (modelled times in seconds, latencies in ms)
+    """
+    server = MockGeminiServer(latency, rate_429, retry_delay, malformed, time_scale, seed).start()
+    clock = ScaledClock(time_scale)
+    modules = (gemini_ocr, ocr_benchmark)
+    saved_time = [module.time for module in modules]
+    saved_csv = ocr_benchmark.BENCHMARK_CSV
+    workdir = Path(tempfile.mkdtemp(prefix="ocr_load_test_"))
+    csv_times: List[float] = []
+    incomplete = 0
+    limiter_wait = 0.0
+    try:
+        front_dir, back_dir = make_image_pairs(workdir, pairs, image_kb, seed)
+
+        # Results go to the temporary directory, not the real benchmark CSV
+        ocr_benchmark.BENCHMARK_CSV = workdir / "results.csv"
+        benchmark = ocr_benchmark.OCRBenchmark()
+        benchmark.ocr.llm = client = MockGeminiClient(server.url, clock)
+        if rpm:
+            benchmark.ocr.requests_per_minute = rpm
+        benchmark.front_dir, benchmark.back_dir = front_dir, back_dir
+
+        # Time CSV writes and rate-limit waits
+        append_row = benchmark.csv_handler.append_row
+        wait_for_rate_limit = benchmark.ocr._wait_for_rate_limit
+
+        def timed_append_row(image_id, ocr_data):
+            nonlocal incomplete
+            incomplete += not all(ocr_data.get(field) for field in FRONT_REPLY.keys() | BACK_REPLY.keys())
+            start = time.perf_counter()
+            append_row(image_id, ocr_data)
+            csv_times.append(time.perf_counter() - start)
+
+        def timed_wait_for_rate_limit():
+            nonlocal limiter_wait
+            slept = clock.slept
+            wait_for_rate_limit()
+            limiter_wait += clock.slept - slept
+
+        benchmark.csv_handler.append_row = timed_append_row
+        benchmark.ocr._wait_for_rate_limit = timed_wait_for_rate_limit
+
+        for module in modules:
+            module.time = clock
+        real_start = time.perf_counter()
+        with open(os.devnull, "w") as devnull, \
+                (contextlib.nullcontext() if verbose else contextlib.redirect_stdout(devnull)):
+            stats = benchmark.process_all_pairs() or {}
+        real_elapsed = time.perf_counter() - real_start
+    finally:
+        for module, saved in zip(modules, saved_time):
+            module.time = saved
+        ocr_benchmark.BENCHMARK_CSV = saved_csv
+        server.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    elapsed = stats.get("elapsed", 0.0)
+    retry_wait = clock.slept - limiter_wait
+    latencies_ms = [latency * 1000 for latency in client.latencies]
+    return {
+        "config": {
+            "pairs": pairs, "latency": latency, "rate_429": rate_429, "retry_delay": retry_delay,
+            "malformed": malformed, "rpm": rpm or benchmark.ocr.requests_per_minute,
+            "time_scale": time_scale, "image_kb": image_kb, "seed": seed,
+        },
+        "pairs": len(stats.get("image_ids", [])),
+        "pair_errors": stats.get("errors", 0),
+        "incomplete_pairs": incomplete,
+        "requests": server.counts,
+        "elapsed": round(elapsed, 2),
+        "real_elapsed": round(real_elapsed, 2),
+        "pairs_per_min": round(len(stats.get("image_ids", [])) / elapsed * 60, 2) if elapsed else None,
+        "latency_p50_ms": round(percentile(latencies_ms, 50), 1),
+        "latency_p99_ms": round(percentile(latencies_ms, 99), 1),
+        "rate_limit_wait": round(limiter_wait, 2),
+        "retry_wait": round(retry_wait, 2),
+        "retry_overhead": round(retry_wait / elapsed, 4) if elapsed else None,
+        "csv_write_mean_us": round(statistics.fmean(csv_times) * 1e6, 1) if csv_times else None,
+        "csv_write_total": round(sum(csv_times), 4),
+    }
+
+
+def print_report(report: Dict) -> None:
+    """Print a load test report."""
+    config = report["config"]
+    print("\n" + "=" * 60)
+    print("OCR Pipeline Load Test (mock Gemini server)")
+    print("=" * 60)
+    print(f"Latency: {config['latency']}  429 rate: {config['rate_429']:.1%}  "
+          f"malformed: {config['malformed']:.1%}  limiter: {config['rpm']} req/min")
+    print(f"Pairs processed:     {report['pairs']} ({report['pair_errors']} failed, "
+          f"{report['incomplete_pairs']} with missing fields)")
+    requests = report["requests"]
+    print(f"Requests:            {requests['requests']} ({requests['rate_limited']} rate limited, "
+          f"{requests['malformed']} malformed)")
+    print(f"Modelled time:       {report['elapsed']:.1f}s (real {report['real_elapsed']:.1f}s)")
+    print(f"Throughput:          {report['pairs_per_min']} pairs/min")
+    print(f"Request latency:     p50 {report['latency_p50_ms']:.0f} ms, p99 {report['latency_p99_ms']:.0f} ms")
+    print(f"Rate limiter waits:  {report['rate_limit_wait']:.1f}s")
+    overhead = report["retry_overhead"] or 0
+    print(f"Retry waits:         {report['retry_wait']:.1f}s ({overhead:.1%} of modelled time)")
+    if report["csv_write_mean_us"] is not None:
+        print(f"CSV writes:          {report['csv_write_mean_us']:.0f} us/row, "
+              f"{report['csv_write_total']:.3f}s total")
+    print("=" * 60)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Load test the OCR pipeline against a local mock Gemini server"
+    )
+    parser.add_argument("--pairs", type=int, default=1000, help="Synthetic image pairs (default: 1000)")
+    parser.add_argument("--latency", default="lognormal:800,0.5",
+                        help="Reply latency in ms: fixed:MS, uniform:LOW,HIGH or lognormal:MEDIAN,SIGMA")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of 429 replies")
+    parser.add_argument("--retry-delay", type=float, default=30.0, help="retryDelay hint in 429 replies (s)")
+    parser.add_argument("--malformed", type=float, default=0.0, help="Fraction of malformed replies")
+    parser.add_argument("--rpm", type=int, default=None,
+                        help="Requests per minute for the client rate limiter (default: GeminiOCR's)")
+    parser.add_argument("--time-scale", type=float, default=0.001,
+                        help="Real seconds per modelled second of waiting (default: 0.001)")
+    parser.add_argument("--image-kb", type=int, default=100, help="Size of each synthetic image (KB)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for images, latency and faults")
+    parser.add_argument("--output", help="Also save the report as JSON")
+    parser.add_argument("--verbose", action="store_true", help="Show per-pair pipeline output")
+    args = parser.parse_args()
+    try:
+        parse_latency(args.latency)
+    except ValueError as e:
+        parser.error(str(e))
+
+    report = run_load_test(args.pairs, args.latency, args.rate_429, args.retry_delay, args.malformed,
+                           args.rpm, args.time_scale, args.image_kb, args.seed, args.verbose)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Report saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,16 @@
 """Main script to perform OCR on NID image pairs and save to CSV."""
 
 import os
+import sys
 import time
 import re
 from pathlib import Path
-from typing import List, Tuple
-from gemini_ocr import GeminiOCR
+from typing import List, Optional, Tuple
+from gemini_ocr import GeminiOCR, MODEL_NAME, prompt_hash
 from csv_handler import CSVHandler
-from config import FRONT_DIR, BACK_DIR, BENCHMARK_CSV
+from config import BASE_DIR, FRONT_DIR, BACK_DIR, BENCHMARK_CSV
+
+RUNS_DB = BASE_DIR / "data" / "runs.sqlite"
 
 
 class OCRBenchmark:
@@ -15,12 +18,19 @@ class OCRBenchmark:
 
     def __init__(self):
         """Initialize OCR benchmark processor."""
-        self.ocr = GeminiOCR()
+        self._ocr = None
         self.csv_handler = CSVHandler(str(BENCHMARK_CSV))
         self.front_dir = Path(FRONT_DIR)
         self.back_dir = Path(BACK_DIR)
         self.quota_wait_time = 90  # Default wait time in seconds (1.5 mins)
 
+    @property
+    def ocr(self) -> GeminiOCR:
+        """Gemini client, created on first use (statistics need no API key)."""
+        if self._ocr is None:
+            self._ocr = GeminiOCR()
+        return self._ocr
+
     def get_image_pairs(self) -> List[Tuple[str, Path, Path]]:
         """
         Get list of matching front and back image pairs.
@@ -60,13 +70,17 @@ class OCRBenchmark:
             return min(delay, 600)  # Cap at 10 minutes
         return self.quota_wait_time
 
-    def process_all_pairs(self, limit: int = None) -> None:
+    def process_all_pairs(self, limit: int = None) -> Optional[dict]:
         """
         Process all image pairs and save results to CSV.
         Handles quota limits by waiting and retrying.
 
         Args:
             limit: Maximum number of pairs to process (None for all)
+
+        Returns:
+            Run statistics (image_ids, elapsed, errors, quota_wait), or None
+            if there was nothing to process
         """
         pairs = self.get_image_pairs()
 
@@ -87,6 +101,8 @@ class OCRBenchmark:
         print(f"Results will be saved to: {BENCHMARK_CSV}")
         print("-" * 60)
 
+        start_time = time.perf_counter()
+        stats = {"image_ids": [], "errors": 0, "quota_wait": 0}
         index = 1
         while index <= len(pairs):
             image_id, front_path, back_path = pairs[index - 1]
@@ -108,6 +124,7 @@ class OCRBenchmark:
                 self.csv_handler.append_row(image_id, ocr_data)
 
                 print("✓ Saved")
+                stats["image_ids"].append(image_id)
                 index += 1
 
             except Exception as e:
@@ -120,6 +137,7 @@ class OCRBenchmark:
                     print(f"⏳ Waiting {retry_delay} seconds before retrying...")
                     
                     # Wait with countdown
+                    stats["quota_wait"] += retry_delay
                     for remaining in range(retry_delay, 0, -1):
                         print(f"\r⏳ Waiting {remaining}s...", end="", flush=True)
                         time.sleep(1)
@@ -138,10 +156,59 @@ class OCRBenchmark:
                         "nid_no": "",
                         "plain_address": "",
                     })
+                    stats["image_ids"].append(image_id)
+                    stats["errors"] += 1
                     index += 1
 
+        stats["elapsed"] = time.perf_counter() - start_time
         print("-" * 60)
         print(f"✓ Processing complete! Results saved to {BENCHMARK_CSV}")
+        return stats
+
+    def record_run(self, stats: dict, label: str = "") -> str:
+        """
+        Record a benchmark run in the run registry (data/runs.sqlite).
+
+        The pairs processed in this run are scored against the manual entry
+        results when they are available; otherwise only config and timing
+        are recorded.
+
+        Args:
+            stats: Statistics returned by process_all_pairs
+            label: Free-text label stored with the run
+
+        Returns:
+            The run id
+        """
+        sys.path.append(str(BASE_DIR / "evaluation"))
+        from multi_system import MultiSystemEvaluator
+        from runs import RunRegistry
+        from sources import default_registry, image_key
+        import pandas as pd
+
+        image_ids = {image_key(image_id) for image_id in stats["image_ids"]}
+        try:
+            results = MultiSystemEvaluator(default_registry(str(BASE_DIR)), "annotators", ["gemini"]).evaluate()
+            results = results[results["image_id"].isin(image_ids)]
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Run not scored: {e}")
+            results = pd.DataFrame()
+
+        # Throughput is over the images processed, excluding quota waits
+        active = stats["elapsed"] - stats["quota_wait"]
+        return RunRegistry(str(RUNS_DB)).record(
+            "ocr_benchmark",
+            results,
+            config={"model": MODEL_NAME, "prompt_hash": prompt_hash(), "temperature": 0.1},
+            stats={
+                "elapsed": active,
+                "processed": len(image_ids),
+                "wall_time": round(stats["elapsed"], 2),
+                "errors": stats["errors"],
+                "quota_wait": stats["quota_wait"],
+            },
+            label=label,
+        )
 
     def get_stats(self) -> None:
         """Print statistics about processed images."""
@@ -172,6 +239,16 @@ def main():
         action="store_true",
         help="Show statistics and exit",
     )
+    parser.add_argument(
+        "--label",
+        default="",
+        help="Label stored with this run in the run registry",
+    )
+    parser.add_argument(
+        "--no-registry",
+        action="store_true",
+        help="Don't record this run in data/runs.sqlite",
+    )
 
     args = parser.parse_args()
 
@@ -188,7 +265,10 @@ def main():
         print("="*60 + "\n")
         
         try:
-            benchmark.process_all_pairs(limit=args.limit)
+            stats = benchmark.process_all_pairs(limit=args.limit)
+            if stats and stats["image_ids"] and not args.no_registry:
+                run_id = benchmark.record_run(stats, args.label)
+                print(f"Run recorded: {run_id}")
         except KeyboardInterrupt:
             print("\n\n⚠️  Processing interrupted by user")
             print("Your progress has been saved. Run the script again to resume.")
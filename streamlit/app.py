@@ -4,6 +4,11 @@ import os
 from datetime import datetime
 from pathlib import Path
 
+from image_index import ImageAvailabilityIndex
+from image_service import ImageService
+from entry_form import render_entry_form
+from prefill import FIELDS, load_gemini_predictions, polygon_prediction, edited_fields
+
 # Set page config
 st.set_page_config(page_title="NID Data Entry Form", layout="wide")
 
@@ -16,6 +21,10 @@ project_root = os.path.dirname(script_dir)
 input_csv = os.path.join(project_root, "data", "nid-data-last-15-days.csv")
 output_csv = os.path.join(project_root, "data", "nid-data-entry-results.csv")
 image_base_path = os.path.join(project_root, "data", "images")
+image_cache_path = os.path.join(project_root, "data", "image_cache")
+gemini_csv = os.path.join(project_root, "benchmark_ocr_results.csv")
+
+PREFETCH_RECORDS = 3
 
 # Load input data
 @st.cache_data
@@ -24,51 +33,62 @@ def load_csv():
         return pd.read_csv(input_csv, sep='\t')
     return pd.DataFrame()
 
-def image_exists(image_id):
-    """Check if both front and back images exist"""
-    front_path = os.path.join(image_base_path, "nid_front_image", f"{image_id}.jpg")
-    back_path = os.path.join(image_base_path, "nid_back_image", f"{image_id}.jpg")
-    return os.path.exists(front_path) and os.path.exists(back_path)
+@st.cache_data
+def load_image_ids():
+    """Image ID for each input row, extracted from the front_image path"""
+    image_ids = []
+    for front_image_col in load_csv().get('front_image', []):
+        if isinstance(front_image_col, str) and '/' in front_image_col:
+            image_ids.append(front_image_col.split('/')[-1].replace('.jpg', ''))
+        else:
+            image_ids.append(str(front_image_col).replace('.jpg', ''))
+    return image_ids
+
+@st.cache_data
+def load_gemini():
+    """Gemini OCR predictions indexed by image_id"""
+    return load_gemini_predictions(gemini_csv)
+
+@st.cache_resource
+def get_image_index():
+    """Shared image availability index, rescanned only when image folders change"""
+    return ImageAvailabilityIndex(image_base_path)
+
+@st.cache_resource
+def get_image_service():
+    """Shared display-size image cache"""
+    return ImageService(image_base_path, image_cache_path)
 
 csv_data = load_csv()
+image_ids = load_image_ids()
+image_index = get_image_index()
+image_service = get_image_service()
 
 # Initialize session state
 if "current_index" not in st.session_state:
     st.session_state.current_index = 0
 if "form_data" not in st.session_state:
     st.session_state.form_data = {}
+if "form_version" not in st.session_state:
+    st.session_state.form_version = 0
+
+prefill_source = st.sidebar.selectbox(
+    "Prefill form from:", ["Gemini OCR", "Polygon OCR", "None"], key="prefill_source"
+)
 
 # Get current row
 if len(csv_data) > 0:
-    # Find next row with images
-    while st.session_state.current_index < len(csv_data):
-        current_row = csv_data.iloc[st.session_state.current_index]
-        
-        # Extract image_id from front_image path
-        front_image_col = current_row.get('front_image', '')
-        if isinstance(front_image_col, str) and '/' in front_image_col:
-            image_id = front_image_col.split('/')[-1].replace('.jpg', '')
-        else:
-            image_id = str(front_image_col).replace('.jpg', '')
-        
-        # Check if images exist
-        if image_exists(image_id):
-            break
-        else:
-            st.session_state.current_index += 1
+    # Jump straight to the next row with images
+    valid_positions = image_index.valid_positions(input_csv, image_ids)
+    next_index = image_index.next_valid(valid_positions, st.session_state.current_index)
     
-    if st.session_state.current_index >= len(csv_data):
+    if next_index is None:
         st.warning("⚠️ No more entries with available images!")
         st.stop()
     
+    st.session_state.current_index = next_index
     current_row = csv_data.iloc[st.session_state.current_index]
-    
-    # Extract image_id from front_image path
-    front_image_col = current_row.get('front_image', '')
-    if isinstance(front_image_col, str) and '/' in front_image_col:
-        image_id = front_image_col.split('/')[-1].replace('.jpg', '')
-    else:
-        image_id = str(front_image_col).replace('.jpg', '')
+    image_id = image_ids[st.session_state.current_index]
     
     # Display progress
     col1, col2, col3 = st.columns([1, 2, 1])
@@ -86,66 +106,45 @@ if len(csv_data) > 0:
 
     with col1:
         st.subheader("Front Image")
-        front_image_path = os.path.join(image_base_path, "nid_front_image", f"{image_id}.jpg")
-        if os.path.exists(front_image_path):
-            st.image(front_image_path, use_column_width=True)
+        front_image = image_service.get(image_id, "front")
+        if front_image is not None:
+            st.image(front_image, use_column_width=True)
         else:
             st.error(f"❌ Front image not found")
 
     with col2:
         st.subheader("Back Image")
-        back_image_path = os.path.join(image_base_path, "nid_back_image", f"{image_id}.jpg")
-        if os.path.exists(back_image_path):
-            st.image(back_image_path, use_column_width=True)
+        back_image = image_service.get(image_id, "back")
+        if back_image is not None:
+            st.image(back_image, use_column_width=True)
         else:
             st.error(f"❌ Back image not found")
     
+    # Warm the image cache for the next records with images
+    upcoming = valid_positions[valid_positions > st.session_state.current_index][:PREFETCH_RECORDS]
+    image_service.prefetch(image_ids[position] for position in upcoming)
+    
     st.divider()
 
     # Create form fields
     st.subheader("NID Information")
 
-    col1, col2 = st.columns(2)
-    with col1:
-        english_name = st.text_input(
-            "English Name:",
-            value=st.session_state.form_data.get("english_name", ""),
-            key="english_name_input"
-        )
-        bangla_name = st.text_input(
-            "Bangla Name:",
-            value=st.session_state.form_data.get("bangla_name", ""),
-            key="bangla_name_input"
-        )
-        father_spouse_name = st.text_input(
-            "Father/Spouse Name:",
-            value=st.session_state.form_data.get("father_spouse_name", ""),
-            key="father_spouse_name_input"
-        )
+    # Seed the form with OCR predictions so the annotator only fixes mistakes
+    prefilled = {}
+    if prefill_source == "Gemini OCR":
+        prefilled = load_gemini().get(image_id, {})
+    elif prefill_source == "Polygon OCR":
+        prefilled = polygon_prediction(current_row)
+    if prefill_source != "None" and not prefilled:
+        st.info(f"No {prefill_source} prediction for this record - starting blank.")
 
-    with col2:
-        mother_name = st.text_input(
-            "Mother Name:",
-            value=st.session_state.form_data.get("mother_name", ""),
-            key="mother_name_input"
-        )
-        dob = st.text_input(
-            "Date of Birth (YYYY-MM-DD):",
-            value=st.session_state.form_data.get("dob", ""),
-            key="dob_input"
-        )
-        nid_no = st.text_input(
-            "NID Number:",
-            value=st.session_state.form_data.get("nid_no", ""),
-            key="nid_no_input"
-        )
-
-    plain_address = st.text_area(
-        "Address:",
-        value=st.session_state.form_data.get("plain_address", ""),
-        height=100,
-        key="plain_address_input"
-    )
+    # What the form was actually seeded with, and where it came from ("" = blank form);
+    # after "Clear Form" the seed is the cleared values, not the prediction
+    form_data = st.session_state.form_data or prefilled
+    seed_source = prefill_source if prefilled and not st.session_state.form_data else ""
+
+    form_key = f"{st.session_state.current_index}_{prefill_source}_{st.session_state.form_version}"
+    entry = render_entry_form(form_data, key_prefix=form_key)
 
     st.divider()
 
@@ -154,31 +153,31 @@ if len(csv_data) > 0:
 
     with col1:
         if st.button("⬅ Previous", use_container_width=True):
-            if st.session_state.current_index > 0:
-                st.session_state.current_index -= 1
+            previous_index = image_index.previous_valid(valid_positions, st.session_state.current_index)
+            if previous_index is not None:
+                st.session_state.current_index = previous_index
                 st.session_state.form_data = {}
                 st.rerun()
 
     with col2:
         if st.button("Save & Next ➡", use_container_width=True):
             # Save current entry
-            new_entry = {
-                "image_id": image_id,
-                "english_name": english_name,
-                "bangla_name": bangla_name,
-                "father_spouse_name": father_spouse_name,
-                "mother_name": mother_name,
-                "dob": dob,
-                "nid_no": nid_no,
-                "plain_address": plain_address
-            }
+            new_entry = {"image_id": image_id, **entry}
+            # Which seeded fields the annotator corrected (cheap OCR error labels);
+            # always written so a re-save without a prefill clears the old labels
+            new_entry["prefill_source"] = seed_source
+            new_entry["edited_fields"] = ";".join(edited_fields(form_data, entry)) if seed_source else ""
             
             # Load existing data or create new
             if os.path.exists(output_csv):
-                df = pd.read_csv(output_csv)
+                df = pd.read_csv(output_csv, dtype=str, keep_default_na=False)
                 # Check if image_id already exists
-                if image_id in df["image_id"].values:
-                    df.loc[df["image_id"] == image_id] = new_entry
+                existing = df["image_id"] == image_id
+                if existing.any():
+                    for column, value in new_entry.items():
+                        if column not in df.columns:
+                            df[column] = ""
+                        df.loc[existing, column] = value
                 else:
                     df = pd.concat([df, pd.DataFrame([new_entry])], ignore_index=True)
             else:
@@ -207,7 +206,8 @@ if len(csv_data) > 0:
 
     with col4:
         if st.button("Clear Form", use_container_width=True):
-            st.session_state.form_data = {}
+            st.session_state.form_data = dict.fromkeys(FIELDS, "")
+            st.session_state.form_version += 1
             st.rerun()
 
     with col5:
@@ -0,0 +1,233 @@
+import streamlit as st
+import pandas as pd
+import os
+import json
+import zlib
+
+from image_index import ImageAvailabilityIndex
+from image_service import ImageService
+from entry_form import render_entry_form
+from prefill import load_gemini_predictions, polygon_prediction, edited_fields
+from work_queue import WorkQueue
+
+# Set page config
+st.set_page_config(page_title="NID Data Entry Form - Shared Queue", layout="wide")
+
+st.title("👥 NID Data Entry & Verification Form")
+
+# Define CSV files and paths
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+
+input_csv = os.path.join(project_root, "data", "nid-data-last-15-days.csv")
+output_csv = os.path.join(project_root, "data", "nid-data-entry-results-shared.csv")
+queue_db = os.path.join(project_root, "data", "entry_queue.sqlite")
+gemini_csv = os.path.join(project_root, "benchmark_ocr_results.csv")
+image_base_path = os.path.join(project_root, "data", "images")
+image_cache_path = os.path.join(project_root, "data", "image_cache")
+
+LEASE_SECONDS = 15 * 60
+PREFETCH_RECORDS = 3
+
+
+# Load input data
+@st.cache_data
+def load_csv():
+    if os.path.exists(input_csv):
+        return pd.read_csv(input_csv, sep='\t')
+    return pd.DataFrame()
+
+
+def extract_image_id(front_image_col):
+    """Extract image_id from front_image path"""
+    if isinstance(front_image_col, str) and '/' in front_image_col:
+        return front_image_col.split('/')[-1].replace('.jpg', '')
+    return str(front_image_col).replace('.jpg', '')
+
+
+@st.cache_resource
+def get_queue():
+    """Open the shared work queue"""
+    return WorkQueue(queue_db, lease_seconds=LEASE_SECONDS)
+
+
+@st.cache_resource
+def get_image_index():
+    """Shared image availability index, rescanned only when image folders change"""
+    return ImageAvailabilityIndex(image_base_path)
+
+
+@st.cache_resource
+def get_image_service():
+    """Shared display-size image cache"""
+    return ImageService(image_base_path, image_cache_path)
+
+
+@st.cache_data
+def load_gemini():
+    """Gemini OCR predictions indexed by image_id"""
+    return load_gemini_predictions(gemini_csv)
+
+
+@st.cache_data
+def load_image_ids():
+    """Image ID for each input row"""
+    return [extract_image_id(value) for value in load_csv().get('front_image', [])]
+
+
+csv_data = load_csv()
+
+if len(csv_data) == 0:
+    st.warning("No data found in nid-data-last-15-days.csv")
+    st.stop()
+
+queue = get_queue()
+image_index = get_image_index()
+image_service = get_image_service()
+
+# Queue every input row with both images; re-seeds only when image folders change
+if image_index.refresh() or "queue_seeded" not in st.session_state:
+    image_ids = load_image_ids()
+    valid_positions = image_index.valid_positions(input_csv, image_ids)
+    queue.seed((int(position), image_ids[position]) for position in valid_positions)
+    st.session_state.queue_seeded = True
+
+# Annotator identity
+annotator = st.sidebar.text_input("Your name:", key="annotator").strip()
+if not annotator:
+    st.info("Enter your name in the sidebar to start claiming records.")
+    st.stop()
+
+if st.sidebar.toggle("Pause (return my record to the queue)", key="paused"):
+    queue.release_all(annotator)
+    st.info("Paused. Your reserved record is back in the queue for others.")
+    st.stop()
+
+prefill_source = st.sidebar.selectbox(
+    "Prefill form from:", ["Gemini OCR", "Polygon OCR", "None"], key="prefill_source"
+)
+
+stats = queue.stats()
+st.sidebar.divider()
+st.sidebar.markdown("**Queue Progress:**")
+for status in (WorkQueue.PENDING, WorkQueue.LEASED, WorkQueue.DONE, WorkQueue.SKIPPED):
+    st.sidebar.markdown(f"- {status.title()}: {stats['status'].get(status, 0)}")
+st.sidebar.markdown("**Completed by annotator:**")
+for name, count in sorted(stats['annotators'].items()):
+    st.sidebar.markdown(f"- {name}: {count}")
+
+# Claim next record (returns the same record while our lease is active)
+claimed = queue.claim(annotator)
+if claimed is None:
+    st.success("✅ Queue is empty - all records have been claimed or completed!")
+    st.stop()
+
+image_id = claimed['image_id']
+
+# Display progress
+col1, col2, col3 = st.columns([1, 2, 1])
+with col1:
+    st.metric("Current Image", image_id)
+with col2:
+    st.metric("Remaining in Queue", stats['status'].get(WorkQueue.PENDING, 0))
+with col3:
+    st.metric("Completed by You", stats['annotators'].get(annotator, 0))
+
+st.caption(f"Reserved for {annotator} for {LEASE_SECONDS // 60} minutes; the lease is renewed on every action.")
+
+st.divider()
+
+# Create two columns for images
+col1, col2 = st.columns(2)
+
+with col1:
+    st.subheader("Front Image")
+    front_image = image_service.get(image_id, "front")
+    if front_image is not None:
+        st.image(front_image, use_column_width=True)
+    else:
+        st.error(f"❌ Front image not found")
+
+with col2:
+    st.subheader("Back Image")
+    back_image = image_service.get(image_id, "back")
+    if back_image is not None:
+        st.image(back_image, use_column_width=True)
+    else:
+        st.error(f"❌ Back image not found")
+
+# Warm the image cache for the records the queue will hand out next
+image_service.prefetch(queue.peek(PREFETCH_RECORDS))
+
+st.divider()
+
+# Create form fields
+st.subheader("NID Information")
+
+# Seed the form with OCR predictions so the annotator only fixes mistakes
+prefilled = {}
+if prefill_source == "Gemini OCR":
+    prefilled = load_gemini().get(image_id, {})
+elif prefill_source == "Polygon OCR":
+    prefilled = polygon_prediction(csv_data.iloc[claimed['position']])
+if prefill_source != "None" and not prefilled:
+    st.info(f"No {prefill_source} prediction for this record - starting blank.")
+
+json_input = st.text_area(
+    "Paste JSON to fill the form (optional):",
+    placeholder='{"english_name": "", "bangla_name": "", "father_spouse_name": "", "mother_name": "", "dob": "", "nid_no": "", "plain_address": ""}',
+    height=100,
+    key=f"json_input_{image_id}"
+)
+# What the form was actually seeded with, and where it came from ("" = blank form)
+form_data = prefilled
+seed_source = prefill_source if prefilled else ""
+if json_input.strip():
+    try:
+        parsed_data = json.loads(json_input)
+        form_data = {key: "" if value is None else str(value) for key, value in parsed_data.items()}
+        seed_source = "Pasted JSON"
+    except json.JSONDecodeError as e:
+        st.error(f"❌ Invalid JSON: {str(e)}")
+
+# Widget keys change with the record, prefill source and pasted JSON so the form resets
+form_key = f"{image_id}_{prefill_source}_{zlib.crc32(json_input.encode())}"
+entry = render_entry_form(form_data, key_prefix=form_key)
+
+st.divider()
+
+# Save / Skip buttons
+col1, col2, col3 = st.columns(3)
+
+with col1:
+    if st.button("Save & Next ➡", use_container_width=True):
+        new_entry = dict(entry)
+        # Which seeded fields the annotator corrected (cheap OCR error labels);
+        # both stay blank when the form started empty
+        new_entry["prefill_source"] = seed_source
+        new_entry["edited_fields"] = ";".join(edited_fields(form_data, entry)) if seed_source else ""
+        if queue.complete(image_id, annotator, new_entry):
+            queue.export_results(output_csv)
+            st.rerun()
+        else:
+            st.error("❌ Your reservation on this record expired and it was taken by someone else. Nothing was saved.")
+
+with col2:
+    if st.button("Skip ⏭", use_container_width=True):
+        queue.skip(image_id, annotator)
+        st.rerun()
+
+with col3:
+    if st.button("View All Entries", use_container_width=True):
+        st.session_state.show_entries = not st.session_state.get("show_entries", False)
+
+# Display all entries
+if st.session_state.get("show_entries", False):
+    st.divider()
+    st.subheader("All Completed Entries")
+    if os.path.exists(output_csv):
+        df = pd.read_csv(output_csv)
+        st.dataframe(df, use_container_width=True)
+        st.metric("Total Completed", len(df))
+    else:
+        st.info("No entries saved yet")
@@ -1,9 +1,16 @@
 import streamlit as st
 import pandas as pd
 import os
-from PIL import Image
+import sys
 import numpy as np
 
+from image_service import ImageService
+from review_index import ReviewIndex, FIELDS, TIERS
+
+# Field stats are shared with the evaluation reports (evaluation/aggregate.py)
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'evaluation'))
+from aggregate import load_aggregates
+
 # Set page config
 st.set_page_config(page_title="NID Data Review & Evaluation", layout="wide")
 
@@ -11,25 +18,31 @@ st.set_page_config(page_title="NID Data Review & Evaluation", layout="wide")
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 IMAGES_DIR = os.path.join(PROJECT_ROOT, 'data', 'images')
 EVALUATION_CSV = os.path.join(PROJECT_ROOT, 'data', 'evaluation_results.csv')
+IMAGE_CACHE_DIR = os.path.join(PROJECT_ROOT, 'data', 'image_cache')
+DISAGREEMENT_CSV = os.path.join(PROJECT_ROOT, 'data', 'disagreement_queue.csv')
+PREFETCH_RECORDS = 3
+
+# Load evaluation results and build sort/filter/lookup indexes once per file version
+@st.cache_resource(max_entries=1)
+def load_review_index(mtime):
+    df = pd.read_csv(EVALUATION_CSV)
+    return ReviewIndex(df, load_aggregates(EVALUATION_CSV, df))
 
-# Load evaluation results
+# Annotator disagreements from evaluation/agreement.py, grouped by image_id
 @st.cache_data
-def load_evaluation_data():
-    return pd.read_csv(EVALUATION_CSV)
-
-# Load image
-def load_image(image_id, image_type='front'):
-    """Load front or back image"""
-    if image_type == 'front':
-        img_dir = os.path.join(IMAGES_DIR, 'nid_front_image')
-    else:
-        img_dir = os.path.join(IMAGES_DIR, 'nid_back_image')
-    
-    img_path = os.path.join(img_dir, f'{image_id}.jpg')
-    
-    if os.path.exists(img_path):
-        return Image.open(img_path)
-    return None
+def load_disagreements(mtime):
+    queue = pd.read_csv(DISAGREEMENT_CSV, dtype=str, keep_default_na=False)
+    return {image_id: group.drop(columns='image_id') for image_id, group in queue.groupby('image_id')}
+
+# CSV export of the filtered, sorted view, rebuilt only when the file or the view changes
+@st.cache_data(max_entries=4)
+def view_csv(mtime, view):
+    return load_review_index(mtime).df.iloc[view].to_csv(index=False)
+
+# Display-size image cache shared across reruns
+@st.cache_resource
+def get_image_service():
+    return ImageService(IMAGES_DIR, IMAGE_CACHE_DIR)
 
 # Format value for display
 def format_value(val):
@@ -65,34 +78,94 @@ def get_color_code(accuracy):
         return ("#e74c3c", "#ffffff")  # Dark red, white text
 
 # Load data
-df = load_evaluation_data()
+evaluation_mtime = os.path.getmtime(EVALUATION_CSV)
+review_index = load_review_index(evaluation_mtime)
+df = review_index.df
+image_service = get_image_service()
+disagreements = (
+    load_disagreements(os.path.getmtime(DISAGREEMENT_CSV)) if os.path.exists(DISAGREEMENT_CSV) else {}
+)
+
+if "record_pos" not in st.session_state:
+    st.session_state.record_pos = 0
+
+def go_to(position):
+    if position is not None:
+        st.session_state.record_pos = int(position)
 
 # Sidebar
 st.sidebar.title("📊 NID Review")
-record_index = st.sidebar.number_input("Record #", min_value=1, max_value=len(df), value=1) - 1
+
+# Search by image_id or NID (hash lookup)
+search = st.sidebar.text_input("🔍 Find image ID or NID", key="search").strip()
+if search and search != st.session_state.get("last_search"):
+    st.session_state.last_search = search
+    matches = review_index.lookup(search)
+    if matches:
+        go_to(matches[0])
+    else:
+        st.sidebar.warning("No record found")
+
+# Filters
+with st.sidebar.expander("Filter & Sort", expanded=True):
+    selected_tiers = st.multiselect("Quality tier", TIERS, default=TIERS)
+    field_labels = {label: key for key, label in FIELDS}
+    error_field_label = st.selectbox("Only records with errors in", ["Any field"] + list(field_labels))
+    error_field = field_labels.get(error_field_label)
+    date_range = None
+    bounds = review_index.date_bounds()
+    if bounds:
+        picked = st.date_input("Doc date range", value=bounds, min_value=bounds[0], max_value=bounds[1])
+        if isinstance(picked, (list, tuple)) and len(picked) == 2 and tuple(picked) != bounds:
+            date_range = tuple(picked)
+    sort_column = st.selectbox(
+        "Sort by", review_index.metric_columns,
+        index=review_index.metric_columns.index('overall_accuracy'),
+    )
+    ascending = st.toggle("Ascending", value=False)
+    only_disagreements = bool(disagreements) and st.checkbox(
+        f"Only annotator disagreements ({len(disagreements)})"
+    )
+
+mask = review_index.filter_mask(
+    tiers=None if len(selected_tiers) == len(TIERS) else selected_tiers,
+    error_field=error_field,
+    date_range=date_range,
+    image_ids=disagreements.keys() if only_disagreements else None,
+)
+view = review_index.view(sort_column, ascending, mask)
+
+if view.size == 0:
+    st.warning("No records match the current filters.")
+    st.stop()
+
+# Keep the current record if it is still in view, otherwise start at the top
+view_positions = np.flatnonzero(view == st.session_state.record_pos)
+if view_positions.size == 0:
+    st.session_state.record_pos = int(view[0])
+    view_pos = 0
+else:
+    view_pos = int(view_positions[0])
+record_index = st.session_state.record_pos
+
+jump = st.sidebar.number_input(
+    f"Record # in view (of {view.size})", min_value=1, max_value=int(view.size),
+    value=view_pos + 1, key=f"jump_{record_index}_{view.size}",
+)
+if jump - 1 != view_pos:
+    go_to(view[jump - 1])
+    st.rerun()
 
 # Quick stats in sidebar
-st.sidebar.metric("Total Samples", f"{len(df)}")
-total_acc = df['overall_accuracy'].mean()
-st.sidebar.metric("Avg Accuracy", f"{total_acc:.1f}%")
+st.sidebar.metric("Total Samples", f"{review_index.size}")
+st.sidebar.metric("Avg Accuracy", f"{review_index.total_accuracy:.1f}%")
 
 # Field-wise metrics
 st.sidebar.divider()
 st.sidebar.markdown("**Field-wise Overall Metrics:**")
 
-fields_info = [
-    ('english_name', 'English Name'),
-    ('bangla_name', 'Bangla Name'),
-    ('father_spouse', 'Father/Spouse'),
-    ('mother', 'Mother'),
-    ('dob', 'DOB'),
-    ('nid_no', 'NID'),
-    ('address', 'Address')
-]
-
-for field_key, field_label in fields_info:
-    acc = df[f'{field_key}_accuracy'].mean()
-    cer = df[f'{field_key}_cer'].mean()
+for field_key, field_label in FIELDS:
+    acc, cer = review_index.field_stats[field_key]
     
     st.sidebar.markdown(f"""
     <div style="padding: 8px; border-left: 3px solid #2c5aa0; margin: 5px 0;">
@@ -105,7 +178,7 @@ for field_key, field_label in fields_info:
 record = df.iloc[record_index]
 image_id = str(int(record['image_id']))
 
-st.title(f"Record #{record_index + 1} | {get_quality_tier(record['overall_accuracy'])}")
+st.title(f"Record #{record_index + 1} ({view_pos + 1} of {view.size} in view) | {get_quality_tier(record['overall_accuracy'])}")
 
 # Display doc date
 if 'predicted_doc_date' in record and pd.notna(record['predicted_doc_date']):
@@ -114,30 +187,24 @@ if 'predicted_doc_date' in record and pd.notna(record['predicted_doc_date']):
 # Images
 col_front, col_back = st.columns(2)
 with col_front:
-    front_img = load_image(image_id, 'front')
+    front_img = image_service.get(image_id, 'front')
     if front_img:
         st.image(front_img, use_container_width=True)
 
 with col_back:
-    back_img = load_image(image_id, 'back')
+    back_img = image_service.get(image_id, 'back')
     if back_img:
         st.image(back_img, use_container_width=True)
 
+# Warm the image cache for the next records
+upcoming = df['image_id'].iloc[view[view_pos + 1:view_pos + 1 + PREFETCH_RECORDS]]
+image_service.prefetch(str(int(value)) for value in upcoming)
+
 st.divider()
 
 # Data Comparison - Compact Table
-fields = [
-    ('english_name', 'English Name'),
-    ('bangla_name', 'Bangla Name'),
-    ('father_spouse', 'Father/Spouse'),
-    ('mother', 'Mother'),
-    ('dob', 'DOB'),
-    ('nid_no', 'NID'),
-    ('address', 'Address')
-]
-
 comparison_data = []
-for field_key, field_label in fields:
+for field_key, field_label in FIELDS:
     actual_val = record[f'actual_{field_key}']
     predicted_val = record[f'predicted_{field_key}']
     accuracy = record[f'{field_key}_accuracy']
@@ -151,6 +218,10 @@ for field_key, field_label in fields:
 
 st.dataframe(pd.DataFrame(comparison_data), use_container_width=True, hide_index=True)
 
+if image_id in disagreements:
+    with st.expander("⚖️ Annotators disagree on this record", expanded=True):
+        st.dataframe(disagreements[image_id], use_container_width=True, hide_index=True)
+
 
 st.divider()
 
@@ -172,18 +243,26 @@ with col3:
     st.markdown(f"""<div style="background: #2c5aa0; color: white; padding: 15px; border-radius: 8px; text-align: center;">
         <b style="font-size: 14px;">{get_quality_tier(overall_accuracy)}</b><br><small>Quality</small></div>""", unsafe_allow_html=True)
 
-# Navigation
-nav_col1, nav_col2, nav_col3 = st.columns(3)
+# Navigation (within the filtered, sorted view)
+nav_col1, nav_col2, nav_col3, nav_col4 = st.columns(4)
 with nav_col1:
-    if st.button("⬅️ Previous", use_container_width=True):
-        st.session_state['idx'] = max(0, record_index - 1)
-        st.rerun()
+    st.button("⬅️ Previous", use_container_width=True, disabled=view_pos == 0,
+              on_click=go_to, args=(view[max(0, view_pos - 1)],))
 
 with nav_col2:
-    if st.button("➡️ Next", use_container_width=True):
-        st.session_state['idx'] = min(len(df) - 1, record_index + 1)
-        st.rerun()
+    st.button("➡️ Next", use_container_width=True, disabled=view_pos >= view.size - 1,
+              on_click=go_to, args=(view[min(view.size - 1, view_pos + 1)],))
+
+def go_to_worst(position):
+    st.session_state.last_worst = position
+    go_to(position)
 
 with nav_col3:
-    csv = df.to_csv(index=False)
-    st.download_button("📥 CSV", data=csv, file_name="evaluation_results.csv", mime="text/csv", use_container_width=True)
+    # Walks records from the lowest overall accuracy up, within the filters
+    next_worst = review_index.next_worst(st.session_state.get("last_worst"), mask)
+    st.button("🔻 Next Worst", use_container_width=True, disabled=next_worst is None,
+              on_click=go_to_worst, args=(next_worst,))
+
+with nav_col4:
+    csv = view_csv(evaluation_mtime, view)
+    st.download_button("📥 CSV (view)", data=csv, file_name="evaluation_results.csv", mime="text/csv", use_container_width=True)
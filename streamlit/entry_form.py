@@ -0,0 +1,67 @@
+"""NID entry form shared by the entry apps, with validation highlights."""
+
+from typing import Dict, Mapping
+
+import streamlit as st
+
+from prefill import FIELDS, validate_entry
+
+LABELS = {
+    "english_name": "English Name:",
+    "bangla_name": "Bangla Name:",
+    "father_spouse_name": "Father/Spouse Name:",
+    "mother_name": "Mother Name:",
+    "dob": "Date of Birth (YYYY-MM-DD):",
+    "nid_no": "NID Number:",
+    "plain_address": "Address:",
+}
+
+LEFT_COLUMN = ["english_name", "bangla_name", "father_spouse_name"]
+RIGHT_COLUMN = ["mother_name", "dob", "nid_no"]
+
+
+def render_entry_form(initial: Mapping[str, str], key_prefix: str) -> Dict[str, str]:
+    """
+    Draw the NID entry fields, flagging values the validator rejects.
+
+    Flags are computed from the current widget values, so a warning clears as
+    soon as the annotator fixes the field.
+
+    Args:
+        initial: Starting value for each field (prefilled OCR or blank)
+        key_prefix: Unique widget key prefix for the current record
+
+    Returns:
+        Dict of the entered field values
+    """
+    keys = {field: f"{key_prefix}_{field}" for field in FIELDS}
+    current = {
+        field: st.session_state.get(keys[field], initial.get(field, ""))
+        for field in FIELDS
+    }
+    issues = validate_entry(current)
+
+    def field_input(field, widget, **kwargs):
+        # Label and help stay fixed so the widget keeps its value; the flag
+        # is drawn underneath instead
+        value = widget(
+            LABELS[field],
+            value=initial.get(field, ""),
+            key=keys[field],
+            **kwargs,
+        )
+        if field in issues:
+            st.markdown(f":red[⚠️ {issues[field]}]")
+        return value
+
+    entry = {}
+    col1, col2 = st.columns(2)
+    with col1:
+        for field in LEFT_COLUMN:
+            entry[field] = field_input(field, st.text_input)
+    with col2:
+        for field in RIGHT_COLUMN:
+            entry[field] = field_input(field, st.text_input)
+    entry["plain_address"] = field_input("plain_address", st.text_area, height=100)
+
+    return entry
@@ -0,0 +1,104 @@
+"""Cached index of which NID records have both front and back images on disk."""
+
+import os
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class ImageAvailabilityIndex:
+    """Tracks image availability with one directory scan per change.
+
+    The index is rebuilt only when the modification time of the front or back
+    image directory changes (adding or removing a file updates it), so
+    navigation costs a binary search instead of two ``os.path.exists`` calls
+    per row.
+    """
+
+    def __init__(self, image_base_path: str):
+        """
+        Initialize the index.
+
+        Args:
+            image_base_path: Directory containing nid_front_image/ and nid_back_image/
+        """
+        self.front_dir = os.path.join(image_base_path, "nid_front_image")
+        self.back_dir = os.path.join(image_base_path, "nid_back_image")
+        self._mtimes: Optional[Tuple[float, float]] = None
+        self._available = frozenset()
+        self._positions: Dict[str, np.ndarray] = {}
+
+    @staticmethod
+    def _mtime(directory: str) -> float:
+        """Get directory modification time, or -1 if it doesn't exist."""
+        try:
+            return os.stat(directory).st_mtime
+        except FileNotFoundError:
+            return -1.0
+
+    @staticmethod
+    def _scan(directory: str) -> set:
+        """Get image IDs (filenames without .jpg) in a directory."""
+        if not os.path.isdir(directory):
+            return set()
+        with os.scandir(directory) as entries:
+            return {
+                entry.name[:-4]
+                for entry in entries
+                if entry.name.endswith(".jpg") and entry.is_file()
+            }
+
+    def refresh(self) -> bool:
+        """
+        Rescan the image directories if they changed since the last scan.
+
+        Returns:
+            True if the index was rebuilt
+        """
+        mtimes = (self._mtime(self.front_dir), self._mtime(self.back_dir))
+        if mtimes == self._mtimes:
+            return False
+
+        self._available = frozenset(self._scan(self.front_dir) & self._scan(self.back_dir))
+        self._mtimes = mtimes
+        self._positions = {}
+        return True
+
+    def has_images(self, image_id: str) -> bool:
+        """Check if both front and back images exist."""
+        self.refresh()
+        return str(image_id) in self._available
+
+    def valid_positions(self, key: str, image_ids: Sequence[str]) -> np.ndarray:
+        """
+        Get the sorted row positions whose images are available.
+
+        Args:
+            key: Cache key for this list of image IDs (e.g. the input CSV path)
+            image_ids: Image ID for each row, in row order
+
+        Returns:
+            Sorted array of row positions with both images present
+        """
+        self.refresh()
+        positions = self._positions.get(key)
+        if positions is None:
+            available = self._available
+            positions = np.fromiter(
+                (i for i, image_id in enumerate(image_ids) if image_id in available),
+                dtype=np.int64,
+            )
+            self._positions[key] = positions
+        return positions
+
+    @staticmethod
+    def next_valid(positions: np.ndarray, index: int) -> Optional[int]:
+        """Get the first valid position at or after index, or None."""
+        i = int(np.searchsorted(positions, index, side="left"))
+        return int(positions[i]) if i < positions.size else None
+
+    @staticmethod
+    def previous_valid(positions: np.ndarray, index: int) -> Optional[int]:
+        """Get the last valid position before index, or None."""
+        i = int(np.searchsorted(positions, index, side="left"))
+        return int(positions[i - 1]) if i > 0 else None
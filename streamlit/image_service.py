@@ -0,0 +1,172 @@
+"""Display-size image renditions with disk cache, memory LRU and prefetch."""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+
+class ImageService:
+    """Serves NID images resized for display instead of full-resolution JPEGs.
+
+    Three layers, checked in order:
+    1. An in-process LRU of encoded renditions, ready to hand to ``st.image``,
+       keyed by source path and mtime so a replaced JPEG is never served stale
+    2. WebP renditions on disk, rebuilt only when the source JPEG is newer
+    3. The source JPEG, decoded and resized once to build the rendition
+
+    ``prefetch`` warms layers 1 and 2 for upcoming records in background
+    threads so the next navigation is served from memory.
+    """
+
+    SIDES = {
+        "front": "nid_front_image",
+        "back": "nid_back_image",
+    }
+
+    def __init__(self, image_base_path: str, cache_dir: str, max_width: int = 900,
+                 quality: int = 80, lru_size: int = 64, prefetch_workers: int = 2):
+        """
+        Initialize the image service.
+
+        Args:
+            image_base_path: Directory containing nid_front_image/ and nid_back_image/
+            cache_dir: Directory for WebP renditions
+            max_width: Longest side of a rendition in pixels
+            quality: WebP quality (0-100)
+            lru_size: Number of renditions kept in memory
+            prefetch_workers: Background threads used for prefetching
+        """
+        self.image_base_path = image_base_path
+        self.cache_dir = cache_dir
+        self.max_width = max_width
+        self.quality = quality
+        self.lru_size = lru_size
+        # Keyed by (source path, source mtime): a replaced JPEG gets a new key
+        self._lru: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._executor = ThreadPoolExecutor(
+            max_workers=prefetch_workers, thread_name_prefix="image-prefetch"
+        )
+
+    def source_path(self, image_id: str, side: str) -> str:
+        """Get the path of the original JPEG."""
+        return os.path.join(self.image_base_path, self.SIDES[side], f"{image_id}.jpg")
+
+    def rendition_path(self, image_id: str, side: str) -> str:
+        """Get the path of the cached WebP rendition."""
+        return os.path.join(self.cache_dir, side, f"{image_id}_{self.max_width}.webp")
+
+    def _build_rendition(self, source: str, target: str) -> None:
+        """Decode, resize and save a WebP rendition atomically."""
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp_path = f"{target}.tmp{threading.get_ident()}"
+        try:
+            with Image.open(source) as img:
+                img.draft("RGB", (self.max_width, self.max_width))
+                img = img.convert("RGB")
+                img.thumbnail((self.max_width, self.max_width), Image.LANCZOS)
+                img.save(tmp_path, "WEBP", quality=self.quality, method=4)
+            os.replace(tmp_path, target)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _cache_key(self, image_id: str, side: str) -> Optional[tuple]:
+        """Get the LRU key (source path, mtime), or None if the source doesn't exist."""
+        source = self.source_path(image_id, side)
+        try:
+            return source, os.stat(source).st_mtime
+        except FileNotFoundError:
+            return None
+
+    def _load(self, image_id: str, side: str, source_mtime: float) -> bytes:
+        """Load rendition bytes from disk, building the rendition if it is stale."""
+        source = self.source_path(image_id, side)
+        target = self.rendition_path(image_id, side)
+        try:
+            stale = os.stat(target).st_mtime < source_mtime
+        except FileNotFoundError:
+            stale = True
+
+        if stale:
+            try:
+                self._build_rendition(source, target)
+            except (OSError, ValueError) as e:
+                logger.warning("Error building rendition for %s: %s", source, e)
+                with open(source, "rb") as f:
+                    return f.read()
+
+        with open(target, "rb") as f:
+            return f.read()
+
+    def _remember(self, key: tuple, data: bytes) -> None:
+        """Store rendition bytes in the LRU, evicting the oldest entries."""
+        with self._lock:
+            self._lru[key] = data
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+
+    def get(self, image_id: str, side: str = "front") -> Optional[bytes]:
+        """
+        Get a display-size image ready for ``st.image``.
+
+        Args:
+            image_id: Image ID (filename without .jpg)
+            side: 'front' or 'back'
+
+        Returns:
+            Encoded image bytes, or None if the source image doesn't exist
+        """
+        image_id = str(image_id)
+        key = self._cache_key(image_id, side)
+        if key is None:
+            return None
+        with self._lock:
+            data = self._lru.get(key)
+            if data is not None:
+                self._lru.move_to_end(key)
+                return data
+
+        try:
+            data = self._load(image_id, side, key[1])
+        except FileNotFoundError:
+            return None
+        self._remember(key, data)
+        return data
+
+    def _prefetch_one(self, image_id: str, side: str, key: tuple) -> None:
+        """Background task: load one rendition into memory."""
+        try:
+            self._remember(key, self._load(image_id, side, key[1]))
+        except OSError as e:
+            logger.warning("Error prefetching %s: %s", key[0], e)
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def prefetch(self, image_ids: Iterable[str]) -> None:
+        """
+        Warm the cache for upcoming records in background threads.
+
+        Args:
+            image_ids: Image IDs of the next records, nearest first
+        """
+        for image_id in image_ids:
+            for side in self.SIDES:
+                key = self._cache_key(str(image_id), side)
+                if key is None:
+                    continue
+                with self._lock:
+                    if key in self._lru or key in self._pending:
+                        continue
+                    self._pending.add(key)
+                self._executor.submit(self._prefetch_one, str(image_id), side, key)
@@ -0,0 +1,179 @@
+"""OCR predictions for prefilling the entry form, plus field validation."""
+
+import csv
+import re
+from datetime import date
+from typing import Dict, List, Mapping, Optional
+
+FIELDS = [
+    "english_name",
+    "bangla_name",
+    "father_spouse_name",
+    "mother_name",
+    "dob",
+    "nid_no",
+    "plain_address",
+]
+
+# Polygon OCR columns in the input CSV for each form field (first non-empty wins)
+POLYGON_COLUMNS = {
+    "english_name": ["name_english"],
+    "bangla_name": ["name_bangla"],
+    # The input export (nid-data-last-15-days.csv) has anonymized headers:
+    # "z" is its spouse name column, where nid-data-140126.csv has spouse_name
+    "father_spouse_name": ["father_name", "z"],
+    "mother_name": ["mother_name"],
+    "dob": ["dob"],
+    "nid_no": ["nid_no"],
+    "plain_address": ["address"],
+}
+
+MISSING_VALUES = {"", "\\N", "nan", "NaN", "None"}
+
+BENGALI_RE = re.compile(r"[\u0980-\u09FF]")
+DEVANAGARI_RE = re.compile(r"[\u0900-\u097F]")
+LATIN_RE = re.compile(r"[A-Za-z]")
+ENGLISH_NAME_RE = re.compile(r"^[A-Za-z][A-Za-z .'\-]*$")
+DOB_RE = re.compile(r"^([0-9]{4})-([0-9]{2})-([0-9]{2})$")
+NID_RE = re.compile(r"^[0-9]+$")
+NID_LENGTHS = (10, 13, 17)
+
+
+def clean_value(value) -> str:
+    """Convert a CSV cell to a display string, mapping missing markers to ''."""
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        if value != value:
+            return ""
+        if value == int(value):
+            return str(int(value))
+    text = str(value).strip()
+    return "" if text in MISSING_VALUES else text
+
+
+def format_dob(value: str) -> str:
+    """Convert 'YYYY/MM/DD' style dates to the form's YYYY-MM-DD format."""
+    return re.sub(r"^(\d{4})[/. ](\d{2})[/. ](\d{2})$", r"\1-\2-\3", value)
+
+
+def format_nid(value: str) -> str:
+    """Drop the '.0' pandas adds to numeric NIDs."""
+    return value[:-2] if value.endswith(".0") and value[:-2].isdigit() else value
+
+
+def _tidy(entry: Dict[str, str]) -> Dict[str, str]:
+    """Bring predicted DOB and NID into the format annotators type."""
+    entry["dob"] = format_dob(entry.get("dob", ""))
+    entry["nid_no"] = format_nid(entry.get("nid_no", ""))
+    return entry
+
+
+def load_gemini_predictions(csv_path: str) -> Dict[str, Dict[str, str]]:
+    """
+    Load Gemini OCR results indexed by image_id.
+
+    Args:
+        csv_path: Path to benchmark_ocr_results.csv
+
+    Returns:
+        Dict mapping image_id to a dict of form field values
+    """
+    predictions = {}
+    try:
+        with open(csv_path, "r", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                image_id = clean_value(row.get("image_id"))
+                if image_id:
+                    predictions[image_id] = _tidy(
+                        {field: clean_value(row.get(field)) for field in FIELDS}
+                    )
+    except FileNotFoundError:
+        pass
+    return predictions
+
+
+def polygon_prediction(row: Mapping) -> Dict[str, str]:
+    """
+    Get the Polygon OCR prediction stored in an input CSV row.
+
+    Args:
+        row: A row of the input CSV (dict or pandas Series)
+
+    Returns:
+        Dict of form field values
+    """
+    entry = {}
+    for field, columns in POLYGON_COLUMNS.items():
+        entry[field] = ""
+        for column in columns:
+            value = clean_value(row.get(column))
+            if value:
+                entry[field] = value
+                break
+    return _tidy(entry)
+
+
+def _validate_bengali(value: str) -> Optional[str]:
+    """Check a field that should be written in Bengali script."""
+    if not value:
+        return "Missing"
+    if DEVANAGARI_RE.search(value):
+        return "Contains Devanagari (Hindi) characters"
+    if LATIN_RE.search(value):
+        return "Contains English letters"
+    if not BENGALI_RE.search(value):
+        return "Not in Bengali script"
+    return None
+
+
+def validate_entry(entry: Mapping[str, str]) -> Dict[str, str]:
+    """
+    Check form values for common OCR and typing mistakes.
+
+    Args:
+        entry: Dict of form field values
+
+    Returns:
+        Dict mapping each flagged field to a short message
+    """
+    issues = {}
+
+    english_name = entry.get("english_name", "").strip()
+    if not english_name:
+        issues["english_name"] = "Missing"
+    elif not ENGLISH_NAME_RE.match(english_name):
+        issues["english_name"] = "Expected English letters only"
+
+    for field in ("bangla_name", "father_spouse_name", "mother_name", "plain_address"):
+        message = _validate_bengali(entry.get(field, "").strip())
+        if message:
+            issues[field] = message
+
+    dob = entry.get("dob", "").strip()
+    match = DOB_RE.match(dob)
+    if not match:
+        issues["dob"] = "Expected YYYY-MM-DD"
+    else:
+        try:
+            parsed = date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+            if not 1900 <= parsed.year <= date.today().year:
+                issues["dob"] = "Year out of range"
+        except ValueError:
+            issues["dob"] = "Not a valid date"
+
+    nid_no = entry.get("nid_no", "").strip()
+    if not NID_RE.match(nid_no):
+        issues["nid_no"] = "Expected digits only"
+    elif len(nid_no) not in NID_LENGTHS:
+        issues["nid_no"] = "Expected 10, 13 or 17 digits"
+
+    return issues
+
+
+def edited_fields(prefilled: Mapping[str, str], entry: Mapping[str, str]) -> List[str]:
+    """Get the fields the annotator changed from the prefilled values."""
+    return [
+        field for field in FIELDS
+        if entry.get(field, "").strip() != prefilled.get(field, "").strip()
+    ]
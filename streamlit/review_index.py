@@ -0,0 +1,216 @@
+"""Precomputed sort orders, filters and lookups for the review app."""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+FIELDS = [
+    ('english_name', 'English Name'),
+    ('bangla_name', 'Bangla Name'),
+    ('father_spouse', 'Father/Spouse'),
+    ('mother', 'Mother'),
+    ('dob', 'DOB'),
+    ('nid_no', 'NID'),
+    ('address', 'Address'),
+]
+
+TIERS = ["🟢 Excellent", "🔵 Good", "🟡 Fair", "🔴 Poor"]
+
+
+def quality_tiers(accuracy: np.ndarray) -> np.ndarray:
+    """Vectorized tier label for each accuracy value (same cut-offs as the app)."""
+    return np.select(
+        [accuracy >= 95, accuracy >= 80, accuracy >= 60],
+        TIERS[:3],
+        default=TIERS[3],
+    )
+
+
+def _normalize_key(value) -> str:
+    """Turn an image_id / NID cell into a lookup key ('123.0' -> '123')."""
+    if pd.isna(value):
+        return ""
+    if isinstance(value, float) and value == int(value):
+        return str(int(value))
+    text = str(value).strip()
+    return text[:-2] if text.endswith(".0") else text
+
+
+class ReviewIndex:
+    """Everything the review app needs, computed once per evaluation CSV.
+
+    Sort orders, filter masks and field stats are built on first use and
+    reused on every rerun, so interactions cost array indexing instead of a
+    DataFrame scan.
+    """
+
+    def __init__(self, df: pd.DataFrame, aggregates: Optional[dict] = None):
+        """
+        Build the index.
+
+        Args:
+            df: Evaluation results (evaluation_results.csv)
+            aggregates: Cached aggregates of the same CSV (evaluation/aggregate.py);
+                field stats are computed from df when omitted
+        """
+        self.df = df.reset_index(drop=True)
+        self.size = len(self.df)
+        self.metric_columns = [
+            column for column in self.df.columns
+            if column.endswith(('_accuracy', '_cer', '_wer'))
+            and pd.api.types.is_numeric_dtype(self.df[column])
+        ]
+
+        overall = self.df['overall_accuracy'].to_numpy(dtype=float)
+        self.tiers = quality_tiers(overall)
+
+        if 'predicted_doc_date' in self.df.columns:
+            doc_dates = pd.to_datetime(self.df['predicted_doc_date'], errors='coerce')
+            self.doc_dates = doc_dates.dt.normalize().to_numpy()
+        else:
+            self.doc_dates = np.full(self.size, np.datetime64('NaT'), dtype='datetime64[ns]')
+
+        self.image_keys = np.array([_normalize_key(value) for value in self.df['image_id']], dtype=object)
+        self.by_image_id: Dict[str, int] = {}
+        for position, key in enumerate(self.image_keys):
+            self.by_image_id.setdefault(key, position)
+
+        self.by_nid: Dict[str, List[int]] = {}
+        for column in ('actual_nid_no', 'predicted_nid_no'):
+            if column in self.df.columns:
+                for position, value in enumerate(self.df[column]):
+                    key = _normalize_key(value)
+                    if key:
+                        positions = self.by_nid.setdefault(key, [])
+                        if position not in positions:
+                            positions.append(position)
+
+        if aggregates is not None:
+            columns = aggregates['columns']
+            self.field_stats: Dict[str, Tuple[float, float]] = {
+                field_key: (columns[f'{field_key}_accuracy']['mean'], columns[f'{field_key}_cer']['mean'])
+                for field_key, _ in FIELDS
+            }
+            self.total_accuracy = columns['overall_accuracy']['mean'] if self.size else 0.0
+        else:
+            self.field_stats = {
+                field_key: (
+                    float(self.df[f'{field_key}_accuracy'].mean()),
+                    float(self.df[f'{field_key}_cer'].mean()),
+                )
+                for field_key, _ in FIELDS
+            }
+            self.total_accuracy = float(np.nanmean(overall)) if self.size else 0.0
+
+        self._orders: Dict[Tuple[str, bool], np.ndarray] = {}
+        self._masks: Dict[tuple, np.ndarray] = {}
+        self._worst_rank: Optional[np.ndarray] = None
+
+    def order(self, column: str, ascending: bool = True) -> np.ndarray:
+        """
+        Get row positions sorted by a column (stable, missing values last).
+
+        Args:
+            column: Column to sort by
+            ascending: Sort direction
+
+        Returns:
+            Array of row positions
+        """
+        key = (column, ascending)
+        if key not in self._orders:
+            values = self.df[column]
+            self._orders[key] = np.asarray(
+                values.sort_values(ascending=ascending, kind='stable', na_position='last').index
+            )
+        return self._orders[key]
+
+    def _cached_mask(self, key: tuple, build) -> np.ndarray:
+        """Get a filter mask, building it on first use."""
+        if key not in self._masks:
+            self._masks[key] = build()
+        return self._masks[key]
+
+    def filter_mask(self, tiers: Optional[Iterable[str]] = None,
+                    error_field: Optional[str] = None,
+                    date_range: Optional[Tuple] = None,
+                    image_ids: Optional[Iterable[str]] = None) -> np.ndarray:
+        """
+        Get a boolean mask of rows that pass all filters.
+
+        Args:
+            tiers: Quality tiers to keep (None keeps all)
+            error_field: Only keep rows where this field isn't a perfect match
+            date_range: Inclusive (start, end) doc_date range
+            image_ids: Only keep these records (e.g. the disagreement queue)
+
+        Returns:
+            Boolean array over row positions
+        """
+        mask = np.ones(self.size, dtype=bool)
+        if tiers is not None:
+            tiers = tuple(sorted(tiers))
+            mask &= self._cached_mask(('tier', tiers), lambda: np.isin(self.tiers, tiers))
+        if error_field:
+            mask &= self._cached_mask(
+                ('error', error_field),
+                lambda: (self.df[f'{error_field}_accuracy'] < 100).to_numpy(),
+            )
+        if date_range is not None:
+            start, end = (np.datetime64(pd.Timestamp(value), 'ns') for value in date_range)
+            mask &= (self.doc_dates >= start) & (self.doc_dates <= end)
+        if image_ids is not None:
+            keys = frozenset(_normalize_key(value) for value in image_ids)
+            mask &= self._cached_mask(('images', keys), lambda: np.isin(self.image_keys, list(keys)))
+        return mask
+
+    def view(self, sort_column: str, ascending: bool, mask: np.ndarray) -> np.ndarray:
+        """Get the filtered row positions in sort order."""
+        order = self.order(sort_column, ascending)
+        return order[mask[order]]
+
+    def next_worst(self, previous: Optional[int], mask: np.ndarray) -> Optional[int]:
+        """
+        Get the next record in worst-first order (lowest overall accuracy).
+
+        Args:
+            previous: Row position returned by the last call, or None to start
+                from the worst record
+            mask: Rows allowed by the active filters
+
+        Returns:
+            Row position, or None when every allowed record has been visited
+        """
+        order = self.order('overall_accuracy', ascending=True)
+        allowed = order[mask[order]]
+        if previous is None:
+            return int(allowed[0]) if allowed.size else None
+        if self._worst_rank is None:
+            self._worst_rank = np.empty(self.size, dtype=np.int64)
+            self._worst_rank[order] = np.arange(self.size)
+        ranks = self._worst_rank[allowed]
+        i = int(np.searchsorted(ranks, self._worst_rank[previous], side='right'))
+        return int(allowed[i]) if i < allowed.size else None
+
+    def lookup(self, query: str) -> List[int]:
+        """
+        Find records by image_id or NID number.
+
+        Args:
+            query: Image ID or NID (actual or predicted)
+
+        Returns:
+            Matching row positions
+        """
+        key = _normalize_key(query)
+        if key in self.by_image_id:
+            return [self.by_image_id[key]]
+        return list(self.by_nid.get(key, []))
+
+    def date_bounds(self) -> Optional[Tuple]:
+        """Get the earliest and latest doc_date, or None if there are none."""
+        valid = self.doc_dates[~np.isnat(self.doc_dates)]
+        if valid.size == 0:
+            return None
+        return pd.Timestamp(valid.min()).date(), pd.Timestamp(valid.max()).date()
@@ -0,0 +1,301 @@
+"""SQLite-backed work queue for sharing NID records between annotators."""
+
+import csv
+import os
+import sqlite3
+import sys
+import time
+from typing import ContextManager, Dict, Iterable, List, Optional, Tuple
+
+# Connection handling is shared with the run registry (evaluation/sqlite_db.py)
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'evaluation'))
+from sqlite_db import connect
+
+
+class WorkQueue:
+    """Hands out NID records to any number of annotators using leases.
+
+    Each record is claimed by exactly one annotator at a time. A claim is a
+    lease that expires after ``lease_seconds``; expired leases go back to the
+    pool so records held by someone who closed their browser are not lost.
+    """
+
+    RESULT_FIELDS = [
+        "english_name",
+        "bangla_name",
+        "father_spouse_name",
+        "mother_name",
+        "dob",
+        "nid_no",
+        "plain_address",
+    ]
+
+    # Saved alongside the entry: where the form was prefilled from and
+    # which fields the annotator changed
+    METADATA_FIELDS = [
+        "prefill_source",
+        "edited_fields",
+    ]
+
+    PENDING = "pending"
+    LEASED = "leased"
+    DONE = "done"
+    SKIPPED = "skipped"
+
+    def __init__(self, db_path: str, lease_seconds: int = 900):
+        """
+        Initialize the queue, creating the database if needed.
+
+        Args:
+            db_path: Path to the shared SQLite database file
+            lease_seconds: How long a claimed record stays reserved
+        """
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self._init_db()
+
+    def _connect(self) -> ContextManager[sqlite3.Connection]:
+        """Open a connection that waits for other writers instead of failing."""
+        return connect(self.db_path)
+
+    def _init_db(self) -> None:
+        """Create tables and indexes if they don't exist."""
+        entry_fields = self.RESULT_FIELDS + self.METADATA_FIELDS
+        result_columns = ", ".join(f"{field} TEXT" for field in entry_fields)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS records (
+                    image_id TEXT PRIMARY KEY,
+                    position INTEGER NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    annotator TEXT,
+                    lease_expires REAL,
+                    updated_at REAL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_records_status "
+                "ON records (status, position)"
+            )
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS results (
+                    image_id TEXT PRIMARY KEY,
+                    {result_columns},
+                    annotator TEXT NOT NULL,
+                    saved_at REAL NOT NULL
+                )
+                """
+            )
+            # Add columns introduced after the database was created
+            existing = {row["name"] for row in conn.execute("PRAGMA table_info(results)")}
+            for field in entry_fields:
+                if field not in existing:
+                    conn.execute(f"ALTER TABLE results ADD COLUMN {field} TEXT")
+
+    def seed(self, records: Iterable[Tuple[int, str]]) -> int:
+        """
+        Add records to the queue. Records already queued are left untouched.
+
+        Args:
+            records: Iterable of (position, image_id) tuples
+
+        Returns:
+            Number of newly queued records
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO records (image_id, position, status) "
+                "VALUES (?, ?, 'pending')",
+                ((str(image_id), int(position)) for position, image_id in records),
+            )
+            added = conn.total_changes - before
+            conn.execute("COMMIT")
+        return added
+
+    def claim(self, annotator: str) -> Optional[Dict]:
+        """
+        Claim the next available record for an annotator.
+
+        An annotator who still holds an unexpired lease gets the same record
+        back (with a renewed lease), so reruns don't hand out new work.
+
+        Args:
+            annotator: Name of the annotator claiming work
+
+        Returns:
+            Dict with image_id and position, or None if the queue is drained
+        """
+        now = time.time()
+        expires = now + self.lease_seconds
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT image_id, position FROM records "
+                "WHERE status = ? AND annotator = ? AND lease_expires >= ? "
+                "ORDER BY position LIMIT 1",
+                (self.LEASED, annotator, now),
+            ).fetchone()
+            if row is None:
+                row = conn.execute(
+                    "SELECT image_id, position FROM records "
+                    "WHERE status = ? OR (status = ? AND lease_expires < ?) "
+                    "ORDER BY position LIMIT 1",
+                    (self.PENDING, self.LEASED, now),
+                ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE records SET status = ?, annotator = ?, "
+                    "lease_expires = ?, updated_at = ? WHERE image_id = ?",
+                    (self.LEASED, annotator, expires, now, row["image_id"]),
+                )
+            conn.execute("COMMIT")
+        return dict(row) if row is not None else None
+
+    def peek(self, limit: int) -> List[str]:
+        """
+        Get the image IDs that will be handed out next, without claiming them.
+
+        Args:
+            limit: Maximum number of image IDs to return
+
+        Returns:
+            Image IDs in claim order
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT image_id FROM records "
+                "WHERE status = ? OR (status = ? AND lease_expires < ?) "
+                "ORDER BY position LIMIT ?",
+                (self.PENDING, self.LEASED, time.time(), limit),
+            ).fetchall()
+        return [row["image_id"] for row in rows]
+
+    def _finish(self, image_id: str, annotator: str, status: str,
+                entry: Optional[Dict] = None) -> bool:
+        """Move a leased record to a final status if the annotator still holds it."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            cursor = conn.execute(
+                "UPDATE records SET status = ?, lease_expires = NULL, updated_at = ? "
+                "WHERE image_id = ? AND status = ? AND annotator = ?",
+                (status, now, str(image_id), self.LEASED, annotator),
+            )
+            owned = cursor.rowcount == 1
+            if owned and entry is not None:
+                entry_fields = self.RESULT_FIELDS + self.METADATA_FIELDS
+                columns = ["image_id"] + entry_fields + ["annotator", "saved_at"]
+                values = (
+                    [str(image_id)]
+                    + [entry.get(field, "") for field in entry_fields]
+                    + [annotator, now]
+                )
+                conn.execute(
+                    f"INSERT OR REPLACE INTO results ({', '.join(columns)}) "
+                    f"VALUES ({', '.join('?' for _ in columns)})",
+                    values,
+                )
+            conn.execute("COMMIT")
+        return owned
+
+    def complete(self, image_id: str, annotator: str, entry: Dict) -> bool:
+        """
+        Save an annotator's entry and mark the record done.
+
+        Args:
+            image_id: The record being saved
+            annotator: Annotator holding the lease
+            entry: Dictionary with the entered field values (and optionally
+                prefill_source / edited_fields)
+
+        Returns:
+            False if the lease was lost to another annotator (nothing saved)
+        """
+        return self._finish(image_id, annotator, self.DONE, entry)
+
+    def skip(self, image_id: str, annotator: str) -> bool:
+        """Mark a record as skipped so it isn't handed out again."""
+        return self._finish(image_id, annotator, self.SKIPPED)
+
+    def release(self, image_id: str, annotator: str) -> bool:
+        """Return a leased record to the pool without saving anything."""
+        return self._finish(image_id, annotator, self.PENDING)
+
+    def release_all(self, annotator: str) -> int:
+        """Return every record leased by an annotator to the pool."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE records SET status = ?, lease_expires = NULL "
+                "WHERE status = ? AND annotator = ?",
+                (self.PENDING, self.LEASED, annotator),
+            )
+            return cursor.rowcount
+
+    def requeue_skipped(self) -> int:
+        """Put all skipped records back in the pool."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE records SET status = ?, annotator = NULL WHERE status = ?",
+                (self.PENDING, self.SKIPPED),
+            )
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get queue progress.
+
+        Returns:
+            Dict with counts per status and completed records per annotator
+        """
+        with self._connect() as conn:
+            by_status = {
+                row["status"]: row["n"]
+                for row in conn.execute(
+                    "SELECT status, COUNT(*) AS n FROM records GROUP BY status"
+                )
+            }
+            by_annotator = {
+                row["annotator"]: row["n"]
+                for row in conn.execute(
+                    "SELECT annotator, COUNT(*) AS n FROM results GROUP BY annotator"
+                )
+            }
+        return {"status": by_status, "annotators": by_annotator}
+
+    def export_results(self, csv_path: str) -> int:
+        """
+        Write all saved entries to a CSV file.
+
+        The file is written to a temporary path and renamed, so readers never
+        see a half-written file while annotators keep saving.
+
+        Args:
+            csv_path: Destination CSV path
+
+        Returns:
+            Number of rows written
+        """
+        columns = (
+            ["image_id"] + self.RESULT_FIELDS + self.METADATA_FIELDS
+            + ["annotator", "saved_at"]
+        )
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT results.{', results.'.join(columns)} FROM results "
+                "JOIN records USING (image_id) ORDER BY records.position"
+            ).fetchall()
+
+        tmp_path = f"{csv_path}.tmp{os.getpid()}"
+        with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for row in rows:
+                writer.writerow(list(row))
+        os.replace(tmp_path, csv_path)
+        return len(rows)